@@ -13,6 +13,53 @@ class Config:
 
     PRIVATE_CHANNEL_ID = int(os.getenv("PRIVATE_CHANNEL_ID"))
 
+    # optional group, and forum topic, where access requests are posted once for
+    # every reviewer instead of being sent to each of them privately
+    ACCESS_REVIEW_CHAT_ID = int(os.getenv("ACCESS_REVIEW_CHAT_ID") or 0) or None
+    ACCESS_REVIEW_TOPIC_ID = int(os.getenv("ACCESS_REVIEW_TOPIC_ID") or 0) or None
+
     DB_PATH = os.getenv("DB_PATH")
     DB_POOL_SIZE = 20
     DB_MAX_OVERFLOW = 10
+
+    BOT_API_RATE_LIMIT = 25
+    BULK_SEND_CONCURRENCY = 10
+
+    EXPORT_CHUNK_SIZE = 1000
+    EXPORT_SPOOL_MAX_SIZE = 10 * 1024 * 1024
+    IMPORT_BATCH_SIZE = 5000
+    PROGRESS_UPDATE_INTERVAL = 3
+    MAX_CONCURRENT_EXPORTS = 2
+
+    ACCESS_REQUEST_CLAIM_TTL = 10 * 60
+    BULK_REVIEW_PAGE_SIZE = 10
+    ACCESS_REQUEST_HISTORY_PAGE_SIZE = 20
+    SEARCH_RESULTS_LIMIT = 10
+    # above this many new requests per rate window, reviewers get one digest
+    # message per digest delay instead of one message per request
+    ACCESS_REQUEST_DIGEST_THRESHOLD = 10
+    ACCESS_REQUEST_DIGEST_RATE_WINDOW = 60
+    ACCESS_REQUEST_DIGEST_DELAY = 30
+    ACCESS_REQUEST_DIGEST_MAX_LINES = 20
+    # how often held requests are checked for a digest that's due
+    ACCESS_REQUEST_DIGEST_FLUSH_INTERVAL = 5
+    ACCESS_REQUEST_SLA_INTERVAL = 10 * 60
+    ACCESS_REQUEST_ESCALATE_AFTER = 24 * 60 * 60
+    ACCESS_REQUEST_EXPIRE_AFTER = 7 * 24 * 60 * 60
+    ACCESS_REQUEST_EXPIRE_BATCH_SIZE = 1000
+    ACCESS_REQUEST_ARCHIVE_INTERVAL = 6 * 60 * 60
+    ACCESS_REQUEST_ARCHIVE_AFTER = 90 * 24 * 60 * 60
+    ACCESS_REQUEST_ARCHIVE_BATCH_SIZE = 1000
+    INVITE_LINK_POOL_SIZE = 50
+    INVITE_LINK_POOL_REFILL_INTERVAL = 60
+    INVITE_LINK_TTL = 2 * 24 * 60 * 60
+    INVITE_LINK_MIN_VALIDITY = 24 * 60 * 60
+    INVITE_LINK_REVOKE_INTERVAL = 30
+    INVITE_LINK_REVOKE_BATCH_SIZE = 100
+    # mirrored channel membership older than this is checked with the API again
+    CHANNEL_MEMBER_TTL = 24 * 60 * 60
+    CHANNEL_MEMBER_RECONCILE_INTERVAL = 60 * 60
+    CHANNEL_MEMBER_RECONCILE_BATCH_SIZE = 500
+    CHANNEL_ACCESS_RECONCILE_INTERVAL = 24 * 60 * 60
+    CHANNEL_ACCESS_RECONCILE_REMOVE_BANNED = True
+    CHANNEL_ACCESS_RECONCILE_MAX_REPORTED = 50
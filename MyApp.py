@@ -6,7 +6,7 @@ from telegram.ext import (
 from telegram.constants import ParseMode
 from ptbcontrib.ptb_jobstores.sqlalchemy import PTBSQLAlchemyJobStore
 
-from start import inits
+from start import inits, shutdown
 from Config import Config
 
 
@@ -21,6 +21,7 @@ class MyApp:
             ApplicationBuilder()
             .token(Config.BOT_TOKEN)
             .post_init(inits)
+            .post_shutdown(shutdown)
             .persistence(persistence=my_persistence)
             .defaults(defaults)
             .concurrent_updates(True)
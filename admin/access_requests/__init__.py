@@ -1,7 +1,11 @@
 from admin.access_requests.handlers import (
     access_approve_reject_handler,
+    access_review_privately_handler,
     access_requests_settings_handler,
     request_pending_access_request_handler,
     access_request_history_handler,
     access_invite_link_join_revoke_handler,
+    bulk_review_access_requests_handler,
+    bulk_review_decide_handler,
+    upload_order_ledger_handler,
 )
@@ -0,0 +1,1424 @@
+from collections import deque
+from datetime import datetime, timedelta
+from enum import Enum
+import asyncio
+import html
+import logging
+import time
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import aliased
+from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import BadRequest
+from pyrogram import enums as pyrogram_enums
+
+from common.lang_dicts import (
+    TEXTS,
+    BUTTONS,
+    ACCESS_REQUEST_STATUS_TEXT_KEYS,
+    get_lang,
+)
+from common.common import format_datetime
+from common.order_ledger import add_orders, normalize_order_id
+from common.rate_limiter import bot_api_limiter, gather_rate_limited
+from common.protected_channels import protected_channels, channel_title
+from common.channel_members import record_channel_members
+from admin.broadcast.functions import get_pyro_client
+from admin.manage_users_settings.functions import (
+    ImportFormat,
+    iter_import_rows,
+    filter_updated_between,
+)
+from models.AccessRequest import ACTIVE_ORDER_ID_WHERE, DIGEST_HELD_WHERE
+from Config import Config
+import models
+
+logger = logging.getLogger(__name__)
+
+
+def _access_request_view_query(s, table=models.AccessRequest):
+    """Everything the access request views render, with the requester joined in.
+
+    table is models.AccessRequest or models.AccessRequestArchive.
+    """
+    return s.query(
+        table.id,
+        table.user_id,
+        table.channel_id,
+        table.order_id,
+        table.submitted_username,
+        table.submitted_password,
+        table.status,
+        table.created_at,
+        table.duplicate_of,
+        models.User.username,
+        models.User.name,
+    ).outerjoin(models.User, models.User.user_id == table.user_id)
+
+
+def get_access_request_view(req_id: int):
+    """Row of _access_request_view_query for req_id, archived or not, or None."""
+    with models.session_scope() as s:
+        for table in (models.AccessRequest, models.AccessRequestArchive):
+            row = (
+                _access_request_view_query(s, table)
+                .filter(table.id == req_id)
+                .one_or_none()
+            )
+            if row:
+                return row
+
+
+def user_display(row):
+    if row.username:
+        return f"@{row.username}"
+    return row.name or str(row.user_id)
+
+
+def build_access_request_text(
+    row, lang: models.Language, with_credentials: bool = True
+):
+    """Message text of the access request row shown to reviewers.
+
+    Without with_credentials only the requester and the request id are shown,
+    for the copy posted to the shared review chat.
+    """
+    if not with_credentials:
+        text = TEXTS[lang]["access_request_message_brief"].format(
+            title=TEXTS[lang]["access_request_message_title"],
+            user=html.escape(user_display(row)),
+            req_id=row.id,
+        )
+    elif row.order_id:
+        text = TEXTS[lang]["access_request_message_order_id"].format(
+            title=TEXTS[lang]["access_request_message_title"],
+            user=html.escape(user_display(row)),
+            order_id=html.escape(row.order_id),
+            req_id=row.id,
+        )
+    else:
+        text = TEXTS[lang]["access_request_message"].format(
+            title=TEXTS[lang]["access_request_message_title"],
+            user=html.escape(user_display(row)),
+            username=html.escape(row.submitted_username or "—"),
+            password=html.escape(row.submitted_password or "—"),
+            req_id=row.id,
+        )
+    if row.duplicate_of:
+        text += TEXTS[lang]["access_request_duplicate_of"].format(
+            req_id=row.duplicate_of
+        )
+    if len(protected_channels) > 1:
+        text += TEXTS[lang]["access_request_channel"].format(
+            channel=html.escape(channel_title(row.channel_id))
+        )
+    return text
+
+
+def get_access_reviewers():
+    """{user_id: lang} of the owner and every admin allowed to manage access requests."""
+    with models.session_scope() as s:
+        has_permission = (
+            sa.select(models.AdminPermission.id)
+            .where(
+                models.AdminPermission.admin_id == models.User.user_id,
+                models.AdminPermission.permission
+                == models.Permission.MANAGE_ACCESS_REQUESTS,
+            )
+            .exists()
+        )
+        reviewers = dict(
+            s.query(models.User.user_id, models.User.lang).filter(
+                sa.or_(
+                    models.User.user_id == Config.OWNER_ID,
+                    sa.and_(models.User.is_admin, has_permission),
+                )
+            )
+        )
+    reviewers.setdefault(Config.OWNER_ID, models.Language.ARABIC)
+    return reviewers
+
+
+def save_access_request_messages(req_id: int, messages: list[tuple]):
+    """Remember the (chat_id, message_id) copies of req_id sent to reviewers."""
+    if not messages:
+        return
+    with models.session_scope() as s:
+        s.execute(
+            sqlite_insert(models.AccessRequestMessage).on_conflict_do_nothing(),
+            [
+                {"access_request_id": req_id, "chat_id": chat_id, "message_id": message_id}
+                for chat_id, message_id in messages
+            ],
+        )
+
+
+async def fan_out_access_request(bot: Bot, req_id: int):
+    """Send req_id to every reviewer concurrently and remember the sent copies.
+
+    With a review chat configured, the request is posted there once instead.
+    Returns how many copies were sent.
+    """
+    from admin.access_requests.keyboards import (
+        build_access_request_keyboard,
+        build_review_privately_keyboard,
+    )
+
+    row = get_access_request_view(req_id)
+    if not row:
+        return 0
+    if Config.ACCESS_REVIEW_CHAT_ID:
+        lang = get_lang(Config.OWNER_ID)
+        # the group copy leaves out the credentials, so it's decided on the full
+        # copy the reviewer gets privately
+        message = await bot.send_message(
+            chat_id=Config.ACCESS_REVIEW_CHAT_ID,
+            message_thread_id=Config.ACCESS_REVIEW_TOPIC_ID,
+            text=build_access_request_text(row, lang, with_credentials=False),
+            reply_markup=InlineKeyboardMarkup(
+                build_review_privately_keyboard(req_id, lang)
+            ),
+        )
+        save_access_request_messages(
+            req_id, [(Config.ACCESS_REVIEW_CHAT_ID, message.message_id)]
+        )
+        return 1
+    reviewers = get_access_reviewers()
+
+    async def send(chat_id: int):
+        lang = reviewers[chat_id]
+        message = await bot.send_message(
+            chat_id=chat_id,
+            text=build_access_request_text(row, lang),
+            reply_markup=InlineKeyboardMarkup(
+                build_access_request_keyboard(req_id, lang)
+            ),
+        )
+        return message.message_id
+
+    results = await gather_rate_limited(items=list(reviewers), func=send)
+    sent = [
+        (chat_id, message_id)
+        for chat_id, message_id in results.items()
+        if not isinstance(message_id, Exception)
+    ]
+    save_access_request_messages(req_id, sent)
+    return len(sent)
+
+
+_recent_arrivals = deque()
+
+
+def _held_for_digest():
+    # literal so the partial index over held requests is used
+    return sa.text(DIGEST_HELD_WHERE)
+
+
+async def notify_new_access_request(bot: Bot, req_id: int):
+    """Fan req_id out right away, or hold it for a digest while requests arrive too fast.
+
+    Past Config.ACCESS_REQUEST_DIGEST_THRESHOLD arrivals per rate window, and
+    while earlier requests are still held, the request is marked as held in
+    the database and sent later by flush_access_requests_digest.
+    """
+    now = time.monotonic()
+    _recent_arrivals.append(now)
+    while _recent_arrivals[0] < now - Config.ACCESS_REQUEST_DIGEST_RATE_WINDOW:
+        _recent_arrivals.popleft()
+    held = None
+    with models.session_scope() as s:
+        held = s.execute(
+            sa.select(models.AccessRequest.id).where(_held_for_digest()).limit(1)
+        ).scalar()
+    if not held and len(_recent_arrivals) <= Config.ACCESS_REQUEST_DIGEST_THRESHOLD:
+        return await fan_out_access_request(bot, req_id)
+    with models.session_scope() as s:
+        s.execute(
+            sa.update(models.AccessRequest)
+            .where(models.AccessRequest.id == req_id)
+            .values(
+                digest_held_at=datetime.now(),
+                updated_at=models.AccessRequest.updated_at,
+            )
+        )
+    return 0
+
+
+async def flush_access_requests_digest(bot: Bot):
+    """Send one digest of every held request once the oldest was held for Config.ACCESS_REQUEST_DIGEST_DELAY.
+
+    The held requests are released in the same statement that reads them,
+    so each one is sent once. Returns how many messages were sent.
+    """
+    cutoff = datetime.now() - timedelta(seconds=Config.ACCESS_REQUEST_DIGEST_DELAY)
+    oldest = (
+        sa.select(sa.func.min(models.AccessRequest.digest_held_at))
+        .where(_held_for_digest())
+        .scalar_subquery()
+    )
+    stmt = (
+        sa.update(models.AccessRequest)
+        .where(_held_for_digest(), oldest <= cutoff)
+        .values(digest_held_at=None, updated_at=models.AccessRequest.updated_at)
+        .returning(models.AccessRequest.id)
+    )
+    req_ids = []
+    with models.session_scope() as s:
+        req_ids = s.execute(stmt).scalars().all()
+    if not req_ids:
+        return 0
+    return await send_access_requests_digest(bot, sorted(req_ids))
+
+
+async def send_access_requests_digest(
+    bot: Bot, req_ids: list[int], title_key: str = "access_requests_digest"
+):
+    """Send one message listing req_ids, with a review next button, to every reviewer.
+
+    title_key is the TEXTS template of the message, formatted with count, hours
+    and lines. Returns how many messages were sent.
+    """
+    from admin.access_requests.keyboards import build_access_requests_digest_keyboard
+
+    with models.session_scope() as s:
+        rows = (
+            _access_request_view_query(s)
+            .filter(models.AccessRequest.id.in_(req_ids))
+            .order_by(models.AccessRequest.id)
+            .limit(Config.ACCESS_REQUEST_DIGEST_MAX_LINES)
+            .all()
+        )
+
+    def digest_text(lang: models.Language, with_credentials: bool):
+        lines = [
+            TEXTS[lang]["access_requests_digest_line"].format(
+                req_id=row.id,
+                user=html.escape(user_display(row)),
+                details=html.escape(
+                    (row.order_id or row.submitted_username or "—")
+                    if with_credentials
+                    else "—"
+                ),
+            )
+            for row in rows
+        ]
+        if len(req_ids) > len(rows):
+            lines.append(
+                TEXTS[lang]["access_requests_digest_more"].format(
+                    count=len(req_ids) - len(rows)
+                )
+            )
+        return TEXTS[lang][title_key].format(
+            count=len(req_ids),
+            hours=Config.ACCESS_REQUEST_ESCALATE_AFTER // 3600,
+            lines="\n".join(lines),
+        )
+
+    if Config.ACCESS_REVIEW_CHAT_ID:
+        reviewers = {Config.ACCESS_REVIEW_CHAT_ID: get_lang(Config.OWNER_ID)}
+    else:
+        reviewers = get_access_reviewers()
+
+    async def send(chat_id: int):
+        lang = reviewers[chat_id]
+        in_review_chat = chat_id == Config.ACCESS_REVIEW_CHAT_ID
+        await bot.send_message(
+            chat_id=chat_id,
+            message_thread_id=Config.ACCESS_REVIEW_TOPIC_ID if in_review_chat else None,
+            text=digest_text(lang, with_credentials=not in_review_chat),
+            reply_markup=InlineKeyboardMarkup(
+                build_access_requests_digest_keyboard(
+                    lang, bulk_review=not in_review_chat
+                )
+            ),
+        )
+
+    results = await gather_rate_limited(items=list(reviewers), func=send)
+    return sum(1 for result in results.values() if not isinstance(result, Exception))
+
+
+async def escalate_stale_access_requests(bot: Bot):
+    """Send one digest of the requests pending for over Config.ACCESS_REQUEST_ESCALATE_AFTER to every reviewer.
+
+    Each request is escalated once. Returns how many were escalated.
+    """
+    now = datetime.now()
+    stmt = (
+        sa.update(models.AccessRequest)
+        .where(
+            models.AccessRequest.status == models.AccessRequestStatus.PENDING,
+            models.AccessRequest.created_at
+            < now - timedelta(seconds=Config.ACCESS_REQUEST_ESCALATE_AFTER),
+            models.AccessRequest.escalated_at.is_(None),
+        )
+        .values(escalated_at=now)
+        .returning(models.AccessRequest.id)
+    )
+    req_ids = []
+    with models.session_scope() as s:
+        req_ids = s.execute(stmt).scalars().all()
+    if req_ids:
+        await send_access_requests_digest(
+            bot, req_ids, title_key="access_requests_escalation"
+        )
+    return len(req_ids)
+
+
+async def _expire_access_requests(bot: Bot, selected, text_key: str):
+    """Expire the pending requests whose ids the selected query returns, in one UPDATE.
+
+    Their reviewer copies are synced and their users sent TEXTS[text_key]
+    concurrently. Returns how many expired.
+    """
+    stmt = (
+        sa.update(models.AccessRequest)
+        .where(
+            models.AccessRequest.id.in_(selected.scalar_subquery()),
+            models.AccessRequest.status == models.AccessRequestStatus.PENDING,
+        )
+        .values(
+            status=models.AccessRequestStatus.EXPIRED,
+            claimed_by=None,
+            claimed_until=None,
+        )
+        .returning(models.AccessRequest.id, models.AccessRequest.user_id)
+    )
+    expired, langs = [], {}
+    with models.session_scope() as s:
+        expired = s.execute(stmt).all()
+        langs = dict(
+            s.query(models.User.user_id, models.User.lang).filter(
+                models.User.user_id.in_({user_id for _, user_id in expired})
+            )
+        )
+    if not expired:
+        return 0
+    await sync_access_request_messages(
+        bot, [req_id for req_id, _ in expired], models.AccessRequestStatus.EXPIRED
+    )
+
+    async def notify(user_id: int):
+        lang = langs.get(user_id, models.Language.ARABIC)
+        await bot.send_message(chat_id=user_id, text=TEXTS[lang][text_key])
+
+    await gather_rate_limited(
+        items={user_id for _, user_id in expired}, func=notify
+    )
+    return len(expired)
+
+
+async def expire_stale_access_requests(bot: Bot):
+    """Expire up to Config.ACCESS_REQUEST_EXPIRE_BATCH_SIZE requests pending for over Config.ACCESS_REQUEST_EXPIRE_AFTER."""
+    stale = (
+        sa.select(models.AccessRequest.id)
+        .where(
+            models.AccessRequest.status == models.AccessRequestStatus.PENDING,
+            models.AccessRequest.created_at
+            < datetime.now() - timedelta(seconds=Config.ACCESS_REQUEST_EXPIRE_AFTER),
+        )
+        .order_by(models.AccessRequest.created_at)
+        .limit(Config.ACCESS_REQUEST_EXPIRE_BATCH_SIZE)
+    )
+    return await _expire_access_requests(bot, stale, "access_expired_msg")
+
+
+async def expire_channel_access_requests(bot: Bot, channel_id: int):
+    """Expire every request still pending for channel_id, once it is no longer protected."""
+    pending = sa.select(models.AccessRequest.id).where(
+        models.AccessRequest.channel_id == channel_id,
+        models.AccessRequest.status == models.AccessRequestStatus.PENDING,
+    )
+    return await _expire_access_requests(
+        bot, pending, "access_channel_removed_msg"
+    )
+
+
+_DECISION_BUTTON_KEYS = {
+    models.AccessRequestStatus.APPROVED: "access_request_approved",
+    models.AccessRequestStatus.REJECTED: "access_request_rejected",
+    models.AccessRequestStatus.EXPIRED: "access_request_expired",
+}
+
+
+async def sync_access_request_messages(
+    bot: Bot,
+    req_ids: list[int],
+    status: models.AccessRequestStatus,
+    exclude: tuple = None,
+):
+    """Replace the buttons of every reviewer copy of req_ids with the decision.
+
+    The copies are forgotten in the same statement that reads them, so each one
+    is edited once even if the request is synced twice. exclude is the
+    (chat_id, message_id) of the copy the decision was made on, already edited.
+    """
+    with models.session_scope() as s:
+        copies = s.execute(
+            sa.delete(models.AccessRequestMessage)
+            .where(models.AccessRequestMessage.access_request_id.in_(req_ids))
+            .returning(
+                models.AccessRequestMessage.chat_id,
+                models.AccessRequestMessage.message_id,
+            )
+        ).all()
+        langs = dict(
+            s.query(models.User.user_id, models.User.lang).filter(
+                models.User.user_id.in_(
+                    {chat_id for chat_id, _ in copies} | {Config.OWNER_ID}
+                )
+            )
+        )
+    copies = [tuple(copy) for copy in copies if tuple(copy) != exclude]
+    key = _DECISION_BUTTON_KEYS[status]
+    # the review chat copy is in the owner's language, like when it was posted
+    default_lang = langs.get(Config.OWNER_ID, models.Language.ARABIC)
+
+    async def edit(copy: tuple):
+        chat_id, message_id = copy
+        text = BUTTONS[langs.get(chat_id, default_lang)][key]
+        await bot.edit_message_reply_markup(
+            chat_id=chat_id,
+            message_id=message_id,
+            reply_markup=InlineKeyboardMarkup.from_button(
+                InlineKeyboardButton(text=text, callback_data=text)
+            ),
+        )
+
+    results = await gather_rate_limited(items=copies, func=edit)
+    return sum(1 for result in results.values() if isinstance(result, Exception))
+
+
+def _claimable(admin_id: int, now: datetime):
+    return sa.and_(
+        models.AccessRequest.status == models.AccessRequestStatus.PENDING,
+        sa.or_(
+            models.AccessRequest.claimed_by.is_(None),
+            models.AccessRequest.claimed_by == admin_id,
+            models.AccessRequest.claimed_until < now,
+        ),
+    )
+
+
+def _channel_queue(channel_id: int = None):
+    if channel_id is None:
+        return sa.true()
+    return models.AccessRequest.channel_id == channel_id
+
+
+def _duplicates_queue(duplicates: bool):
+    if duplicates:
+        return models.AccessRequest.duplicate_of.isnot(None)
+    return models.AccessRequest.duplicate_of.is_(None)
+
+
+def select_active_order_request_id(order_id: str):
+    """Select the id of the request holding order_id, matching its partial unique index."""
+    return sa.select(models.AccessRequest.id).where(
+        models.AccessRequest.order_id == order_id,
+        sa.text(ACTIVE_ORDER_ID_WHERE),
+    )
+
+
+def get_active_order_request_id(order_id: str):
+    with models.session_scope() as s:
+        return s.execute(select_active_order_request_id(order_id)).scalar()
+
+
+def claim_pending_access_request(
+    admin_id: int, duplicates: bool = False, channel_id: int = None
+):
+    """Lease the oldest pending access request nobody else is reviewing to admin_id.
+
+    The lookup and the claim are a single UPDATE, so concurrent reviewers always
+    get different requests. A request still claimed by admin_id is handed back to
+    them (with a renewed lease) before a new one is claimed. Duplicate order id
+    requests only come from their own queue, with duplicates=True, and
+    channel_id limits the queue to one channel. Returns the claimed request as a
+    view row, read in the same transaction, or None.
+    """
+    now = datetime.now()
+    oldest = (
+        sa.select(models.AccessRequest.id)
+        .where(
+            _claimable(admin_id, now),
+            _duplicates_queue(duplicates),
+            _channel_queue(channel_id),
+        )
+        .order_by(
+            sa.case((models.AccessRequest.claimed_by == admin_id, 0), else_=1),
+            models.AccessRequest.created_at.asc(),
+            models.AccessRequest.id.asc(),
+        )
+        .limit(1)
+        .scalar_subquery()
+    )
+    return _claim_access_request(oldest, admin_id, now)
+
+
+def claim_access_request(req_id: int, admin_id: int):
+    """Lease req_id to admin_id if it's pending and nobody else is reviewing it.
+
+    Returns the claimed request as a view row, or None.
+    """
+    return _claim_access_request(req_id, admin_id, datetime.now())
+
+
+def _claim_access_request(req_id, admin_id: int, now: datetime):
+    """Lease req_id, an id or a scalar subquery selecting one, to admin_id with a single UPDATE."""
+    stmt = (
+        sa.update(models.AccessRequest)
+        .where(models.AccessRequest.id == req_id, _claimable(admin_id, now))
+        .values(
+            claimed_by=admin_id,
+            claimed_until=now + timedelta(seconds=Config.ACCESS_REQUEST_CLAIM_TTL),
+            # a claim isn't a change of the request itself
+            updated_at=models.AccessRequest.updated_at,
+        )
+        .returning(models.AccessRequest.id)
+    )
+    with models.session_scope() as s:
+        req_id = s.execute(stmt).scalar()
+        if not req_id:
+            return None
+        return (
+            _access_request_view_query(s)
+            .filter(models.AccessRequest.id == req_id)
+            .one()
+        )
+
+
+def release_access_request_claim(req_id: int, admin_id: int):
+    """Give back admin_id's lease on req_id, so other reviewers can claim it right away."""
+    with models.session_scope() as s:
+        s.execute(
+            sa.update(models.AccessRequest)
+            .where(
+                models.AccessRequest.id == req_id,
+                models.AccessRequest.claimed_by == admin_id,
+            )
+            .values(
+                claimed_by=None,
+                claimed_until=None,
+                updated_at=models.AccessRequest.updated_at,
+            )
+        )
+
+
+def count_claimed_by_others(
+    admin_id: int, duplicates: bool = False, channel_id: int = None
+):
+    now = datetime.now()
+    with models.session_scope() as s:
+        return (
+            s.query(sa.func.count(models.AccessRequest.id))
+            .filter(
+                models.AccessRequest.status == models.AccessRequestStatus.PENDING,
+                ~_claimable(admin_id, now),
+                _duplicates_queue(duplicates),
+                _channel_queue(channel_id),
+            )
+            .scalar()
+        )
+
+
+def decide_access_request(
+    req_id: int, admin_id: int, status: models.AccessRequestStatus
+):
+    """Move a pending access request to status with one conditional UPDATE.
+
+    Only one of several concurrent decisions can match the WHERE clause, so the
+    caller that gets a row back is the only one allowed to act on it. Returns
+    the request's (user_id, channel_id), or None if it's missing, already
+    decided or leased to another admin.
+    """
+    stmt = (
+        sa.update(models.AccessRequest)
+        .where(
+            models.AccessRequest.id == req_id,
+            _claimable(admin_id, datetime.now()),
+        )
+        .values(status=status, claimed_by=None, claimed_until=None)
+        .returning(models.AccessRequest.user_id, models.AccessRequest.channel_id)
+    )
+    with models.session_scope() as s:
+        return s.execute(stmt).one_or_none()
+
+
+def get_decision_error_key(req_id: int, admin_id: int):
+    """TEXTS key explaining why decide_access_request matched nothing."""
+    with models.session_scope() as s:
+        req = s.get(models.AccessRequest, req_id)
+        if not req:
+            return "access_not_found"
+        if req.status != models.AccessRequestStatus.PENDING:
+            return "access_request_already_processed"
+        return "access_request_claimed_by_other"
+
+
+def set_access_request_invite_link(
+    req_id: int, invite_link: str, expires_at: datetime = None
+):
+    with models.session_scope() as s:
+        s.execute(
+            sa.update(models.AccessRequest)
+            .where(models.AccessRequest.id == req_id)
+            .values(invite_link=invite_link, invite_link_expires_at=expires_at)
+        )
+
+
+def take_pooled_invite_links(channel_id: int, count: int = 1):
+    """Remove up to count links to channel_id from the pool in one statement and return them as (invite_link, expires_at).
+
+    Concurrent callers can't get the same link since each row is deleted by
+    exactly one DELETE ... RETURNING. Links expiring within
+    INVITE_LINK_MIN_VALIDITY are left for the sweeper.
+    """
+    valid_after = datetime.now() + timedelta(seconds=Config.INVITE_LINK_MIN_VALIDITY)
+    oldest = (
+        sa.select(models.InviteLink.id)
+        .where(
+            models.InviteLink.channel_id == channel_id,
+            sa.or_(
+                models.InviteLink.expires_at.is_(None),
+                models.InviteLink.expires_at > valid_after,
+            ),
+        )
+        .order_by(models.InviteLink.id.asc())
+        .limit(count)
+        .scalar_subquery()
+    )
+    stmt = (
+        sa.delete(models.InviteLink)
+        .where(models.InviteLink.id.in_(oldest))
+        .returning(models.InviteLink.invite_link, models.InviteLink.expires_at)
+    )
+    with models.session_scope() as s:
+        return [tuple(row) for row in s.execute(stmt)]
+
+
+async def create_access_invite_link(bot: Bot, channel_id: int):
+    """Create a single-use invite link to channel_id expiring in INVITE_LINK_TTL, returns (invite_link, expires_at)."""
+    expires_at = datetime.now().replace(microsecond=0) + timedelta(
+        seconds=Config.INVITE_LINK_TTL
+    )
+    invite_link_obj = await bot.create_chat_invite_link(
+        chat_id=channel_id,
+        member_limit=1,
+        expire_date=int(expires_at.timestamp()),
+    )
+    return invite_link_obj.invite_link, expires_at
+
+
+async def refill_invite_link_pool(bot: Bot):
+    """Top the pool of every channel up to INVITE_LINK_POOL_SIZE links, returns how many were added."""
+    pooled = {}
+    with models.session_scope() as s:
+        pooled = dict(
+            s.query(models.InviteLink.channel_id, sa.func.count())
+            .group_by(models.InviteLink.channel_id)
+            .all()
+        )
+    missing = [
+        (channel_id, i)
+        for channel_id in list(protected_channels)
+        for i in range(Config.INVITE_LINK_POOL_SIZE - pooled.get(channel_id, 0))
+    ]
+    if not missing:
+        return 0
+    results = await gather_rate_limited(
+        items=missing,
+        func=lambda item: create_access_invite_link(bot, item[0]),
+    )
+    links = [
+        {"invite_link": result[0], "expires_at": result[1], "channel_id": item[0]}
+        for item, result in results.items()
+        if isinstance(result, tuple)
+    ]
+    if links:
+        with models.session_scope() as s:
+            s.execute(sa.insert(models.InviteLink), links)
+    return len(links)
+
+
+async def get_access_invite_link(bot: Bot, channel_id: int):
+    """A link to channel_id from the pool, or a new one when the pool is empty, as (invite_link, expires_at)."""
+    pooled = take_pooled_invite_links(channel_id)
+    if pooled:
+        return pooled[0]
+    return await create_access_invite_link(bot, channel_id)
+
+
+async def notify_access_decision(
+    bot: Bot,
+    user_id: int,
+    lang: models.Language,
+    approved: bool,
+    channel_id: int = None,
+    invite_link: tuple = None,
+    req_id: int = None,
+):
+    """Tell the user about the decision, returns the (invite_link, expires_at) given to them if approved.
+
+    Approvals use invite_link, or a link to channel_id from the pool, and only
+    create one inline when the pool is empty. A link taken here is saved on
+    req_id before it is sent, so the sweeper revokes it even if the message
+    never arrives.
+    """
+    if not approved:
+        await bot.send_message(
+            chat_id=user_id,
+            text=TEXTS[lang]["access_rejected_msg"],
+        )
+        return None
+    if not invite_link:
+        invite_link = await get_access_invite_link(
+            bot, channel_id or Config.PRIVATE_CHANNEL_ID
+        )
+        if req_id:
+            set_access_request_invite_link(req_id, *invite_link)
+    await bot.send_message(
+        chat_id=user_id,
+        text=TEXTS[lang]["access_approved_with_link_msg"].format(
+            invite_link=invite_link[0]
+        ),
+    )
+    return invite_link
+
+
+def request_invite_link_revocation(invite_link: str):
+    """Queue the link for the revocation sweeper, returns the access request id it belongs to."""
+    stmt = (
+        sa.update(models.AccessRequest)
+        .where(
+            models.AccessRequest.invite_link == invite_link,
+            models.AccessRequest.is_revoked == False,  # noqa: E712
+        )
+        .values(revoke_requested=True)
+        .returning(models.AccessRequest.id)
+    )
+    with models.session_scope() as s:
+        return s.execute(stmt).scalar()
+
+
+async def sweep_invite_links(bot: Bot):
+    """Revoke one batch of links that were used or have expired, returns how many were revoked.
+
+    Pool links too close to their expiry to be handed out are dropped as well.
+    """
+    now = datetime.now()
+    with models.session_scope() as s:
+        s.execute(
+            sa.delete(models.InviteLink).where(
+                models.InviteLink.expires_at
+                <= now + timedelta(seconds=Config.INVITE_LINK_MIN_VALIDITY)
+            )
+        )
+        # union of two partial index scans instead of a scan of every request
+        used = sa.select(
+            models.AccessRequest.id,
+            models.AccessRequest.invite_link,
+            models.AccessRequest.channel_id,
+        ).where(
+            models.AccessRequest.revoke_requested == True,  # noqa: E712
+            models.AccessRequest.is_revoked == False,  # noqa: E712
+        )
+        expired = sa.select(
+            models.AccessRequest.id,
+            models.AccessRequest.invite_link,
+            models.AccessRequest.channel_id,
+        ).where(
+            models.AccessRequest.invite_link.isnot(None),
+            models.AccessRequest.is_revoked == False,  # noqa: E712
+            models.AccessRequest.invite_link_expires_at <= now,
+        )
+        links = {
+            req_id: (invite_link, channel_id)
+            for req_id, invite_link, channel_id in s.execute(
+                sa.union(used, expired).limit(Config.INVITE_LINK_REVOKE_BATCH_SIZE)
+            )
+        }
+    if not links:
+        return 0
+
+    async def revoke(req_id: int):
+        invite_link, channel_id = links[req_id]
+        try:
+            await bot.revoke_chat_invite_link(
+                chat_id=channel_id,
+                invite_link=invite_link,
+            )
+        except BadRequest:
+            # the link is already gone, nothing left to revoke
+            pass
+        return req_id
+
+    results = await gather_rate_limited(items=list(links), func=revoke)
+    revoked = [
+        {"id": req_id, "is_revoked": True, "revoke_requested": False}
+        for req_id, result in results.items()
+        if not isinstance(result, Exception)
+    ]
+    if revoked:
+        with models.session_scope() as s:
+            s.execute(sa.update(models.AccessRequest), revoked)
+    return len(revoked)
+
+
+_ARCHIVED_COLUMNS = (
+    "id",
+    "user_id",
+    "channel_id",
+    "submitted_username",
+    "submitted_password",
+    "order_id",
+    "duplicate_of",
+    "status",
+    "invite_link",
+    "invite_link_expires_at",
+    "is_revoked",
+    "created_at",
+    "updated_at",
+)
+
+
+def _archivable(before: datetime):
+    """Decided requests last updated before `before` that nothing in access_requests depends on.
+
+    Approved requests holding their order id stay, since ACTIVE_ORDER_ID_INDEX
+    can only enforce uniqueness within the table, as do requests whose invite
+    link still has to be revoked and requests other requests are duplicates of.
+    """
+    duplicates = aliased(models.AccessRequest)
+    return sa.and_(
+        models.AccessRequest.status.in_(
+            [
+                models.AccessRequestStatus.APPROVED,
+                models.AccessRequestStatus.REJECTED,
+                models.AccessRequestStatus.EXPIRED,
+            ]
+        ),
+        models.AccessRequest.updated_at < before,
+        sa.not_(
+            sa.and_(
+                models.AccessRequest.status == models.AccessRequestStatus.APPROVED,
+                models.AccessRequest.order_id.isnot(None),
+                models.AccessRequest.duplicate_of.is_(None),
+            )
+        ),
+        sa.or_(
+            models.AccessRequest.invite_link.is_(None),
+            models.AccessRequest.is_revoked == True,  # noqa: E712
+        ),
+        ~sa.exists().where(duplicates.duplicate_of == models.AccessRequest.id),
+    )
+
+
+def archive_access_requests():
+    """Move archivable requests older than Config.ACCESS_REQUEST_ARCHIVE_AFTER to access_requests_archive.
+
+    Every batch of Config.ACCESS_REQUEST_ARCHIVE_BATCH_SIZE requests is copied
+    and deleted in its own short transaction, so the bot keeps writing in
+    between. Stops at the first batch that fails, which is logged. Meant to
+    run in a worker thread. Returns how many were archived.
+    """
+    before = datetime.now() - timedelta(seconds=Config.ACCESS_REQUEST_ARCHIVE_AFTER)
+    columns = [getattr(models.AccessRequest, c) for c in _ARCHIVED_COLUMNS]
+    archived = 0
+    while True:
+        moved = 0
+        with models.session_scope() as s:
+            batch = (
+                s.execute(
+                    sa.select(models.AccessRequest.id)
+                    .where(_archivable(before))
+                    .order_by(models.AccessRequest.id)
+                    .limit(Config.ACCESS_REQUEST_ARCHIVE_BATCH_SIZE)
+                )
+                .scalars()
+                .all()
+            )
+            if batch:
+                s.execute(
+                    sa.insert(models.AccessRequestArchive).from_select(
+                        [*_ARCHIVED_COLUMNS, "archived_at"],
+                        sa.select(*columns, sa.literal(datetime.now())).where(
+                            models.AccessRequest.id.in_(batch)
+                        ),
+                    )
+                )
+                s.execute(
+                    sa.delete(models.AccessRequest).where(
+                        models.AccessRequest.id.in_(batch)
+                    )
+                )
+            # session_scope swallows a failed commit, so only count it once done
+            s.commit()
+            moved = len(batch)
+        archived += moved
+        if moved < Config.ACCESS_REQUEST_ARCHIVE_BATCH_SIZE:
+            return archived
+
+
+class BulkReviewFilter(Enum):
+    ALL = "all"
+    TODAY = "today"
+    ORDER_ID = "order_id"
+    ORDER_ID_TODAY = "order_id_today"
+    DUPLICATES = "duplicates"
+
+
+def _approved_and_banned_user_ids(channel_id: int):
+    """Users with an approved request to channel_id, archived or not, and users banned in the bot."""
+    with models.session_scope() as s:
+        approved = set()
+        for table in (models.AccessRequest, models.AccessRequestArchive):
+            approved.update(
+                s.execute(
+                    sa.select(table.user_id)
+                    .where(
+                        table.channel_id == channel_id,
+                        table.status == models.AccessRequestStatus.APPROVED,
+                    )
+                    .distinct()
+                ).scalars()
+            )
+        banned = set(
+            s.execute(
+                sa.select(models.User.user_id).where(models.User.is_banned)
+            ).scalars()
+        )
+    return approved, banned
+
+
+async def _list_channel_members(client, channel_id: int):
+    """User ids of the members of channel_id, without bots, the ids of its admins, and how many members were listed.
+
+    Telegram caps how many members of a channel can be listed, so the
+    count can fall short of the channel's member count.
+    """
+    members, admins = set(), set()
+    listed = 0
+    async for member in client.get_chat_members(channel_id):
+        listed += 1
+        if member.user.is_bot:
+            continue
+        if member.status in (
+            pyrogram_enums.ChatMemberStatus.OWNER,
+            pyrogram_enums.ChatMemberStatus.ADMINISTRATOR,
+        ):
+            admins.add(member.user.id)
+        else:
+            members.add(member.user.id)
+    return members, admins, listed
+
+
+async def _remove_channel_member(bot: Bot, channel_id: int, user_id: int):
+    # الحظر ثم إلغاؤه يخرج المستخدم دون منعه من العودة لاحقاً
+    await bot.ban_chat_member(chat_id=channel_id, user_id=user_id)
+    await bot.unban_chat_member(chat_id=channel_id, user_id=user_id, only_if_banned=True)
+
+
+def _user_ids_text(user_ids: set):
+    shown = sorted(user_ids)[: Config.CHANNEL_ACCESS_RECONCILE_MAX_REPORTED]
+    text = " ".join(f"<code>{user_id}</code>" for user_id in shown)
+    if len(user_ids) > len(shown):
+        text += " …"
+    return text or "-"
+
+
+async def reconcile_channel_access(bot: Bot):
+    """List the members of every protected channel over MTProto and diff them against approved requests and banned users.
+
+    Members banned in the bot are removed in rate-limited batches when
+    Config.CHANNEL_ACCESS_RECONCILE_REMOVE_BANNED is set, members without
+    an approved request are only reported. A summary per channel is sent
+    to the owner, saying so when Telegram didn't list every member. Returns
+    {channel_id: (unapproved, banned, removed)}.
+    """
+    client = await get_pyro_client()
+    if not client:
+        return {}
+    lang = get_lang(Config.OWNER_ID)
+    report = {}
+    for channel_id in list(protected_channels):
+        try:
+            members, admins, listed = await _list_channel_members(client, channel_id)
+            total = await client.get_chat_members_count(channel_id)
+        except Exception as e:
+            logger.warning("Listing members of %s failed: %s", channel_id, e)
+            continue
+        if listed < total:
+            logger.warning(
+                "Only %s of %s members of %s could be listed", listed, total, channel_id
+            )
+        record_channel_members(channel_id, dict.fromkeys(members | admins, True))
+        approved, banned = await asyncio.to_thread(
+            _approved_and_banned_user_ids, channel_id
+        )
+        unapproved = members - approved - banned
+        banned_members = members & banned
+
+        removed = set()
+        if banned_members and Config.CHANNEL_ACCESS_RECONCILE_REMOVE_BANNED:
+            results = await gather_rate_limited(
+                items=banned_members,
+                func=lambda user_id: _remove_channel_member(bot, channel_id, user_id),
+            )
+            removed = {
+                user_id
+                for user_id, result in results.items()
+                if not isinstance(result, Exception)
+            }
+            record_channel_members(channel_id, dict.fromkeys(removed, False))
+        report[channel_id] = (unapproved, banned_members, removed)
+
+        text = TEXTS[lang]["channel_access_reconcile_summary"].format(
+            channel=html.escape(channel_title(channel_id)),
+            members=len(members),
+            unapproved=len(unapproved),
+            unapproved_ids=_user_ids_text(unapproved),
+            banned=len(banned_members),
+            banned_ids=_user_ids_text(banned_members),
+            removed=len(removed),
+        )
+        if listed < total:
+            text += TEXTS[lang]["channel_access_reconcile_partial"].format(
+                listed=listed, total=total
+            )
+        await bot_api_limiter.acquire()
+        try:
+            await bot.send_message(chat_id=Config.OWNER_ID, text=text)
+        except Exception as e:
+            logger.warning("Sending the reconciliation of %s failed: %s", channel_id, e)
+    return report
+
+
+def _bulk_review_clause(
+    review_filter: BulkReviewFilter, admin_id: int, channel_id: int = None
+):
+    clauses = [
+        _claimable(admin_id, datetime.now()),
+        _duplicates_queue(review_filter == BulkReviewFilter.DUPLICATES),
+        _channel_queue(channel_id),
+    ]
+    if review_filter in (BulkReviewFilter.TODAY, BulkReviewFilter.ORDER_ID_TODAY):
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        clauses.append(models.AccessRequest.created_at >= today)
+    if review_filter in (BulkReviewFilter.ORDER_ID, BulkReviewFilter.ORDER_ID_TODAY):
+        clauses.append(models.AccessRequest.order_id.isnot(None))
+    return sa.and_(*clauses)
+
+
+def get_bulk_review_page(
+    admin_id: int,
+    review_filter: BulkReviewFilter,
+    page: int = 0,
+    channel_id: int = None,
+):
+    """One page of the pending requests matching review_filter, oldest first, and their total count."""
+    clause = _bulk_review_clause(review_filter, admin_id, channel_id)
+    with models.session_scope() as s:
+        total = (
+            s.query(sa.func.count(models.AccessRequest.id)).filter(clause).scalar()
+        )
+        rows = (
+            s.query(
+                models.AccessRequest.id,
+                models.AccessRequest.order_id,
+                models.AccessRequest.submitted_username,
+                models.User.username,
+                models.User.name,
+            )
+            .outerjoin(models.User, models.User.user_id == models.AccessRequest.user_id)
+            .filter(clause)
+            .order_by(models.AccessRequest.created_at.asc(), models.AccessRequest.id.asc())
+            .offset(page * Config.BULK_REVIEW_PAGE_SIZE)
+            .limit(Config.BULK_REVIEW_PAGE_SIZE)
+            .all()
+        )
+    return rows, total
+
+
+def bulk_decide_access_requests(
+    admin_id: int,
+    status: models.AccessRequestStatus,
+    req_ids: list[int] = None,
+    review_filter: BulkReviewFilter = None,
+    channel_id: int = None,
+):
+    """Decide the given requests, or every request matching review_filter, in one conditional UPDATE.
+
+    Requests decided meanwhile or leased to other admins are skipped. Returns
+    (req_id, user_id, user_lang, channel_id) for every request this call decided.
+    """
+    if req_ids is not None:
+        clause = sa.and_(
+            models.AccessRequest.id.in_(req_ids),
+            _claimable(admin_id, datetime.now()),
+        )
+    else:
+        clause = _bulk_review_clause(review_filter, admin_id, channel_id)
+    stmt = (
+        sa.update(models.AccessRequest)
+        .where(clause)
+        .values(status=status, claimed_by=None, claimed_until=None)
+        .returning(
+            models.AccessRequest.id,
+            models.AccessRequest.user_id,
+            models.AccessRequest.channel_id,
+        )
+    )
+    with models.session_scope() as s:
+        decided = s.execute(stmt).all()
+        langs = dict(
+            s.query(models.User.user_id, models.User.lang).filter(
+                models.User.user_id.in_({user_id for _, user_id, _ in decided})
+            )
+        )
+    return [
+        (req_id, user_id, langs.get(user_id, models.Language.ARABIC), channel_id)
+        for req_id, user_id, channel_id in decided
+    ]
+
+
+async def notify_bulk_decisions(bot: Bot, decided: list[tuple], approved: bool):
+    """Notify every decided user concurrently through the shared rate limiter.
+
+    Approval links are taken from the pool, the missing ones created, and all
+    of them saved on their requests before any message is sent, so retried
+    sends reuse the same link and undelivered links are still revoked by the
+    sweeper. Returns how many users were notified and how many failed.
+    """
+    users = {
+        req_id: (user_id, lang, channel_id)
+        for req_id, user_id, lang, channel_id in decided
+    }
+    links = {}
+    if approved:
+        by_channel = {}
+        for req_id, (_, _, channel_id) in users.items():
+            by_channel.setdefault(channel_id or Config.PRIVATE_CHANNEL_ID, []).append(
+                req_id
+            )
+        for channel_id, req_ids in by_channel.items():
+            links.update(
+                zip(req_ids, take_pooled_invite_links(channel_id, len(req_ids)))
+            )
+        created = await gather_rate_limited(
+            items=[req_id for req_id in users if req_id not in links],
+            func=lambda req_id: create_access_invite_link(
+                bot, users[req_id][2] or Config.PRIVATE_CHANNEL_ID
+            ),
+        )
+        links.update(
+            (req_id, link) for req_id, link in created.items() if isinstance(link, tuple)
+        )
+        if links:
+            with models.session_scope() as s:
+                s.execute(
+                    sa.update(models.AccessRequest),
+                    [
+                        {
+                            "id": req_id,
+                            "invite_link": link[0],
+                            "invite_link_expires_at": link[1],
+                        }
+                        for req_id, link in links.items()
+                    ],
+                )
+
+    async def notify(req_id: int):
+        user_id, lang, _ = users[req_id]
+        if approved and req_id not in links:
+            raise ValueError(f"no invite link for access request {req_id}")
+        return await notify_access_decision(
+            bot, user_id, lang, approved, invite_link=links.get(req_id)
+        )
+
+    results = await gather_rate_limited(items=list(users), func=notify)
+    failed = sum(1 for result in results.values() if isinstance(result, Exception))
+    return len(results) - failed, failed
+
+
+class HistoryDateFilter(Enum):
+    ALL = "all"
+    TODAY = "today"
+    WEEK = "week"
+    MONTH = "month"
+
+
+HISTORY_STATUS_FILTERS = [None, *models.AccessRequestStatus]
+
+_HISTORY_DATE_DAYS = {
+    HistoryDateFilter.WEEK: 7,
+    HistoryDateFilter.MONTH: 30,
+}
+
+_CURSOR_FORMAT = "%Y%m%d%H%M%S%f"
+
+
+def encode_history_cursor(created_at: datetime, req_id: int):
+    """Fixed-width cursor small enough for callback data (64 bytes)."""
+    return f"{created_at.strftime(_CURSOR_FORMAT)}_{req_id}"
+
+
+def decode_history_cursor(cursor: str):
+    created_at, req_id = cursor.split("_")
+    return datetime.strptime(created_at, _CURSOR_FORMAT), int(req_id)
+
+
+def _history_order(created_at, req_id, backwards: bool):
+    if backwards:
+        return created_at.asc(), req_id.asc()
+    return created_at.desc(), req_id.desc()
+
+
+def get_access_request_history_page(
+    status: models.AccessRequestStatus = None,
+    date_filter: HistoryDateFilter = HistoryDateFilter.ALL,
+    cursor: str = None,
+    backwards: bool = False,
+):
+    """One page of the history, newest first, keyset paginated on (created_at, id).
+
+    The page starts right after cursor, or right before it when going
+    backwards, so every page is a single index range scan regardless of how
+    deep it is. Returns the rows and whether there are newer and older pages.
+    """
+    page_size = Config.ACCESS_REQUEST_HISTORY_PAGE_SIZE
+    if date_filter == HistoryDateFilter.TODAY:
+        since = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    elif date_filter in _HISTORY_DATE_DAYS:
+        since = datetime.now() - timedelta(days=_HISTORY_DATE_DAYS[date_filter])
+    else:
+        since = None
+
+    def page(table):
+        key = sa.tuple_(table.created_at, table.id)
+        query_filters = []
+        if status:
+            query_filters.append(table.status == status)
+        if since:
+            query_filters.append(table.created_at >= since)
+        if cursor:
+            cursor_key = sa.tuple_(*decode_history_cursor(cursor))
+            query_filters.append(key > cursor_key if backwards else key < cursor_key)
+        return (
+            sa.select(table.id, table.status, table.created_at)
+            .where(*query_filters)
+            .order_by(*_history_order(table.created_at, table.id, backwards))
+            .limit(page_size + 1)
+            .subquery()
+        )
+
+    # each table serves its own page from its index, the union only merges them
+    hot, archived = page(models.AccessRequest), page(models.AccessRequestArchive)
+    merged = sa.union_all(sa.select(hot), sa.select(archived)).subquery()
+    with models.session_scope() as s:
+        rows = s.execute(
+            sa.select(merged)
+            .order_by(*_history_order(merged.c.created_at, merged.c.id, backwards))
+            .limit(page_size + 1)
+        ).all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if backwards:
+        rows.reverse()
+        return rows, has_more, True
+    return rows, bool(cursor), has_more
+
+
+def import_order_ledger(
+    file, import_format: ImportFormat, progress: dict, channel_id: int
+):
+    """Add the order ids in the first column of the file to the ledger of channel_id, in batches.
+
+    progress is updated in place with the "added", "duplicates" and "skipped"
+    counters. Meant to run in a worker thread.
+    """
+    batch = {}
+
+    def flush():
+        added = add_orders(list(batch), channel_id)
+        progress["added"] += added
+        progress["duplicates"] += len(batch) - added
+        batch.clear()
+
+    for i, row in enumerate(iter_import_rows(file, import_format)):
+        order_id = normalize_order_id(row[0] if row else None)
+        if not order_id.isdigit():
+            # a headers row is expected at the top of the file
+            if i:
+                progress["skipped"] += 1
+            continue
+        batch[order_id] = None
+        if len(batch) >= Config.IMPORT_BATCH_SIZE:
+            flush()
+    if batch:
+        flush()
+    return progress
+
+
+ACCESS_REQUESTS_COLUMNS_WIDTHS = {
+    "A": 12,  # Request ID
+    "B": 15,  # User ID
+    "C": 20,  # Username
+    "D": 20,  # Submitted Username
+    "E": 15,  # Order ID
+    "F": 15,  # Status
+    "G": 20,  # Created At
+    "H": 20,  # Updated At
+}
+
+
+def access_requests_headers(lang: models.Language):
+    return [
+        TEXTS[lang]["excel_request_id"],
+        TEXTS[lang]["excel_user_id"],
+        TEXTS[lang]["excel_username"],
+        TEXTS[lang]["excel_submitted_username"],
+        TEXTS[lang]["excel_order_id"],
+        TEXTS[lang]["excel_status"],
+        TEXTS[lang]["excel_created_at"],
+        TEXTS[lang]["excel_updated_at"],
+    ]
+
+
+def iter_access_requests_rows(
+    lang: models.Language, since: datetime = None, until: datetime = None
+):
+    """Yield export rows of archived and live requests updated in (since, until]."""
+    texts = TEXTS[lang]
+    # archived requests first, then the ones still in access_requests
+    for table in (models.AccessRequestArchive, models.AccessRequest):
+        with models.session_scope() as s:
+            access_requests = filter_updated_between(
+                s.query(
+                    table.id,
+                    table.user_id,
+                    models.User.username,
+                    table.submitted_username,
+                    table.order_id,
+                    table.status,
+                    table.created_at,
+                    table.updated_at,
+                ).outerjoin(models.User, models.User.user_id == table.user_id),
+                table.updated_at,
+                since,
+                until,
+            )
+            access_requests = access_requests.order_by(table.id).yield_per(
+                Config.EXPORT_CHUNK_SIZE
+            )
+            for req in access_requests:
+                yield [
+                    req.id,
+                    req.user_id,
+                    f"@{req.username}" if req.username else texts["excel_no_username"],
+                    req.submitted_username or "",
+                    req.order_id or "",
+                    texts[ACCESS_REQUEST_STATUS_TEXT_KEYS[req.status]],
+                    format_datetime(req.created_at) or texts["excel_unknown"],
+                    format_datetime(req.updated_at) or texts["excel_unknown"],
+                ]
@@ -1,5 +1,9 @@
-# Admin: handle access requests (approve/reject, settings, history)
+# Admin: handle access requests (approve/reject, settings, history, bulk review)
+import asyncio
+import html
 import logging
+import re
+from tempfile import SpooledTemporaryFile
 
 from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.constants import ChatMemberStatus
@@ -12,16 +16,53 @@ from telegram.ext import (
     filters,
 )
 
-from common.lang_dicts import TEXTS, BUTTONS, get_lang
-from common.common import format_datetime
-from common.keyboards import build_back_button, build_back_to_home_page_button
+from common.lang_dicts import (
+    TEXTS,
+    BUTTONS,
+    ACCESS_REQUEST_STATUS_TEXT_KEYS,
+    get_lang,
+)
+from common.common import format_datetime, wait_with_progress
+from common.order_ledger import unused_order_ids
+from common.protected_channels import protected_channels, channel_title
+from common.channel_members import record_channel_members, is_member_status
+from common.keyboards import (
+    build_back_button,
+    build_back_to_home_page_button,
+    build_choose_channel_keyboard,
+)
 from common.back_to_home_page import back_to_admin_home_page_handler
 from admin.access_requests.keyboards import (
     build_access_request_keyboard,
+    build_bulk_review_keyboard,
     build_access_requests_settings_keyboard,
     build_access_request_history_keyboard,
 )
-from custom_filters import PrivateChatAndAdmin, PermissionFilter
+from admin.manage_users_settings.functions import get_import_format
+from admin.access_requests.functions import (
+    import_order_ledger,
+    BulkReviewFilter,
+    HistoryDateFilter,
+    HISTORY_STATUS_FILTERS,
+    get_access_request_history_page,
+    bulk_decide_access_requests,
+    get_bulk_review_page,
+    notify_access_decision,
+    notify_bulk_decisions,
+    request_invite_link_revocation,
+    claim_pending_access_request,
+    claim_access_request,
+    release_access_request_claim,
+    get_access_request_view,
+    build_access_request_text,
+    save_access_request_messages,
+    sync_access_request_messages,
+    user_display,
+    count_claimed_by_others,
+    decide_access_request,
+    get_decision_error_key,
+)
+from custom_filters import PrivateChatAndAdmin, PermissionFilter, AccessReviewChat
 from Config import Config
 from start import admin_command
 import models
@@ -29,47 +70,46 @@ import models
 logger = logging.getLogger(__name__)
 
 WAIT_ACCESS_REQUEST_ID = 0
+ORDER_LEDGER_FILE, ORDER_LEDGER_CHANNEL = range(2)
 
-_STATUS_TEXT_KEYS = {
-    models.AccessRequestStatus.PENDING: "status_pending",
-    models.AccessRequestStatus.APPROVED: "status_approved",
-    models.AccessRequestStatus.REJECTED: "status_rejected",
-}
-
-
-def _access_request_details_text(
-    req: models.AccessRequest, lang: models.Language, user_display: str
-):
-    status_text = TEXTS[lang].get(
-        _STATUS_TEXT_KEYS.get(req.status, "status_pending"), str(req.status)
-    )
+def _access_request_details_text(req, lang: models.Language):
+    status_text = TEXTS[lang][ACCESS_REQUEST_STATUS_TEXT_KEYS[req.status]]
     created = format_datetime(req.created_at)
     if req.order_id:
         return TEXTS[lang]["access_request_details_text_order_id"].format(
             id=req.id,
-            user=user_display,
-            order_id=req.order_id,
+            user=html.escape(user_display(req)),
+            order_id=html.escape(req.order_id),
             status=status_text,
             created_at=created,
         )
     return TEXTS[lang]["access_request_details_text"].format(
         id=req.id,
-        user=user_display,
-        username=req.submitted_username or "—",
-        password=req.submitted_password or "—",
+        user=html.escape(user_display(req)),
+        username=html.escape(req.submitted_username or "—"),
+        password=html.escape(req.submitted_password or "—"),
         status=status_text,
         created_at=created,
     )
 
 
 async def access_requests_settings(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Show access requests settings: 4 buttons (request pending, history, back, back to home)."""
+    """Show access requests settings, and cycle the channel the queues are limited to."""
     if not PrivateChatAndAdmin().filter(update) or not PermissionFilter(
         models.Permission.MANAGE_ACCESS_REQUESTS
     ).filter(update):
         return ConversationHandler.END
     lang = get_lang(update.effective_user.id)
-    keyboard = build_access_requests_settings_keyboard(lang)
+    channel_filter = context.user_data.get("access_channel_filter")
+    if channel_filter not in protected_channels:
+        channel_filter = None
+    if update.callback_query.data == "access_channel_filter":
+        filters_list = [None, *protected_channels]
+        channel_filter = filters_list[
+            (filters_list.index(channel_filter) + 1) % len(filters_list)
+        ]
+    context.user_data["access_channel_filter"] = channel_filter
+    keyboard = build_access_requests_settings_keyboard(lang, channel_filter)
     keyboard.append(build_back_to_home_page_button(lang=lang, is_admin=True)[0])
     await update.callback_query.edit_message_text(
         text=TEXTS[lang]["access_requests_settings_title"],
@@ -81,20 +121,49 @@ async def access_requests_settings(update: Update, context: ContextTypes.DEFAULT
 async def access_request_history_show(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ):
-    """Show access request history: ask for id with keyboard of last 20 access requests + back + back to home."""
+    """Show access request history: ask for id with a keyset-paginated, filterable keyboard of access requests + back + back to home."""
     if not PrivateChatAndAdmin().filter(update) or not PermissionFilter(
         models.Permission.MANAGE_ACCESS_REQUESTS
     ).filter(update):
         return ConversationHandler.END
     lang = get_lang(update.effective_user.id)
-    with models.session_scope() as s:
-        access_requests = (
-            s.query(models.AccessRequest)
-            .order_by(models.AccessRequest.created_at.desc())
-            .limit(20)
-            .all()
-        )
-    keyboard = build_access_request_history_keyboard(access_requests, lang)
+    data = update.callback_query.data
+    cursor = None
+    backwards = False
+    if data == "access_request_history":
+        context.user_data["history_status_filter"] = None
+        context.user_data["history_date_filter"] = HistoryDateFilter.ALL
+    elif data == "access_history_status":
+        current = context.user_data.get("history_status_filter")
+        context.user_data["history_status_filter"] = HISTORY_STATUS_FILTERS[
+            (HISTORY_STATUS_FILTERS.index(current) + 1) % len(HISTORY_STATUS_FILTERS)
+        ]
+    elif data == "access_history_date":
+        date_filters = list(HistoryDateFilter)
+        current = context.user_data.get("history_date_filter", HistoryDateFilter.ALL)
+        context.user_data["history_date_filter"] = date_filters[
+            (date_filters.index(current) + 1) % len(date_filters)
+        ]
+    elif data.startswith("access_history_"):
+        # المؤشر محمول في بيانات الزر: access_history_{n|p}_{created_at}_{id}
+        _, _, direction, cursor = data.split("_", 3)
+        backwards = direction == "p"
+    status = context.user_data.get("history_status_filter")
+    date_filter = context.user_data.get("history_date_filter", HistoryDateFilter.ALL)
+    access_requests, has_newer, has_older = get_access_request_history_page(
+        status=status,
+        date_filter=date_filter,
+        cursor=cursor,
+        backwards=backwards,
+    )
+    keyboard = build_access_request_history_keyboard(
+        access_requests,
+        lang,
+        status=status,
+        date_filter=date_filter,
+        has_newer=has_newer,
+        has_older=has_older,
+    )
     keyboard.append(build_back_button("back_to_access_request_history_show", lang=lang))
     keyboard.append(build_back_to_home_page_button(lang=lang, is_admin=True)[0])
     await update.callback_query.edit_message_text(
@@ -122,11 +191,7 @@ async def show_access_request_details(
     else:
         req_id = int(update.callback_query.data.replace("access_request_id_", ""))
 
-    user_display = None
-    with models.session_scope() as s:
-        req = s.get(models.AccessRequest, req_id)
-        user_display = f"@{req.user.username}" if req.user.username else req.user.name
-
+    req = get_access_request_view(req_id)
     if not req:
         if update.callback_query:
             await update.callback_query.answer(
@@ -139,7 +204,7 @@ async def show_access_request_details(
             )
         return WAIT_ACCESS_REQUEST_ID
 
-    text = _access_request_details_text(req, lang, user_display)
+    text = _access_request_details_text(req, lang)
     back_buttons = [
         build_back_button("back_to_show_access_request_details", lang=lang),
         build_back_to_home_page_button(lang=lang, is_admin=True)[0],
@@ -161,7 +226,7 @@ back_to_show_access_request_details = access_request_history_show
 
 access_requests_settings_handler = CallbackQueryHandler(
     access_requests_settings,
-    "^access_requests_settings$",
+    "^access_requests_settings$|^access_channel_filter$",
 )
 
 
@@ -182,6 +247,10 @@ access_request_history_handler = ConversationHandler(
                 show_access_request_details,
                 pattern=r"^access_request_id_\d+$",
             ),
+            CallbackQueryHandler(
+                access_request_history_show,
+                pattern=r"^access_history_((n|p)_\d{20}_\d+|status|date)$",
+            ),
         ],
     },
     fallbacks=[
@@ -202,70 +271,129 @@ access_request_history_handler = ConversationHandler(
 async def request_pending_access_request(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ):
-    """Send the oldest pending access request to the admin with approve/reject buttons, then delete the menu message."""
-    if not PrivateChatAndAdmin().filter(update) or not PermissionFilter(
-        models.Permission.MANAGE_ACCESS_REQUESTS
-    ).filter(update):
+    """Claim the oldest unclaimed pending access request for the admin and send it privately with approve/reject buttons, then delete the menu message (digests are kept)."""
+    # زر المراجعة في رسالة الملخص يعمل أيضاً من مجموعة المراجعة
+    from_digest = update.callback_query.data == "access_digest_review_next"
+    if not (
+        PrivateChatAndAdmin().filter(update)
+        or (from_digest and AccessReviewChat().filter(update))
+    ) or not PermissionFilter(models.Permission.MANAGE_ACCESS_REQUESTS).filter(update):
         return
     lang = get_lang(update.effective_user.id)
-    with models.session_scope() as s:
-        oldest = (
-            s.query(models.AccessRequest)
-            .filter(models.AccessRequest.status == models.AccessRequestStatus.PENDING)
-            .order_by(models.AccessRequest.created_at.asc())
-            .first()
-        )
-        if oldest:
-            u = oldest.user
-            user_display = (
-                f"@{u.username}"
-                if u and u.username
-                else (u.name if u else str(oldest.user_id))
-            )
+    admin_id = update.effective_user.id
+    # طلبات أرقام الطلب المكررة لها طابور منفصل منخفض الأولوية
+    duplicates = update.callback_query.data.endswith("duplicate_access_request")
+    channel_id = context.user_data.get("access_channel_filter")
+    oldest = claim_pending_access_request(
+        admin_id, duplicates=duplicates, channel_id=channel_id
+    )
     if not oldest:
+        if count_claimed_by_others(
+            admin_id, duplicates=duplicates, channel_id=channel_id
+        ):
+            text = TEXTS[lang]["all_pending_access_requests_claimed"]
+        else:
+            text = TEXTS[lang]["no_pending_access_requests"]
         await update.callback_query.answer(
-            text=TEXTS[lang]["no_pending_access_requests"],
+            text=text,
             show_alert=True,
         )
         return
     req_id = oldest.id
-    if oldest.order_id:
-        text = TEXTS[lang]["access_request_message_order_id"].format(
-            title=TEXTS[lang]["access_request_message_title"],
-            user=user_display,
-            order_id=oldest.order_id,
-            req_id=req_id,
-        )
-    else:
-        text = TEXTS[lang]["access_request_message"].format(
-            title=TEXTS[lang]["access_request_message_title"],
-            user=user_display,
-            username=oldest.submitted_username or "—",
-            password=oldest.submitted_password or "—",
-            req_id=req_id,
-        )
     keyboard = build_access_request_keyboard(req_id, lang)
-    await context.bot.send_message(
+    message = await context.bot.send_message(
         chat_id=update.effective_user.id,
-        text=text,
+        text=build_access_request_text(oldest, lang),
         reply_markup=InlineKeyboardMarkup(keyboard),
     )
-    await update.callback_query.delete_message()
+    save_access_request_messages(req_id, [(message.chat_id, message.message_id)])
+    if from_digest:
+        await update.callback_query.answer()
+    else:
+        await update.callback_query.delete_message()
 
 
 request_pending_access_request_handler = CallbackQueryHandler(
     request_pending_access_request,
-    "^request_pending_access_request$",
+    "^(request_pending_(duplicate_)?access_request|access_digest_review_next)$",
+)
+
+
+async def _answer_review_not_allowed(update: Update):
+    # أعضاء مجموعة المراجعة بدون صلاحية لا يمكنهم اتخاذ القرار
+    # وقد لا يكونون من مستخدمي البوت
+    lang = models.Language.ARABIC
+    with models.session_scope() as s:
+        member = s.get(models.User, update.effective_user.id)
+        if member:
+            lang = member.lang
+    await update.callback_query.answer(
+        text=TEXTS[lang]["access_review_not_allowed"],
+        show_alert=True,
+    )
+
+
+async def access_review_privately_callback(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+):
+    """Claim the access request of a review chat copy for the reviewer and send them its full copy privately."""
+    if not AccessReviewChat().filter(update):
+        return
+    if not PermissionFilter(models.Permission.MANAGE_ACCESS_REQUESTS).filter(update):
+        await _answer_review_not_allowed(update)
+        return
+    lang = get_lang(update.effective_user.id)
+    admin_id = update.effective_user.id
+    req_id = int(update.callback_query.data.split("_")[-1])
+    row = claim_access_request(req_id, admin_id)
+    if not row:
+        await update.callback_query.answer(
+            text=TEXTS[lang][get_decision_error_key(req_id, admin_id)],
+            show_alert=True,
+        )
+        return
+    try:
+        message = await context.bot.send_message(
+            chat_id=admin_id,
+            text=build_access_request_text(row, lang),
+            reply_markup=InlineKeyboardMarkup(
+                build_access_request_keyboard(req_id, lang)
+            ),
+        )
+    except Exception as e:
+        logger.warning(
+            "Failed to send access request %s to %s: %s", req_id, admin_id, e
+        )
+        release_access_request_claim(req_id, admin_id)
+        await update.callback_query.answer(
+            text=TEXTS[lang]["access_request_private_send_failed"],
+            show_alert=True,
+        )
+        return
+    save_access_request_messages(req_id, [(message.chat_id, message.message_id)])
+    await update.callback_query.answer(
+        text=TEXTS[lang]["access_request_sent_privately"],
+        show_alert=True,
+    )
+
+
+access_review_privately_handler = CallbackQueryHandler(
+    access_review_privately_callback,
+    pattern=r"^access_review_privately_\d+$",
 )
 
 
 async def access_approve_reject_callback(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ):
-    """Handle Approve/Reject buttons on access request messages."""
-    if not PrivateChatAndAdmin().filter(update) or not PermissionFilter(
-        models.Permission.MANAGE_ACCESS_REQUESTS
-    ).filter(update):
+    """Handle Approve/Reject buttons on private access request messages."""
+    if AccessReviewChat().filter(update):
+        # نسخ المجموعة القديمة بأزرار القرار لا تعرض بيانات الدخول،
+        # لذا تُراجع في الخاص بدلاً من البت فيها مباشرة
+        return await access_review_privately_callback(update, context)
+    if not PrivateChatAndAdmin().filter(update):
+        return
+    if not PermissionFilter(models.Permission.MANAGE_ACCESS_REQUESTS).filter(update):
         return
     owner_lang = get_lang(update.effective_user.id)
     data = update.callback_query.data
@@ -275,31 +403,21 @@ async def access_approve_reject_callback(
         await update.callback_query.answer(text="Invalid request.", show_alert=True)
         return
     approved = data.startswith("access_approve_")
-    with models.session_scope() as s:
-        req = s.get(models.AccessRequest, req_id)
-        if not req:
-            await update.callback_query.answer(
-                text=TEXTS[owner_lang]["access_not_found"],
-                show_alert=True,
-            )
-            return
-        if req.status != models.AccessRequestStatus.PENDING:
-            await update.callback_query.answer(
-                text=TEXTS[owner_lang]["access_request_already_processed"],
-                show_alert=True,
-            )
-            return
-        req.status = (
-            models.AccessRequestStatus.APPROVED
-            if approved
-            else models.AccessRequestStatus.REJECTED
+    status = (
+        models.AccessRequestStatus.APPROVED
+        if approved
+        else models.AccessRequestStatus.REJECTED
+    )
+    admin_id = update.effective_user.id
+    decided = decide_access_request(req_id, admin_id, status)
+    if not decided:
+        await update.callback_query.answer(
+            text=TEXTS[owner_lang][get_decision_error_key(req_id, admin_id)],
+            show_alert=True,
         )
-        user_id = req.user_id
-        try:
-            usr = s.get(models.User, user_id)
-            user_lang = usr.lang if usr else models.Language.ARABIC
-        except Exception:
-            user_lang = models.Language.ARABIC
+        return
+    user_id, channel_id = decided
+    user_lang = get_lang(user_id)
 
     try:
         if approved:
@@ -313,27 +431,25 @@ async def access_approve_reject_callback(
         )
     except Exception:
         pass
+    # تحديث نسخ الطلب لدى باقي المراجعين حتى لا يعمل عليه أحد
+    message = update.callback_query.message
+    context.application.create_task(
+        sync_access_request_messages(
+            context.bot,
+            [req_id],
+            status,
+            exclude=(message.chat_id, message.message_id) if message else None,
+        )
+    )
     try:
-        if approved:
-            invite_link_obj = await context.bot.create_chat_invite_link(
-                chat_id=Config.PRIVATE_CHANNEL_ID,
-                member_limit=1,
-            )
-            await context.bot.send_message(
-                chat_id=user_id,
-                text=TEXTS[user_lang]["access_approved_with_link_msg"].format(
-                    invite_link=invite_link_obj.invite_link
-                ),
-            )
-            with models.session_scope() as s:
-                r = s.get(models.AccessRequest, req_id)
-                if r:
-                    r.invite_link = invite_link_obj.invite_link
-        else:
-            await context.bot.send_message(
-                chat_id=user_id,
-                text=TEXTS[user_lang]["access_rejected_msg"],
-            )
+        await notify_access_decision(
+            context.bot,
+            user_id,
+            user_lang,
+            approved,
+            channel_id=channel_id,
+            req_id=req_id,
+        )
     except Exception as e:
         logger.warning("Failed to notify user %s: %s", user_id, e)
 
@@ -352,60 +468,330 @@ access_approve_reject_handler = CallbackQueryHandler(
 )
 
 
-async def access_invite_link_join_revoke(
+async def _show_bulk_review(
+    update: Update, context: ContextTypes.DEFAULT_TYPE, lang: models.Language
+):
+    review_filter = context.user_data.get("bulk_review_filter", BulkReviewFilter.ALL)
+    page = context.user_data.get("bulk_review_page", 0)
+    selected: set = context.user_data.setdefault("bulk_review_selected", set())
+    channel_id = context.user_data.get("access_channel_filter")
+    rows, total = get_bulk_review_page(
+        update.effective_user.id, review_filter, page, channel_id
+    )
+    if not rows and page > 0:
+        # الصفحة أصبحت فارغة بعد البت في طلباتها، الرجوع إلى آخر صفحة متاحة
+        page = max(0, (total - 1) // Config.BULK_REVIEW_PAGE_SIZE)
+        context.user_data["bulk_review_page"] = page
+        rows, total = get_bulk_review_page(
+            update.effective_user.id, review_filter, page, channel_id
+        )
+    context.user_data["bulk_review_page_ids"] = [row.id for row in rows]
+    keyboard = build_bulk_review_keyboard(
+        lang=lang,
+        rows=rows,
+        selected=selected,
+        page=page,
+        total=total,
+        review_filter=review_filter,
+    )
+    await update.callback_query.edit_message_text(
+        text=TEXTS[lang]["bulk_review_title"].format(
+            total=total, selected=len(selected)
+        ),
+        reply_markup=InlineKeyboardMarkup(keyboard),
+    )
+
+
+async def bulk_review_access_requests(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ):
-    """When a user joins the private channel via an access-request invite link, revoke that link."""
-    channel_id = Config.PRIVATE_CHANNEL_ID
-    if not channel_id:
+    """Page through pending access requests and select the ones to decide in bulk."""
+    if not PrivateChatAndAdmin().filter(update) or not PermissionFilter(
+        models.Permission.MANAGE_ACCESS_REQUESTS
+    ).filter(update):
         return
-    cm = update.chat_member
-    if not cm or cm.chat.id != channel_id:
+    lang = get_lang(update.effective_user.id)
+    data = update.callback_query.data
+    selected: set = context.user_data.setdefault("bulk_review_selected", set())
+    if data == "bulk_review_access_requests":
+        context.user_data["bulk_review_page"] = 0
+        selected.clear()
+    elif data.startswith("bulk_review_page_"):
+        context.user_data["bulk_review_page"] = int(data.split("_")[-1])
+    elif data.startswith("bulk_review_toggle_"):
+        selected ^= {int(data.split("_")[-1])}
+    elif data == "bulk_review_select_page":
+        page_ids = set(context.user_data.get("bulk_review_page_ids", []))
+        if page_ids <= selected:
+            selected -= page_ids
+        else:
+            selected |= page_ids
+    elif data == "bulk_review_filter":
+        filters_list = list(BulkReviewFilter)
+        current = context.user_data.get("bulk_review_filter", BulkReviewFilter.ALL)
+        context.user_data["bulk_review_filter"] = filters_list[
+            (filters_list.index(current) + 1) % len(filters_list)
+        ]
+        context.user_data["bulk_review_page"] = 0
+        selected.clear()
+    await _show_bulk_review(update, context, lang)
+
+
+bulk_review_access_requests_handler = CallbackQueryHandler(
+    bulk_review_access_requests,
+    r"^bulk_review_(access_requests|page_\d+|toggle_\d+|select_page|filter)$",
+)
+
+
+async def bulk_review_decide(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Approve or reject the selected requests, or every request matching the filter, at once."""
+    if not PrivateChatAndAdmin().filter(update) or not PermissionFilter(
+        models.Permission.MANAGE_ACCESS_REQUESTS
+    ).filter(update):
         return
-    old_status = cm.old_chat_member.status if cm.old_chat_member else None
-    new_status = cm.new_chat_member.status if cm.new_chat_member else None
-    member_statuses = (
-        ChatMemberStatus.OWNER,
-        ChatMemberStatus.ADMINISTRATOR,
-        ChatMemberStatus.MEMBER,
-        ChatMemberStatus.RESTRICTED,
+    lang = get_lang(update.effective_user.id)
+    admin_id = update.effective_user.id
+    action, scope = re.match(
+        r"^bulk_review_(approve|reject)_(selected|all)$", update.callback_query.data
+    ).groups()
+    approved = action == "approve"
+    status = (
+        models.AccessRequestStatus.APPROVED
+        if approved
+        else models.AccessRequestStatus.REJECTED
     )
-    left_statuses = (ChatMemberStatus.LEFT, ChatMemberStatus.BANNED)
-    if new_status not in member_statuses or old_status not in left_statuses:
-        return
-    user_id = cm.new_chat_member.user.id if cm.new_chat_member else None
-    if not user_id:
+    selected: set = context.user_data.setdefault("bulk_review_selected", set())
+    if scope == "selected":
+        decided = bulk_decide_access_requests(
+            admin_id, status, req_ids=list(selected)
+        )
+    else:
+        decided = bulk_decide_access_requests(
+            admin_id,
+            status,
+            review_filter=context.user_data.get(
+                "bulk_review_filter", BulkReviewFilter.ALL
+            ),
+            channel_id=context.user_data.get("access_channel_filter"),
+        )
+    selected.clear()
+    if not decided:
+        await update.callback_query.answer(
+            text=TEXTS[lang]["bulk_review_nothing_decided"],
+            show_alert=True,
+        )
+        await _show_bulk_review(update, context, lang)
         return
-    req_id = None
-    with models.session_scope() as s:
-        req = (
-            s.query(models.AccessRequest)
-            .filter(models.AccessRequest.invite_link == cm.invite_link.invite_link)
-            .first()
+
+    logger.info(
+        "Access requests bulk %s: count=%s by admin_id=%s",
+        "approved" if approved else "rejected",
+        len(decided),
+        admin_id,
+    )
+    await update.callback_query.answer(
+        text=TEXTS[lang]["bulk_review_started"].format(count=len(decided)),
+        show_alert=True,
+    )
+    await _show_bulk_review(update, context, lang)
+
+    async def notify_and_report():
+        await sync_access_request_messages(
+            context.bot, [req_id for req_id, *_ in decided], status
+        )
+        notified, failed = await notify_bulk_decisions(context.bot, decided, approved)
+        await context.bot.send_message(
+            chat_id=admin_id,
+            text=TEXTS[lang]["bulk_review_summary"].format(
+                decision=TEXTS[lang]["status_approved" if approved else "status_rejected"],
+                decided=len(decided),
+                notified=notified,
+                failed=failed,
+            ),
+        )
+
+    context.application.create_task(notify_and_report())
+
+
+bulk_review_decide_handler = CallbackQueryHandler(
+    bulk_review_decide,
+    r"^bulk_review_(approve|reject)_(selected|all)$",
+)
+
+
+async def upload_order_ledger_start(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+):
+    if not PrivateChatAndAdmin().filter(update) or not PermissionFilter(
+        models.Permission.MANAGE_ACCESS_REQUESTS
+    ).filter(update):
+        return ConversationHandler.END
+    lang = get_lang(update.effective_user.id)
+    back_buttons = [
+        build_back_button("access_requests_settings", lang=lang),
+        build_back_to_home_page_button(lang=lang, is_admin=True)[0],
+    ]
+    data = update.callback_query.data
+    if data.startswith("order_ledger_channel_"):
+        channel_id = int(data.removeprefix("order_ledger_channel_"))
+    elif len(protected_channels) > 1:
+        # كل رقم طلب يخص قناة واحدة، لذا يُختار السجل حسب القناة
+        keyboard = build_choose_channel_keyboard("order_ledger_channel_")
+        keyboard.extend(back_buttons)
+        await update.callback_query.edit_message_text(
+            text=TEXTS[lang]["order_ledger_choose_channel"],
+            reply_markup=InlineKeyboardMarkup(keyboard),
+        )
+        return ORDER_LEDGER_CHANNEL
+    else:
+        channel_id = next(iter(protected_channels), Config.PRIVATE_CHANNEL_ID)
+    context.user_data["order_ledger_channel_id"] = channel_id
+    await update.callback_query.edit_message_text(
+        text=TEXTS[lang]["upload_order_ledger_instruction"].format(
+            unused=len(unused_order_ids)
+        )
+        + TEXTS[lang]["access_request_channel"].format(
+            channel=channel_title(channel_id)
+        ),
+        reply_markup=InlineKeyboardMarkup(back_buttons),
+    )
+    return ORDER_LEDGER_FILE
+
+
+def _order_ledger_progress_text(lang: models.Language, progress: dict, title_key: str):
+    return (
+        TEXTS[lang][title_key]
+        + "\n\n"
+        + TEXTS[lang]["order_ledger_progress"].format(
+            unused=len(unused_order_ids), **progress
         )
-        if not req:
-            return
-        req.is_revoked = True
-        invite_link = req.invite_link
-        req_id = req.id
+    )
+
+
+async def get_order_ledger_file(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if not PrivateChatAndAdmin().filter(update) or not PermissionFilter(
+        models.Permission.MANAGE_ACCESS_REQUESTS
+    ).filter(update):
+        return ConversationHandler.END
+    lang = get_lang(update.effective_user.id)
+    document = update.message.document
+    import_format = get_import_format(document.file_name)
+    if not import_format:
+        await update.message.reply_text(text=TEXTS[lang]["import_invalid_file"])
+        return
+
+    progress = {"added": 0, "duplicates": 0, "skipped": 0}
+    progress_msg = await update.message.reply_text(
+        text=_order_ledger_progress_text(lang, progress, "importing_order_ledger")
+    )
+
+    ledger_file = SpooledTemporaryFile(max_size=Config.EXPORT_SPOOL_MAX_SIZE)
     try:
-        await context.bot.revoke_chat_invite_link(
-            chat_id=channel_id,
-            invite_link=invite_link,
+        tg_file = await document.get_file()
+        await tg_file.download_to_memory(out=ledger_file)
+        ledger_file.seek(0)
+
+        task = asyncio.create_task(
+            asyncio.to_thread(
+                import_order_ledger,
+                ledger_file,
+                import_format,
+                progress,
+                context.user_data.get(
+                    "order_ledger_channel_id", Config.PRIVATE_CHANNEL_ID
+                ),
+            )
         )
+        await wait_with_progress(
+            task,
+            lambda: progress_msg.edit_text(
+                text=_order_ledger_progress_text(
+                    lang, progress, "importing_order_ledger"
+                )
+            ),
+        )
+        title_key = "order_ledger_imported_success"
+    except Exception:
+        logger.exception("Order ledger import failed")
+        title_key = "import_error"
+    finally:
+        ledger_file.close()
+
+    await progress_msg.edit_text(
+        text=_order_ledger_progress_text(lang, progress, title_key)
+    )
+    keyboard = build_access_requests_settings_keyboard(
+        lang, context.user_data.get("access_channel_filter")
+    )
+    keyboard.append(build_back_to_home_page_button(lang=lang, is_admin=True)[0])
+    await update.message.reply_text(
+        text=TEXTS[lang]["access_requests_settings_title"],
+        reply_markup=InlineKeyboardMarkup(keyboard),
+    )
+    return ConversationHandler.END
+
+
+upload_order_ledger_handler = ConversationHandler(
+    entry_points=[
+        CallbackQueryHandler(
+            upload_order_ledger_start,
+            "^upload_order_ledger$",
+        ),
+    ],
+    states={
+        ORDER_LEDGER_CHANNEL: [
+            CallbackQueryHandler(
+                upload_order_ledger_start,
+                r"^order_ledger_channel_-?\d+$",
+            ),
+        ],
+        ORDER_LEDGER_FILE: [
+            MessageHandler(
+                filters=filters.Document.ALL,
+                callback=get_order_ledger_file,
+            ),
+        ],
+    },
+    fallbacks=[
+        access_requests_settings_handler,
+        admin_command,
+        back_to_admin_home_page_handler,
+    ],
+    name="upload_order_ledger_conversation",
+    persistent=True,
+)
+
+
+async def access_invite_link_join_revoke(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+):
+    """Mirror membership changes in protected channels, and when a user joins via an access-request invite link, queue that link for revocation."""
+    cm = update.chat_member
+    # توجيه التحديث حسب القناة من القاموس المحمّل في الذاكرة
+    if not cm or cm.chat.id not in protected_channels:
+        return
+    user_id = cm.new_chat_member.user.id if cm.new_chat_member else None
+    if not user_id:
+        return
+    old_status = cm.old_chat_member.status if cm.old_chat_member else None
+    new_status = cm.new_chat_member.status
+    record_channel_members(cm.chat.id, {user_id: is_member_status(new_status)})
+    left_statuses = (ChatMemberStatus.LEFT, ChatMemberStatus.BANNED)
+    if not is_member_status(new_status) or old_status not in left_statuses:
+        return
+    if not cm.invite_link:
+        return
+    # الإلغاء الفعلي للرابط يتم في مهمة دورية على دفعات بدل استدعاء API هنا
+    req_id = request_invite_link_revocation(cm.invite_link.invite_link)
+    if req_id:
         logger.info(
-            "Revoked access invite link after user joined: user_id=%s request_id=%s",
+            "Queued access invite link revocation after user joined: user_id=%s request_id=%s",
             user_id,
             req_id,
         )
-    except Exception as e:
-        logger.warning(
-            "Failed to revoke access invite link (user_id=%s): %s", user_id, e
-        )
 
 
 access_invite_link_join_revoke_handler = ChatMemberHandler(
     access_invite_link_join_revoke,
     chat_member_types=ChatMemberHandler.CHAT_MEMBER,
-    chat_id=Config.PRIVATE_CHANNEL_ID,
 )
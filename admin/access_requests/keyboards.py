@@ -1,6 +1,17 @@
 from telegram import InlineKeyboardButton
 from common.lang_dicts import BUTTONS, TEXTS
-from common.keyboards import build_keyboard
+from common.keyboards import (
+    build_keyboard,
+    build_back_button,
+    build_back_to_home_page_button,
+)
+from admin.access_requests.functions import (
+    BulkReviewFilter,
+    HistoryDateFilter,
+    encode_history_cursor,
+)
+from common.protected_channels import protected_channels, channel_title
+from Config import Config
 import models
 
 
@@ -22,35 +33,126 @@ def build_access_request_keyboard(
     ]
 
 
+def build_review_privately_keyboard(
+    req_id: int, lang: models.Language = models.Language.ARABIC
+):
+    """Review privately button under the review chat copy of an access request."""
+    return [
+        [
+            InlineKeyboardButton(
+                text=BUTTONS[lang]["access_request_review_privately"],
+                callback_data=f"access_review_privately_{req_id}",
+            ),
+        ],
+    ]
+
+
+def build_access_requests_digest_keyboard(
+    lang: models.Language = models.Language.ARABIC, bulk_review: bool = True
+):
+    """Review next button, and bulk review for private digests, under a digest of new access requests."""
+    keyboard = [
+        [
+            InlineKeyboardButton(
+                text=BUTTONS[lang]["access_digest_review_next"],
+                callback_data="access_digest_review_next",
+            ),
+        ],
+    ]
+    if bulk_review:
+        keyboard.append(
+            [
+                InlineKeyboardButton(
+                    text=BUTTONS[lang]["bulk_review_access_requests"],
+                    callback_data="bulk_review_access_requests",
+                ),
+            ]
+        )
+    return keyboard
+
+
 def build_access_requests_settings_keyboard(
     lang: models.Language = models.Language.ARABIC,
+    channel_filter: int = None,
 ):
-    """Four buttons: request pending, history, back, back to home (all from BUTTONS)."""
-    return [
+    """Access requests settings buttons, with a channel filter when several channels are protected."""
+    keyboard = [
         [
             InlineKeyboardButton(
                 text=BUTTONS[lang]["request_pending_access_request"],
                 callback_data="request_pending_access_request",
             ),
         ],
+        [
+            InlineKeyboardButton(
+                text=BUTTONS[lang]["request_pending_duplicate_access_request"],
+                callback_data="request_pending_duplicate_access_request",
+            ),
+        ],
         [
             InlineKeyboardButton(
                 text=BUTTONS[lang]["access_request_history"],
                 callback_data="access_request_history",
             ),
         ],
+        [
+            InlineKeyboardButton(
+                text=BUTTONS[lang]["bulk_review_access_requests"],
+                callback_data="bulk_review_access_requests",
+            ),
+        ],
+        [
+            InlineKeyboardButton(
+                text=BUTTONS[lang]["upload_order_ledger"],
+                callback_data="upload_order_ledger",
+            ),
+        ],
+        [
+            InlineKeyboardButton(
+                text=BUTTONS[lang]["export_access_requests"],
+                callback_data="export_access_requests",
+            ),
+        ],
+        [
+            InlineKeyboardButton(
+                text=BUTTONS[lang]["protected_channels_settings"],
+                callback_data="protected_channels_settings",
+            ),
+        ],
     ]
+    if len(protected_channels) > 1:
+        keyboard.insert(
+            0,
+            [
+                InlineKeyboardButton(
+                    text=BUTTONS[lang]["access_channel_filter"].format(
+                        channel=(
+                            channel_title(channel_filter)
+                            if channel_filter
+                            else BUTTONS[lang]["access_channel_filter_all"]
+                        )
+                    ),
+                    callback_data="access_channel_filter",
+                ),
+            ],
+        )
+    return keyboard
 
 
 def build_access_request_history_keyboard(
     access_requests: list,
     lang: models.Language = models.Language.ARABIC,
+    status: models.AccessRequestStatus = None,
+    date_filter: HistoryDateFilter = HistoryDateFilter.ALL,
+    has_newer: bool = False,
+    has_older: bool = False,
 ):
-    """Last 20 access requests as buttons + back + back to home. Uses TEXTS for status labels."""
+    """One page of access requests as buttons + newer/older + filters. Uses TEXTS for status labels."""
     status_key = {
         models.AccessRequestStatus.PENDING: "status_pending",
         models.AccessRequestStatus.APPROVED: "status_approved",
         models.AccessRequestStatus.REJECTED: "status_rejected",
+        models.AccessRequestStatus.EXPIRED: "status_expired",
     }
     if not access_requests:
         keyboard = []
@@ -61,4 +163,131 @@ def build_access_request_history_keyboard(
             texts.append(f"#{a.id} ({TEXTS[lang][key]})")
         buttons_data = [f"access_request_id_{a.id}" for a in access_requests]
         keyboard = build_keyboard(columns=2, texts=texts, buttons_data=buttons_data)
+    nav = []
+    if has_newer:
+        first = access_requests[0]
+        nav.append(
+            InlineKeyboardButton(
+                text=BUTTONS[lang]["prev_page"],
+                callback_data=f"access_history_p_{encode_history_cursor(first.created_at, first.id)}",
+            )
+        )
+    if has_older:
+        last = access_requests[-1]
+        nav.append(
+            InlineKeyboardButton(
+                text=BUTTONS[lang]["next_page"],
+                callback_data=f"access_history_n_{encode_history_cursor(last.created_at, last.id)}",
+            )
+        )
+    if nav:
+        keyboard.append(nav)
+    status_text = (
+        TEXTS[lang][status_key[status]]
+        if status
+        else BUTTONS[lang]["history_filter_all"]
+    )
+    keyboard.append(
+        [
+            InlineKeyboardButton(
+                text=BUTTONS[lang]["history_status_filter"].format(status=status_text),
+                callback_data="access_history_status",
+            ),
+            InlineKeyboardButton(
+                text=BUTTONS[lang][f"history_date_filter_{date_filter.value}"],
+                callback_data="access_history_date",
+            ),
+        ]
+    )
+    return keyboard
+
+
+def build_bulk_review_keyboard(
+    lang: models.Language,
+    rows: list,
+    selected: set,
+    page: int,
+    total: int,
+    review_filter: BulkReviewFilter,
+):
+    """Selectable page of pending requests, pagination, filter and bulk decision buttons."""
+    keyboard = []
+    for row in rows:
+        user = f"@{row.username}" if row.username else (row.name or "—")
+        details = row.order_id or row.submitted_username or "—"
+        keyboard.append(
+            [
+                InlineKeyboardButton(
+                    text=f"{'🟢' if row.id in selected else '🔴'} #{row.id} {details} · {user}",
+                    callback_data=f"bulk_review_toggle_{row.id}",
+                )
+            ]
+        )
+    pages = max(1, -(-total // Config.BULK_REVIEW_PAGE_SIZE))
+    nav = []
+    if page > 0:
+        nav.append(
+            InlineKeyboardButton(
+                text=BUTTONS[lang]["prev_page"],
+                callback_data=f"bulk_review_page_{page - 1}",
+            )
+        )
+    if page + 1 < pages:
+        nav.append(
+            InlineKeyboardButton(
+                text=BUTTONS[lang]["next_page"],
+                callback_data=f"bulk_review_page_{page + 1}",
+            )
+        )
+    if nav:
+        keyboard.append(nav)
+    if rows:
+        keyboard.append(
+            [
+                InlineKeyboardButton(
+                    text=BUTTONS[lang]["bulk_review_select_page"],
+                    callback_data="bulk_review_select_page",
+                ),
+            ]
+        )
+    keyboard.append(
+        [
+            InlineKeyboardButton(
+                text=BUTTONS[lang][f"bulk_review_filter_{review_filter.value}"],
+                callback_data="bulk_review_filter",
+            ),
+        ]
+    )
+    if selected:
+        keyboard.append(
+            [
+                InlineKeyboardButton(
+                    text=BUTTONS[lang]["bulk_approve_selected"].format(
+                        count=len(selected)
+                    ),
+                    callback_data="bulk_review_approve_selected",
+                ),
+                InlineKeyboardButton(
+                    text=BUTTONS[lang]["bulk_reject_selected"].format(
+                        count=len(selected)
+                    ),
+                    callback_data="bulk_review_reject_selected",
+                ),
+            ]
+        )
+    if total:
+        keyboard.append(
+            [
+                InlineKeyboardButton(
+                    text=BUTTONS[lang]["bulk_approve_all"].format(count=total),
+                    callback_data="bulk_review_approve_all",
+                ),
+                InlineKeyboardButton(
+                    text=BUTTONS[lang]["bulk_reject_all"].format(count=total),
+                    callback_data="bulk_review_reject_all",
+                ),
+            ]
+        )
+    keyboard.append(build_back_button("access_requests_settings", lang=lang))
+    keyboard.append(build_back_to_home_page_button(lang=lang, is_admin=True)[0])
     return keyboard
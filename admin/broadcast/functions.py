@@ -1,33 +1,204 @@
 from telegram import Message
+from telegram.error import RetryAfter
 from telegram.ext import ContextTypes
+from pyrogram import enums
+from pyrogram.errors import (
+    FloodWait,
+    PeerIdInvalid,
+    ChannelInvalid,
+    ChatIdInvalid,
+    InternalServerError,
+    ServiceUnavailable,
+)
+from common.rate_limiter import gather_rate_limited
+from PyroClientSingleton import PyroClientSingleton
+from enum import Enum
+import asyncio
+import html
+import logging
+import time
 
+logger = logging.getLogger(__name__)
 
-async def send_to(users: list[int], context: ContextTypes.DEFAULT_TYPE):
-    msg: Message = context.user_data["the_message"]
+
+class BroadcastTransport(Enum):
+    BOT_API = "bot_api"
+    MTPROTO = "mtproto"
+
+
+# errors after which the Bot API may still reach the chat: peers the MTProto
+# session hasn't met yet, and connection or server side problems. Anything
+# else, like a blocked bot or a deleted account, fails on both transports.
+_FALLBACK_ERRORS = (
+    PeerIdInvalid,
+    ChannelInvalid,
+    ChatIdInvalid,
+    InternalServerError,
+    ServiceUnavailable,
+    OSError,
+    asyncio.TimeoutError,
+)
+
+
+class _MTProtoUnavailable(Exception):
+    """MTProto couldn't reach the chat, the Bot API should be tried instead."""
+
+
+_pyro_start_lock = asyncio.Lock()
+
+
+class BroadcastStats:
+    def __init__(self, transport: BroadcastTransport, total: int):
+        self.transport = transport
+        self.total = total
+        self.sent = 0
+        self.failed = 0
+        self.fallbacks = 0
+        self.elapsed = 0.0
+
+    @property
+    def rate(self):
+        return self.sent / self.elapsed if self.elapsed else 0.0
+
+    def __repr__(self):
+        return (
+            f"BroadcastStats(transport={self.transport.value}, total={self.total}, "
+            f"sent={self.sent}, failed={self.failed}, fallbacks={self.fallbacks}, "
+            f"elapsed={self.elapsed:.2f}s, rate={self.rate:.2f}/s)"
+        )
+
+
+async def get_pyro_client():
+    """Return the connected MTProto client, starting it on first use, or None if it can't start."""
+    client = PyroClientSingleton()
+    async with _pyro_start_lock:
+        if not client.is_connected:
+            try:
+                await client.start()
+            except Exception as e:
+                logger.warning("Failed to start MTProto client: %s", e)
+                return None
+    return client
+
+
+def _get_media(msg: Message):
     media_types = {
         "photo": msg.photo[-1] if msg.photo else None,
         "video": msg.video,
         "audio": msg.audio,
         "voice": msg.voice,
     }
-    media = None
-    media_type = None
     for m_type, m in media_types.items():
         if m:
-            media = m
-            media_type = m_type
-            break
+            return m_type, m
+    return None, None
 
-    for user in users:
+
+async def send_to(
+    users: list[int],
+    context: ContextTypes.DEFAULT_TYPE,
+    transport: BroadcastTransport = BroadcastTransport.BOT_API,
+):
+    """Send the stored broadcast message to every chat concurrently.
+
+    With the MTProto transport, chats the client can't resolve or reach are
+    retried through the Bot API, other errors are counted as failures.
+    Returns a dict mapping each chat id to the exception it failed with, or
+    None, and the BroadcastStats of the run.
+    """
+    msg: Message = context.user_data["the_message"]
+    media_type, media = _get_media(msg)
+
+    async def send_bot_api(chat_id: int):
+        if media:
+            send_func = getattr(context.bot, f"send_{media_type}")
+            await send_func(
+                chat_id=chat_id,
+                caption=msg.caption,
+                **{media_type: media},
+            )
+        else:
+            await context.bot.send_message(chat_id=chat_id, text=msg.text)
+
+    client = None
+    if transport == BroadcastTransport.MTPROTO:
+        client = await get_pyro_client()
+        if not client:
+            transport = BroadcastTransport.BOT_API
+
+    stats = BroadcastStats(transport=transport, total=len(users))
+
+    async def send_mtproto(chat_id: int):
         try:
             if media:
-                send_func = getattr(context.bot, f"send_{media_type}")
+                send_func = getattr(client, f"send_{media_type}")
                 await send_func(
-                    chat_id=user,
+                    chat_id,
+                    media.file_id,
                     caption=msg.caption,
-                    **{media_type: media},
+                    parse_mode=enums.ParseMode.HTML,
                 )
             else:
-                await context.bot.send_message(chat_id=user, text=msg.text)
-        except:
-            continue
+                await client.send_message(
+                    chat_id, msg.text, parse_mode=enums.ParseMode.HTML
+                )
+        except FloodWait as e:
+            raise RetryAfter(e.value)
+        except _FALLBACK_ERRORS as e:
+            raise _MTProtoUnavailable(e) from e
+
+    start = time.monotonic()
+    if transport == BroadcastTransport.MTPROTO:
+        # both transports send as the same bot, so they share its flood budget
+        results = await gather_rate_limited(items=users, func=send_mtproto)
+        fallback_ids = [
+            chat_id
+            for chat_id, result in results.items()
+            if isinstance(result, _MTProtoUnavailable)
+        ]
+        if fallback_ids:
+            stats.fallbacks = len(fallback_ids)
+            results.update(
+                await gather_rate_limited(items=fallback_ids, func=send_bot_api)
+            )
+    else:
+        results = await gather_rate_limited(items=users, func=send_bot_api)
+    stats.elapsed = time.monotonic() - start
+
+    errors = {
+        chat_id: (result if isinstance(result, Exception) else None)
+        for chat_id, result in results.items()
+    }
+    stats.total = len(errors)
+    stats.failed = sum(1 for e in errors.values() if e is not None)
+    stats.sent = stats.total - stats.failed
+    logger.info("Broadcast finished: %r", stats)
+    return errors, stats
+
+
+def build_targets_report(
+    targets: list, results: dict, success_line: str, fail_line: str
+):
+    lines = []
+    for target in targets:
+        error = results.get(target.chat_id)
+        title = html.escape(str(target.chat_title or target.chat_id))
+        if error is None:
+            lines.append(success_line.format(chat_title=title))
+        else:
+            lines.append(
+                fail_line.format(chat_title=title, error=html.escape(str(error)))
+            )
+    return "\n".join(lines)
+
+
+def build_stats_report(stats: BroadcastStats, template: str, transport_names: dict):
+    return template.format(
+        transport=transport_names[stats.transport],
+        total=stats.total,
+        sent=stats.sent,
+        failed=stats.failed,
+        fallbacks=stats.fallbacks,
+        elapsed=f"{stats.elapsed:.2f}",
+        rate=f"{stats.rate:.2f}",
+    )
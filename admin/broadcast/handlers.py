@@ -12,8 +12,16 @@ from common.keyboards import (
     build_back_button,
 )
 from custom_filters import PrivateChatAndAdmin, PermissionFilter
-from admin.broadcast.keyboards import build_broadcast_keyboard
-from admin.broadcast.functions import send_to
+from admin.broadcast.keyboards import (
+    build_broadcast_keyboard,
+    build_broadcast_targets_keyboard,
+)
+from admin.broadcast.functions import (
+    BroadcastTransport,
+    send_to,
+    build_targets_report,
+    build_stats_report,
+)
 from common.back_to_home_page import back_to_admin_home_page_handler
 from common.lang_dicts import TEXTS, get_lang
 from start import start_command, admin_command
@@ -25,7 +33,8 @@ import asyncio
     SEND_TO,
     USERS,
     CHAT_ID,
-) = range(4)
+    TARGETS,
+) = range(5)
 
 
 async def broadcast_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -51,12 +60,12 @@ async def get_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
             context.user_data["the_message"] = update.message
             await update.message.reply_text(
                 text=TEXTS[lang]["send_message_to"],
-                reply_markup=build_broadcast_keyboard(lang),
+                reply_markup=build_broadcast_keyboard(lang, _get_transport(context)),
             )
         else:
             await update.callback_query.edit_message_text(
                 text=TEXTS[lang]["send_message_to"],
-                reply_markup=build_broadcast_keyboard(lang),
+                reply_markup=build_broadcast_keyboard(lang, _get_transport(context)),
             )
         return SEND_TO
 
@@ -64,6 +73,59 @@ async def get_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
 back_to_the_message = broadcast_message
 
 
+def _get_transport(context: ContextTypes.DEFAULT_TYPE):
+    return BroadcastTransport(
+        context.user_data.get("broadcast_transport", BroadcastTransport.BOT_API.value)
+    )
+
+
+async def toggle_broadcast_transport(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+):
+    if PrivateChatAndAdmin().filter(update) and PermissionFilter(
+        models.Permission.BROADCAST
+    ).filter(update):
+        lang = get_lang(update.effective_user.id)
+        transport = (
+            BroadcastTransport.MTPROTO
+            if _get_transport(context) == BroadcastTransport.BOT_API
+            else BroadcastTransport.BOT_API
+        )
+        context.user_data["broadcast_transport"] = transport.value
+        await update.callback_query.edit_message_reply_markup(
+            reply_markup=build_broadcast_keyboard(lang, transport)
+        )
+        return SEND_TO
+
+
+async def _send_and_report(
+    users: list[int],
+    context: ContextTypes.DEFAULT_TYPE,
+    admin_id: int,
+    lang: models.Language,
+    transport: BroadcastTransport,
+    targets: list = None,
+):
+    results, stats = await send_to(users=users, context=context, transport=transport)
+    text = build_stats_report(
+        stats=stats,
+        template=TEXTS[lang]["broadcast_stats"],
+        transport_names={
+            BroadcastTransport.BOT_API: TEXTS[lang]["transport_bot_api"],
+            BroadcastTransport.MTPROTO: TEXTS[lang]["transport_mtproto"],
+        },
+    )
+    if targets:
+        report = build_targets_report(
+            targets=targets,
+            results=results,
+            success_line=TEXTS[lang]["message_published_success"],
+            fail_line=TEXTS[lang]["message_published_fail"],
+        )
+        text = TEXTS[lang]["broadcast_targets_report"] + "\n\n" + report + "\n\n" + text
+    await context.bot.send_message(chat_id=admin_id, text=text)
+
+
 async def choose_users(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if PrivateChatAndAdmin().filter(update) and PermissionFilter(
         models.Permission.BROADCAST
@@ -80,42 +142,28 @@ async def choose_users(update: Update, context: ContextTypes.DEFAULT_TYPE):
             )
             return USERS
         elif update.callback_query.data == "channel_or_group":
-            await update.callback_query.edit_message_text(
-                text=TEXTS[lang]["send_chat_id"],
-                reply_markup=InlineKeyboardMarkup(back_buttons),
-            )
-            return CHAT_ID
+            return await show_broadcast_targets(update, context)
 
         with models.session_scope() as s:
+            query = s.query(models.User.user_id).filter(
+                models.User.is_banned == False
+            )
             if update.callback_query.data == "all_users":
-                users = (
-                    s.query(models.User)
-                    .filter(
-                        models.User.is_admin == False, models.User.is_banned == False
-                    )
-                    .all()
-                )
+                query = query.filter(models.User.is_admin == False)
             elif update.callback_query.data == "all_admins":
-                users = (
-                    s.query(models.User)
-                    .filter(
-                        models.User.is_admin == True, models.User.is_banned == False
-                    )
-                    .all()
-                )
-            elif update.callback_query.data == "everyone":
-                users = (
-                    s.query(models.User).filter(models.User.is_banned == False).all()
-                )
+                query = query.filter(models.User.is_admin == True)
 
-            users = [user.user_id for user in users]
+            users = [user_id for (user_id,) in query]
 
-            asyncio.create_task(
-                send_to(
-                    users=users,
-                    context=context,
-                )
+        asyncio.create_task(
+            _send_and_report(
+                users=users,
+                context=context,
+                admin_id=update.effective_user.id,
+                lang=lang,
+                transport=_get_transport(context),
             )
+        )
         await update.callback_query.edit_message_text(
             text=TEXTS[lang]["sending_messages"],
             reply_markup=build_admin_keyboard(lang, update.effective_user.id),
@@ -133,7 +181,15 @@ async def get_users(update: Update, context: ContextTypes.DEFAULT_TYPE):
     ).filter(update):
         lang = get_lang(update.effective_user.id)
         users = set(map(int, update.message.text.split("\n")))
-        asyncio.create_task(send_to(users=users, context=context))
+        asyncio.create_task(
+            _send_and_report(
+                users=list(users),
+                context=context,
+                admin_id=update.effective_user.id,
+                lang=lang,
+                transport=_get_transport(context),
+            )
+        )
         await update.message.reply_text(
             text=TEXTS[lang]["sending_messages"],
             reply_markup=build_admin_keyboard(lang, update.effective_user.id),
@@ -141,20 +197,200 @@ async def get_users(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return ConversationHandler.END
 
 
+def _get_broadcast_targets():
+    with models.session_scope() as s:
+        return s.query(models.BroadcastTarget).order_by(models.BroadcastTarget.id).all()
+
+
+async def show_broadcast_targets(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if PrivateChatAndAdmin().filter(update) and PermissionFilter(
+        models.Permission.BROADCAST
+    ).filter(update):
+        lang = get_lang(update.effective_user.id)
+        targets = _get_broadcast_targets()
+        selected_targets = context.user_data.get("selected_broadcast_targets", set())
+        text = (
+            TEXTS[lang]["choose_broadcast_targets"]
+            if targets
+            else TEXTS[lang]["no_broadcast_targets"]
+        )
+        reply_markup = build_broadcast_targets_keyboard(lang, targets, selected_targets)
+        if update.callback_query:
+            await update.callback_query.edit_message_text(
+                text=text,
+                reply_markup=reply_markup,
+            )
+        else:
+            await update.message.reply_text(
+                text=text,
+                reply_markup=reply_markup,
+            )
+        return TARGETS
+
+
+back_to_broadcast_targets = show_broadcast_targets
+
+
+async def toggle_broadcast_target(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if PrivateChatAndAdmin().filter(update) and PermissionFilter(
+        models.Permission.BROADCAST
+    ).filter(update):
+        lang = get_lang(update.effective_user.id)
+        targets = _get_broadcast_targets()
+        selected_targets = context.user_data.get("selected_broadcast_targets", set())
+
+        if update.callback_query.data == "select_all_broadcast_targets":
+            all_ids = {target.id for target in targets}
+            selected_targets = set() if selected_targets >= all_ids else all_ids
+        else:
+            target_id = int(update.callback_query.data.split("_")[-1])
+            if target_id in selected_targets:
+                selected_targets.remove(target_id)
+            else:
+                selected_targets.add(target_id)
+
+        context.user_data["selected_broadcast_targets"] = selected_targets
+        await update.callback_query.edit_message_reply_markup(
+            reply_markup=build_broadcast_targets_keyboard(
+                lang, targets, selected_targets
+            )
+        )
+        return TARGETS
+
+
+async def remove_broadcast_targets(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if PrivateChatAndAdmin().filter(update) and PermissionFilter(
+        models.Permission.BROADCAST
+    ).filter(update):
+        lang = get_lang(update.effective_user.id)
+        selected_targets = context.user_data.get("selected_broadcast_targets", set())
+        if not selected_targets:
+            await update.callback_query.answer(
+                text=TEXTS[lang]["no_broadcast_targets_selected"],
+                show_alert=True,
+            )
+            return TARGETS
+        with models.session_scope() as s:
+            s.query(models.BroadcastTarget).filter(
+                models.BroadcastTarget.id.in_(selected_targets)
+            ).delete(synchronize_session=False)
+        context.user_data["selected_broadcast_targets"] = set()
+        await update.callback_query.answer(
+            text=TEXTS[lang]["broadcast_targets_removed_success"],
+            show_alert=True,
+        )
+        return await show_broadcast_targets(update, context)
+
+
+async def add_broadcast_target(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if PrivateChatAndAdmin().filter(update) and PermissionFilter(
+        models.Permission.BROADCAST
+    ).filter(update):
+        lang = get_lang(update.effective_user.id)
+        back_buttons = [
+            build_back_button("back_to_broadcast_targets", lang=lang),
+            build_back_to_home_page_button(lang=lang, is_admin=True)[0],
+        ]
+        await update.callback_query.edit_message_text(
+            text=TEXTS[lang]["send_chat_id"],
+            reply_markup=InlineKeyboardMarkup(back_buttons),
+        )
+        return CHAT_ID
+
+
 async def get_chat_id(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if PrivateChatAndAdmin().filter(update) and PermissionFilter(
         models.Permission.BROADCAST
     ).filter(update):
         lang = get_lang(update.effective_user.id)
-        chat_id = int(update.message.text)
-        try:
-            chat = await context.bot.get_chat(chat_id=chat_id)
-        except:
-            await update.message.reply_text(text=TEXTS[lang]["bot_must_be_member"])
+        chat_ids = list(dict.fromkeys(map(int, update.message.text.split("\n"))))
+        chats = await asyncio.gather(
+            *(context.bot.get_chat(chat_id=chat_id) for chat_id in chat_ids),
+            return_exceptions=True,
+        )
+        not_found = [
+            str(chat_id)
+            for chat_id, chat in zip(chat_ids, chats)
+            if isinstance(chat, Exception)
+        ]
+        chats = [chat for chat in chats if not isinstance(chat, Exception)]
+
+        added_chat_ids, added_ids = set(), set()
+        with models.session_scope() as s:
+            for chat in chats:
+                target = (
+                    s.query(models.BroadcastTarget)
+                    .filter(models.BroadcastTarget.chat_id == chat.id)
+                    .first()
+                )
+                if target:
+                    target.chat_title = chat.title
+                    target.chat_type = chat.type
+                else:
+                    s.add(
+                        models.BroadcastTarget(
+                            chat_id=chat.id,
+                            chat_title=chat.title,
+                            chat_type=chat.type,
+                        )
+                    )
+                added_chat_ids.add(chat.id)
+            s.flush()
+            added_ids = {
+                target_id
+                for (target_id,) in s.query(models.BroadcastTarget.id).filter(
+                    models.BroadcastTarget.chat_id.in_(added_chat_ids)
+                )
+            }
+
+        if not_found:
+            await update.message.reply_text(
+                text=TEXTS[lang]["bot_must_be_member"]
+                + "\n\n"
+                + "\n".join(f"<code>{chat_id}</code>" for chat_id in not_found)
+            )
+        if not chats:
             return
-        await send_to(users=[chat_id], context=context)
-        await update.message.reply_text(
-            text=TEXTS[lang]["message_published_success"].format(chat_title=chat.title),
+
+        context.user_data["selected_broadcast_targets"] = (
+            context.user_data.get("selected_broadcast_targets", set()) | added_ids
+        )
+        return await show_broadcast_targets(update, context)
+
+
+async def publish_to_broadcast_targets(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+):
+    if PrivateChatAndAdmin().filter(update) and PermissionFilter(
+        models.Permission.BROADCAST
+    ).filter(update):
+        lang = get_lang(update.effective_user.id)
+        selected_targets = context.user_data.get("selected_broadcast_targets", set())
+        with models.session_scope() as s:
+            targets = (
+                s.query(models.BroadcastTarget)
+                .filter(models.BroadcastTarget.id.in_(selected_targets))
+                .all()
+            )
+        if not targets:
+            await update.callback_query.answer(
+                text=TEXTS[lang]["no_broadcast_targets_selected"],
+                show_alert=True,
+            )
+            return TARGETS
+
+        asyncio.create_task(
+            _send_and_report(
+                users=[target.chat_id for target in targets],
+                context=context,
+                admin_id=update.effective_user.id,
+                lang=lang,
+                transport=_get_transport(context),
+                targets=targets,
+            )
+        )
+        await update.callback_query.edit_message_text(
+            text=TEXTS[lang]["sending_messages"],
             reply_markup=build_admin_keyboard(lang, update.effective_user.id),
         )
         return ConversationHandler.END
@@ -183,7 +419,11 @@ broadcast_message_handler = ConversationHandler(
             CallbackQueryHandler(
                 callback=choose_users,
                 pattern=r"^((all)|(specific))_((users)|(admins))$|^everyone$|^channel_or_group$",
-            )
+            ),
+            CallbackQueryHandler(
+                callback=toggle_broadcast_transport,
+                pattern=r"^toggle_broadcast_transport$",
+            ),
         ],
         USERS: [
             MessageHandler(
@@ -197,6 +437,24 @@ broadcast_message_handler = ConversationHandler(
                 callback=get_chat_id,
             ),
         ],
+        TARGETS: [
+            CallbackQueryHandler(
+                callback=toggle_broadcast_target,
+                pattern=r"^toggle_broadcast_target_\d+$|^select_all_broadcast_targets$",
+            ),
+            CallbackQueryHandler(
+                callback=remove_broadcast_targets,
+                pattern=r"^remove_broadcast_targets$",
+            ),
+            CallbackQueryHandler(
+                callback=add_broadcast_target,
+                pattern=r"^add_broadcast_target$",
+            ),
+            CallbackQueryHandler(
+                callback=publish_to_broadcast_targets,
+                pattern=r"^publish_to_broadcast_targets$",
+            ),
+        ],
     },
     fallbacks=[
         back_to_admin_home_page_handler,
@@ -204,6 +462,9 @@ broadcast_message_handler = ConversationHandler(
         admin_command,
         CallbackQueryHandler(back_to_the_message, r"^back_to_the_message$"),
         CallbackQueryHandler(back_to_send_to, r"^back_to_send_to$"),
+        CallbackQueryHandler(
+            back_to_broadcast_targets, r"^back_to_broadcast_targets$"
+        ),
     ],
     name="broadcast_conversation",
     persistent=True,
@@ -1,10 +1,19 @@
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 from common.keyboards import build_back_button, build_back_to_home_page_button
 from common.lang_dicts import BUTTONS
+from admin.broadcast.functions import BroadcastTransport
 import models
 
 
-def build_broadcast_keyboard(lang: models.Language = models.Language.ARABIC):
+def build_broadcast_keyboard(
+    lang: models.Language = models.Language.ARABIC,
+    transport: BroadcastTransport = BroadcastTransport.BOT_API,
+):
+    transport_key = (
+        "transport_mtproto"
+        if transport == BroadcastTransport.MTPROTO
+        else "transport_bot_api"
+    )
     keyboard = [
         [
             InlineKeyboardButton(
@@ -32,9 +41,69 @@ def build_broadcast_keyboard(lang: models.Language = models.Language.ARABIC):
                 callback_data="channel_or_group",
             ),
         ],
+        [
+            InlineKeyboardButton(
+                text=BUTTONS[lang][transport_key],
+                callback_data="toggle_broadcast_transport",
+            ),
+        ],
         build_back_button("back_to_the_message", lang=lang),
         build_back_to_home_page_button(lang=lang, is_admin=True)[0],
     ]
     return InlineKeyboardMarkup(keyboard)
 
 
+
+
+def build_broadcast_targets_keyboard(
+    lang: models.Language,
+    targets: list,
+    selected_targets: set = None,
+):
+    if selected_targets is None:
+        selected_targets = set()
+
+    keyboard = []
+    for target in targets:
+        is_selected = target.id in selected_targets
+        keyboard.append(
+            [
+                InlineKeyboardButton(
+                    text=f"{'🟢' if is_selected else '🔴'} {target.chat_title or target.chat_id}",
+                    callback_data=f"toggle_broadcast_target_{target.id}",
+                )
+            ]
+        )
+    if targets:
+        keyboard.append(
+            [
+                InlineKeyboardButton(
+                    text=BUTTONS[lang]["select_all_broadcast_targets"],
+                    callback_data="select_all_broadcast_targets",
+                ),
+                InlineKeyboardButton(
+                    text=BUTTONS[lang]["remove_broadcast_targets"],
+                    callback_data="remove_broadcast_targets",
+                ),
+            ]
+        )
+    keyboard.append(
+        [
+            InlineKeyboardButton(
+                text=BUTTONS[lang]["add_broadcast_target"],
+                callback_data="add_broadcast_target",
+            ),
+        ]
+    )
+    if targets:
+        keyboard.append(
+            [
+                InlineKeyboardButton(
+                    text=BUTTONS[lang]["publish_to_broadcast_targets"],
+                    callback_data="publish_to_broadcast_targets",
+                ),
+            ]
+        )
+    keyboard.append(build_back_button("back_to_send_to", lang=lang))
+    keyboard.append(build_back_to_home_page_button(lang=lang, is_admin=True)[0])
+    return InlineKeyboardMarkup(keyboard)
@@ -1,5 +1,6 @@
 from admin.manage_users_settings.handlers import (
     manage_users_settings_handler,
-    export_users_handler,
+    choose_export_format_handler,
+    export_handler,
+    import_users_handler,
 )
-
@@ -0,0 +1,533 @@
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment
+from tempfile import SpooledTemporaryFile
+from datetime import datetime
+from enum import Enum
+from common.lang_dicts import TEXTS
+from common.common import format_datetime
+from Config import Config
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+import sqlalchemy as sa
+import models
+import csv
+import gzip
+import io
+import json
+
+
+class ExportDataset(Enum):
+    USERS = "users"
+    ACCESS_REQUESTS = "access_requests"
+
+
+class ExportFormat(Enum):
+    XLSX = "xlsx"
+    CSV = "csv"
+    CSV_GZ = "csv.gz"
+    JSONL = "jsonl"
+
+
+USERS_COLUMNS_WIDTHS = {
+    "A": 15,  # User ID
+    "B": 20,  # Username
+    "C": 25,  # Name
+    "D": 15,  # Language
+    "E": 12,  # Is Admin
+    "F": 12,  # Is Banned
+    "G": 20,  # Created At
+}
+
+
+def users_headers(lang: models.Language):
+    return [
+        TEXTS[lang]["excel_user_id"],
+        TEXTS[lang]["excel_username"],
+        TEXTS[lang]["excel_name"],
+        TEXTS[lang]["excel_language"],
+        TEXTS[lang]["excel_is_admin"],
+        TEXTS[lang]["excel_is_banned"],
+        TEXTS[lang]["excel_created_at"],
+    ]
+
+
+def filter_updated_between(query, column, since: datetime, until: datetime):
+    if since:
+        query = query.filter(column > since)
+    if until:
+        query = query.filter(column <= until)
+    return query
+
+
+def iter_users_rows(
+    lang: models.Language, since: datetime = None, until: datetime = None
+):
+    """Yield export rows one by one, fetching users from the DB in chunks.
+
+    since/until limit the export to users updated in (since, until].
+    """
+    texts = TEXTS[lang]
+    with models.session_scope() as s:
+        users = filter_updated_between(
+            s.query(
+                models.User.user_id,
+                models.User.username,
+                models.User.name,
+                models.User.lang,
+                models.User.is_admin,
+                models.User.is_banned,
+                models.User.created_at,
+            ),
+            models.User.updated_at,
+            since,
+            until,
+        )
+        users = users.order_by(models.User.user_id).yield_per(Config.EXPORT_CHUNK_SIZE)
+        for user in users:
+            yield [
+                user.user_id,
+                f"@{user.username}" if user.username else texts["excel_no_username"],
+                user.name,
+                (
+                    texts[f"lang_{user.lang.name.lower()}"]
+                    if user.lang
+                    else texts["excel_unknown"]
+                ),
+                texts["excel_yes"] if user.is_admin else texts["excel_no"],
+                texts["excel_yes"] if user.is_banned else texts["excel_no"],
+                (
+                    format_datetime(user.created_at)
+                    if user.created_at
+                    else texts["excel_unknown"]
+                ),
+            ]
+
+
+def write_xlsx(
+    headers: list, rows, file, title: str, columns_widths: dict = None
+):
+    """Stream rows into a write-only workbook, so memory doesn't grow with the row count."""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=title)
+
+    for column, width in (columns_widths or {}).items():
+        ws.column_dimensions[column].width = width
+
+    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    header_font = Font(bold=True, color="FFFFFF")
+    header_alignment = Alignment(horizontal="center", vertical="center")
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = header_alignment
+        header_cells.append(cell)
+    ws.append(header_cells)
+
+    for row in rows:
+        ws.append(row)
+
+    wb.save(file)
+
+
+def write_csv(headers: list, rows, file, compress: bool = False):
+    raw = gzip.GzipFile(fileobj=file, mode="wb") if compress else file
+    # utf-8-sig so that Excel opens Arabic text correctly
+    text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+    writer = csv.writer(text)
+    writer.writerow(headers)
+    writer.writerows(rows)
+    text.flush()
+    text.detach()
+    if compress:
+        raw.close()
+
+
+def write_jsonl(headers: list, rows, file):
+    text = io.TextIOWrapper(file, encoding="utf-8", newline="\n")
+    for row in rows:
+        text.write(json.dumps(dict(zip(headers, row)), ensure_ascii=False))
+        text.write("\n")
+    text.flush()
+    text.detach()
+
+
+def _get_dataset(dataset: ExportDataset):
+    """(headers, rows, sheet title, columns widths, model) of the dataset."""
+    # imported here since admin.access_requests imports this module
+    from admin.access_requests.functions import (
+        access_requests_headers,
+        iter_access_requests_rows,
+        ACCESS_REQUESTS_COLUMNS_WIDTHS,
+    )
+
+    return {
+        ExportDataset.USERS: (
+            users_headers,
+            iter_users_rows,
+            "Users",
+            USERS_COLUMNS_WIDTHS,
+            models.User,
+        ),
+        ExportDataset.ACCESS_REQUESTS: (
+            access_requests_headers,
+            iter_access_requests_rows,
+            "Access Requests",
+            ACCESS_REQUESTS_COLUMNS_WIDTHS,
+            models.AccessRequest,
+        ),
+    }[dataset]
+
+
+# tables exported along with the dataset model
+_DATASET_EXTRA_TABLES = {
+    ExportDataset.ACCESS_REQUESTS: (models.AccessRequestArchive,),
+}
+
+
+# tables whose columns are joined into the dataset rows, their changes only
+# change the version, the rows exported are bounded by the dataset tables
+_DATASET_JOINED_TABLES = {
+    ExportDataset.ACCESS_REQUESTS: (models.User,),
+}
+
+
+def _dataset_tables(dataset: ExportDataset):
+    return (*_DATASET_EXTRA_TABLES.get(dataset, ()), _get_dataset(dataset)[4])
+
+
+def get_export_upper_bound(dataset: ExportDataset):
+    """Latest updated_at of the dataset, read from the updated_at index."""
+    with models.session_scope() as s:
+        return max(
+            filter(
+                None,
+                (
+                    s.query(sa.func.max(model.updated_at)).scalar()
+                    for model in _dataset_tables(dataset)
+                ),
+            ),
+            default=None,
+        )
+
+
+def get_data_version(dataset: ExportDataset):
+    """Identify the dataset state by its latest updated_at and row count per table.
+
+    Returns the version string, the latest updated_at and the total row count.
+    """
+    until, counts = None, []
+    with models.session_scope() as s:
+        for model in _dataset_tables(dataset):
+            table_until, count = (
+                s.query(sa.func.max(model.updated_at), sa.func.count())
+                .select_from(model)
+                .one()
+            )
+            if table_until and (not until or table_until > until):
+                until = table_until
+            counts.append(count)
+        joined_until = [
+            s.query(sa.func.max(model.updated_at)).scalar()
+            for model in _DATASET_JOINED_TABLES.get(dataset, ())
+        ]
+    version = ":".join(
+        [
+            until.isoformat() if until else "",
+            *map(str, counts),
+            *(joined.isoformat() if joined else "" for joined in joined_until),
+        ]
+    )
+    return version, until, sum(counts)
+
+
+def get_cached_export(
+    dataset: ExportDataset,
+    export_format: ExportFormat,
+    lang: models.Language,
+    version: str,
+):
+    with models.session_scope() as s:
+        cached = (
+            s.query(models.ExportCache.file_id)
+            .filter(
+                models.ExportCache.dataset == dataset.value,
+                models.ExportCache.export_format == export_format.value,
+                models.ExportCache.lang == lang.name,
+                models.ExportCache.data_version == version,
+            )
+            .first()
+        )
+        return cached.file_id if cached else None
+
+
+def set_cached_export(
+    dataset: ExportDataset,
+    export_format: ExportFormat,
+    lang: models.Language,
+    version: str,
+    file_id: str,
+):
+    with models.session_scope() as s:
+        cached = (
+            s.query(models.ExportCache)
+            .filter(
+                models.ExportCache.dataset == dataset.value,
+                models.ExportCache.export_format == export_format.value,
+                models.ExportCache.lang == lang.name,
+            )
+            .first()
+        )
+        if cached:
+            cached.data_version = version
+            cached.file_id = file_id
+        else:
+            s.add(
+                models.ExportCache(
+                    dataset=dataset.value,
+                    export_format=export_format.value,
+                    lang=lang.name,
+                    data_version=version,
+                    file_id=file_id,
+                )
+            )
+
+
+class ExportJob:
+    """A running export. Admins asking for the same export while it runs join its recipients."""
+
+    def __init__(self, key: tuple, admin_id: int):
+        self.key = key
+        self.recipients = [admin_id]
+        self.progress = {"rows": 0}
+
+
+export_jobs: dict[tuple, ExportJob] = {}
+
+
+def _count_rows(rows, progress: dict):
+    for row in rows:
+        progress["rows"] += 1
+        yield row
+
+
+def get_export_watermark(admin_id: int, dataset: ExportDataset):
+    with models.session_scope() as s:
+        watermark = (
+            s.query(models.ExportWatermark)
+            .filter(
+                models.ExportWatermark.admin_id == admin_id,
+                models.ExportWatermark.dataset == dataset.value,
+            )
+            .first()
+        )
+        return watermark.exported_until if watermark else None
+
+
+def set_export_watermark(admin_id: int, dataset: ExportDataset, exported_until: datetime):
+    with models.session_scope() as s:
+        watermark = (
+            s.query(models.ExportWatermark)
+            .filter(
+                models.ExportWatermark.admin_id == admin_id,
+                models.ExportWatermark.dataset == dataset.value,
+            )
+            .first()
+        )
+        if watermark:
+            watermark.exported_until = exported_until
+        else:
+            s.add(
+                models.ExportWatermark(
+                    admin_id=admin_id,
+                    dataset=dataset.value,
+                    exported_until=exported_until,
+                )
+            )
+
+
+def build_export(
+    dataset: ExportDataset,
+    export_format: ExportFormat,
+    lang: models.Language,
+    since: datetime = None,
+    until: datetime = None,
+    progress: dict = None,
+):
+    """Write the dataset in a single streaming pass over the DB cursor into a spooled buffer.
+
+    Only rows updated in (since, until] are written when the bounds are given,
+    and progress["rows"] is kept up to date when progress is passed.
+    Meant to run in a worker thread. Returns the buffer, rewound, and the file name.
+    """
+    get_headers, iter_rows, title, columns_widths, _ = _get_dataset(dataset)
+    headers = get_headers(lang)
+    rows = iter_rows(lang, since=since, until=until)
+    if progress is not None:
+        rows = _count_rows(rows, progress)
+    file = SpooledTemporaryFile(max_size=Config.EXPORT_SPOOL_MAX_SIZE)
+    if export_format == ExportFormat.XLSX:
+        write_xlsx(
+            headers=headers,
+            rows=rows,
+            file=file,
+            title=title,
+            columns_widths=columns_widths,
+        )
+    elif export_format == ExportFormat.JSONL:
+        write_jsonl(headers=headers, rows=rows, file=file)
+    else:
+        write_csv(
+            headers=headers,
+            rows=rows,
+            file=file,
+            compress=export_format == ExportFormat.CSV_GZ,
+        )
+    file.seek(0)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    kind = "changes" if since else "export"
+    return file, f"{dataset.value}_{kind}_{timestamp}.{export_format.value}"
+
+
+class ImportFormat(Enum):
+    XLSX = "xlsx"
+    CSV = "csv"
+    CSV_GZ = "csv.gz"
+
+
+def get_import_format(filename: str):
+    filename = (filename or "").lower()
+    for import_format in sorted(ImportFormat, key=lambda f: -len(f.value)):
+        if filename.endswith(f".{import_format.value}"):
+            return import_format
+    return None
+
+
+def _localized_values(*keys):
+    values = {}
+    for lang_texts in TEXTS.values():
+        for key in keys:
+            values[lang_texts[key].strip().lower()] = key
+    return values
+
+
+_YES_NO_VALUES = _localized_values("excel_yes", "excel_no")
+_NO_USERNAME_VALUES = set(_localized_values("excel_no_username"))
+_LANGUAGES = {
+    value: models.Language[key.replace("lang_", "").upper()]
+    for value, key in _localized_values("lang_arabic", "lang_english").items()
+}
+_LANGUAGES.update({lang.name.lower(): lang for lang in models.Language})
+
+
+def _parse_bool(value):
+    value = str(value if value is not None else "").strip().lower()
+    return _YES_NO_VALUES.get(value) == "excel_yes" or value in ("1", "true")
+
+
+def _parse_datetime(value):
+    if isinstance(value, datetime):
+        return value
+    value = str(value or "").strip()
+    for fmt in ("%d %b %Y, %H:%M", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def _parse_user_row(row):
+    """Turn one export row (users_headers order) into users table values, or None."""
+    row = list(row) + [None] * (7 - len(row))
+    user_id, username, name, lang, _, is_banned, created_at = row[:7]
+    try:
+        user_id = int(str(user_id).strip())
+    except ValueError:
+        return None
+    username = str(username or "").strip()
+    if username.lower() in _NO_USERNAME_VALUES:
+        username = ""
+    now = datetime.now()
+    return {
+        "user_id": user_id,
+        "username": username.lstrip("@"),
+        "name": str(name or "").strip(),
+        "lang": _LANGUAGES.get(
+            str(lang or "").strip().lower(), models.Language.ARABIC
+        ),
+        "is_banned": _parse_bool(is_banned),
+        "is_admin": False,
+        "created_at": _parse_datetime(created_at) or now,
+        "updated_at": now,
+    }
+
+
+def iter_import_rows(file, import_format: ImportFormat):
+    if import_format == ImportFormat.XLSX:
+        wb = load_workbook(file, read_only=True, data_only=True)
+        try:
+            yield from wb.worksheets[0].iter_rows(values_only=True)
+        finally:
+            wb.close()
+        return
+    raw = gzip.GzipFile(fileobj=file, mode="rb") if import_format == ImportFormat.CSV_GZ else file
+    text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+    try:
+        yield from csv.reader(text)
+    finally:
+        text.detach()
+
+
+def _upsert_users(batch: list[dict]):
+    stmt = sqlite_insert(models.User)
+    # is_admin is never taken from the file, imported users can't become admins
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[models.User.user_id],
+        set_={
+            "username": stmt.excluded.username,
+            "name": stmt.excluded.name,
+            "lang": stmt.excluded.lang,
+            "is_banned": stmt.excluded.is_banned,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    done = False
+    with models.session_scope() as s:
+        s.execute(stmt, batch)
+        # committed here so a failed commit, swallowed by session_scope,
+        # leaves done False
+        s.commit()
+        done = True
+    return done
+
+
+def import_users(file, import_format: ImportFormat, progress: dict):
+    """Upsert users from an export-shaped file in batches, one transaction per batch.
+
+    The file is parsed as a stream. progress is updated in place with the
+    "imported", "failed" and "skipped" counters. Meant to run in a worker thread.
+    """
+    batch = {}
+
+    def flush():
+        if _upsert_users(list(batch.values())):
+            progress["imported"] += len(batch)
+        else:
+            progress["failed"] += len(batch)
+        batch.clear()
+
+    for i, row in enumerate(iter_import_rows(file, import_format)):
+        values = _parse_user_row(row)
+        if not values:
+            # the first row is the headers row in files produced by the export
+            if i:
+                progress["skipped"] += 1
+            continue
+        batch[values["user_id"]] = values
+        if len(batch) >= Config.IMPORT_BATCH_SIZE:
+            flush()
+    if batch:
+        flush()
+    return progress
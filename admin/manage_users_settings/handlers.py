@@ -1,15 +1,44 @@
 from telegram import Update, InlineKeyboardMarkup
-from telegram.ext import ContextTypes, CallbackQueryHandler, ConversationHandler
-from openpyxl.styles import Font, PatternFill, Alignment
-from openpyxl import Workbook
-from datetime import datetime
+from telegram.ext import (
+    ContextTypes,
+    CallbackQueryHandler,
+    ConversationHandler,
+    MessageHandler,
+    filters,
+)
 from custom_filters import PrivateChatAndAdmin, PermissionFilter
-from common.keyboards import build_back_to_home_page_button, build_back_button
+from common.keyboards import (
+    build_admin_keyboard,
+    build_back_to_home_page_button,
+    build_back_button,
+)
+from common.back_to_home_page import back_to_admin_home_page_handler
 from common.lang_dicts import TEXTS, get_lang
-from common.common import format_datetime
-from admin.manage_users_settings.keyboards import build_manage_users_settings_keyboard
-import tempfile
-import os
+from common.common import format_datetime, wait_with_progress
+from admin.manage_users_settings.keyboards import (
+    build_manage_users_settings_keyboard,
+    build_export_formats_keyboard,
+)
+from admin.manage_users_settings.functions import (
+    ExportDataset,
+    ExportFormat,
+    build_export,
+    get_export_upper_bound,
+    get_export_watermark,
+    set_export_watermark,
+    get_import_format,
+    import_users,
+    get_data_version,
+    get_cached_export,
+    set_cached_export,
+    ExportJob,
+    export_jobs,
+)
+from start import admin_command
+from tempfile import SpooledTemporaryFile
+from Config import Config
+import asyncio
+import re
 import models
 
 
@@ -34,132 +63,331 @@ manage_users_settings_handler = CallbackQueryHandler(
 )
 
 
-async def export_users_to_excel(update: Update, context: ContextTypes.DEFAULT_TYPE):
+_EXPORT_PERMISSIONS = {
+    ExportDataset.USERS: models.Permission.MANAGE_USERS,
+    ExportDataset.ACCESS_REQUESTS: models.Permission.MANAGE_ACCESS_REQUESTS,
+}
+
+_EXPORT_BACK_BUTTONS = {
+    ExportDataset.USERS: "back_to_manage_users_settings",
+    ExportDataset.ACCESS_REQUESTS: "access_requests_settings",
+}
+
+_EXPORT_TEXTS = {
+    ExportDataset.USERS: ("exporting_users", "users_exported_success"),
+    ExportDataset.ACCESS_REQUESTS: (
+        "exporting_access_requests",
+        "access_requests_exported_success",
+    ),
+}
+
+
+async def choose_export_format(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    data = update.callback_query.data
+    dataset = ExportDataset(
+        data.replace("toggle_export_mode_", "", 1).replace("export_", "", 1)
+    )
     if PrivateChatAndAdmin().filter(update) and PermissionFilter(
-        models.Permission.MANAGE_USERS
+        _EXPORT_PERMISSIONS[dataset]
     ).filter(update):
         lang = get_lang(update.effective_user.id)
+        changes_only = context.user_data.get("export_changes_only", False)
+        if data.startswith("toggle_export_mode_"):
+            changes_only = not changes_only
+            context.user_data["export_changes_only"] = changes_only
+
+        text = TEXTS[lang]["choose_export_format"]
+        watermark = get_export_watermark(update.effective_user.id, dataset)
+        if watermark:
+            text += "\n\n" + TEXTS[lang]["last_export_at"].format(
+                date=format_datetime(watermark)
+            )
+
+        keyboard = build_export_formats_keyboard(dataset, lang, changes_only)
+        keyboard.append(build_back_button(_EXPORT_BACK_BUTTONS[dataset], lang=lang))
+        keyboard.append(build_back_to_home_page_button(lang=lang, is_admin=True)[0])
+        await update.callback_query.edit_message_text(
+            text=text,
+            reply_markup=InlineKeyboardMarkup(keyboard),
+        )
+
+
+choose_export_format_handler = CallbackQueryHandler(
+    choose_export_format,
+    "^(toggle_export_mode_|export_)(users|access_requests)$",
+)
+
+
+_export_slots = asyncio.Semaphore(Config.MAX_CONCURRENT_EXPORTS)
+
+_EXPORT_PATTERN = (
+    r"^export_(users|access_requests)_(xlsx|csv|csv\.gz|jsonl)(_changes)?$"
+)
+
+
+async def export_data(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    match = re.match(_EXPORT_PATTERN, update.callback_query.data)
+    dataset = ExportDataset(match.group(1))
+    export_format = ExportFormat(match.group(2))
+    changes_only = bool(match.group(3))
+    if PrivateChatAndAdmin().filter(update) and PermissionFilter(
+        _EXPORT_PERMISSIONS[dataset]
+    ).filter(update):
+        lang = get_lang(update.effective_user.id)
+        admin_id = update.effective_user.id
+        exporting_text, success_text = _EXPORT_TEXTS[dataset]
+
+        since = get_export_watermark(admin_id, dataset) if changes_only else None
+        until = get_export_upper_bound(dataset)
+        if since and (not until or until <= since):
+            await update.callback_query.answer(
+                text=TEXTS[lang]["no_changes_since_last_export"],
+                show_alert=True,
+            )
+            return
 
         await update.callback_query.answer(
-            text=TEXTS[lang]["exporting_users"],
+            text=TEXTS[lang][exporting_text],
             show_alert=True,
         )
 
         await update.callback_query.delete_message()
 
-        # إنشاء ملف Excel مؤقت
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as tmp_file:
-            excel_path = tmp_file.name
-
-            # إنشاء workbook جديد
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Users"
-
-            # إضافة العناوين
-            headers = [
-                TEXTS[lang]["excel_user_id"],
-                TEXTS[lang]["excel_username"],
-                TEXTS[lang]["excel_name"],
-                TEXTS[lang]["excel_language"],
-                TEXTS[lang]["excel_is_admin"],
-                TEXTS[lang]["excel_is_banned"],
-                TEXTS[lang]["excel_created_at"],
-            ]
-            ws.append(headers)
-
-            header_fill = PatternFill(
-                start_color="366092", end_color="366092", fill_type="solid"
-            )
-            header_font = Font(bold=True, color="FFFFFF")
-
-            for cell in ws[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-
-            # جلب جميع المستخدمين من قاعدة البيانات
-            with models.session_scope() as s:
-                users = s.query(models.User).all()
-
-                for user in users:
-                    username = (
-                        f"@{user.username}"
-                        if user.username
-                        else TEXTS[lang]["excel_no_username"]
-                    )
-                    lang_text = (
-                        TEXTS[lang][f"lang_{user.lang.name.lower()}"]
-                        if user.lang
-                        else TEXTS[lang]["excel_unknown"]
-                    )
-                    is_admin = (
-                        TEXTS[lang]["excel_yes"]
-                        if user.is_admin
-                        else TEXTS[lang]["excel_no"]
+        version = total = None
+        if not changes_only:
+            version, until, total = get_data_version(dataset)
+            file_id = get_cached_export(dataset, export_format, lang, version)
+            if file_id:
+                # البيانات لم تتغير منذ آخر تصدير، إعادة إرسال نفس الملف دون بنائه أو رفعه
+                try:
+                    await context.bot.send_document(
+                        chat_id=admin_id,
+                        document=file_id,
                     )
-                    is_banned = (
-                        TEXTS[lang]["excel_yes"]
-                        if user.is_banned
-                        else TEXTS[lang]["excel_no"]
-                    )
-                    created_at = (
-                        format_datetime(user.created_at)
-                        if user.created_at
-                        else TEXTS[lang]["excel_unknown"]
+                    if until:
+                        set_export_watermark(admin_id, dataset, until)
+                    await context.bot.send_message(
+                        chat_id=admin_id,
+                        text=TEXTS[lang][success_text]
+                        + "\n\n"
+                        + TEXTS[lang]["continue_with_admin_command"],
                     )
+                    return
+                except Exception:
+                    pass
 
-                    ws.append(
-                        [
-                            user.user_id,
-                            username,
-                            user.name,
-                            lang_text,
-                            is_admin,
-                            is_banned,
-                            created_at,
-                        ]
-                    )
+        key = (dataset, export_format, lang, since, until)
+        job = export_jobs.get(key)
+        if job:
+            if admin_id not in job.recipients:
+                job.recipients.append(admin_id)
+            await context.bot.send_message(
+                chat_id=admin_id,
+                text=TEXTS[lang]["export_already_running"],
+            )
+            return
 
-            # ضبط عرض الأعمدة
-            ws.column_dimensions["A"].width = 15  # User ID
-            ws.column_dimensions["B"].width = 20  # Username
-            ws.column_dimensions["C"].width = 25  # Name
-            ws.column_dimensions["D"].width = 15  # Language
-            ws.column_dimensions["E"].width = 12  # Is Admin
-            ws.column_dimensions["F"].width = 12  # Is Banned
-            ws.column_dimensions["G"].width = 20  # Created At
+        job = ExportJob(key=key, admin_id=admin_id)
+        export_jobs[key] = job
+        context.application.create_task(
+            _run_export_job(
+                job=job,
+                context=context,
+                version=version,
+                total=total,
+            )
+        )
 
-            # حفظ الملف
-            wb.save(excel_path)
 
-        try:
-            # إرسال الملف
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"users_export_{timestamp}.xlsx"
+async def _run_export_job(
+    job: ExportJob,
+    context: ContextTypes.DEFAULT_TYPE,
+    version: str = None,
+    total: int = None,
+):
+    dataset, export_format, lang, since, until = job.key
+    _, success_text = _EXPORT_TEXTS[dataset]
 
-            with open(excel_path, "rb") as excel_file:
+    def progress_text():
+        if total is not None:
+            return TEXTS[lang]["export_progress_total"].format(
+                rows=job.progress["rows"], total=total
+            )
+        return TEXTS[lang]["export_progress"].format(rows=job.progress["rows"])
+
+    export_file = None
+    try:
+        progress_msg = await context.bot.send_message(
+            chat_id=job.recipients[0],
+            text=TEXTS[lang]["export_queued"],
+        )
+        async with _export_slots:
+            await progress_msg.edit_text(text=progress_text())
+            # بناء الملف في خيط منفصل حتى يبقى البوت مستجيباً أثناء التصدير
+            task = asyncio.create_task(
+                asyncio.to_thread(
+                    build_export,
+                    dataset,
+                    export_format,
+                    lang,
+                    since,
+                    until,
+                    job.progress,
+                )
+            )
+            export_file, filename = await wait_with_progress(
+                task, lambda: progress_msg.edit_text(text=progress_text())
+            )
+        await progress_msg.delete()
+
+        # رفع الملف مرة واحدة ثم إرساله لباقي الآدمنز عبر file_id
+        msg = await context.bot.send_document(
+            chat_id=job.recipients[0],
+            document=export_file,
+            filename=filename,
+        )
+        file_id = msg.document.file_id
+        if version:
+            set_cached_export(dataset, export_format, lang, version, file_id)
+        sent_to = [job.recipients[0]]
+        # الآدمنز الذين انضموا للمهمة أثناء الرفع يُضافون إلى القائمة في نفس الحلقة
+        i = 1
+        while i < len(job.recipients):
+            try:
                 await context.bot.send_document(
-                    chat_id=update.effective_user.id,
-                    document=excel_file,
-                    filename=filename,
+                    chat_id=job.recipients[i], document=file_id
+                )
+                sent_to.append(job.recipients[i])
+            except Exception:
+                pass
+            i += 1
+        del export_jobs[job.key]
+        for admin_id in sent_to:
+            if until:
+                set_export_watermark(admin_id, dataset, until)
+            await context.bot.send_message(
+                chat_id=admin_id,
+                text=TEXTS[lang][success_text]
+                + "\n\n"
+                + TEXTS[lang]["continue_with_admin_command"],
+            )
+    except Exception:
+        export_jobs.pop(job.key, None)
+        for admin_id in job.recipients:
+            try:
+                await context.bot.send_message(
+                    chat_id=admin_id,
+                    text=TEXTS[lang]["export_error"]
+                    + "\n\n"
+                    + TEXTS[lang]["continue_with_admin_command"],
                 )
+            except Exception:
+                pass
+        raise
+    finally:
+        if export_file:
+            export_file.close()
 
-            text = TEXTS[lang]["users_exported_success"]
-        except Exception as e:
-            text = TEXTS[lang]["export_error"]
 
-        # حذف الملف المؤقت
-        if os.path.exists(excel_path):
-            os.unlink(excel_path)
+export_handler = CallbackQueryHandler(
+    export_data,
+    _EXPORT_PATTERN,
+)
+
+
+IMPORT_FILE = 0
 
-        await context.bot.send_message(
-            chat_id=update.effective_chat.id,
-            text=text + "\n\n" + TEXTS[lang]["continue_with_admin_command"],
+
+async def import_users_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if PrivateChatAndAdmin().filter(update) and PermissionFilter(
+        models.Permission.MANAGE_USERS
+    ).filter(update):
+        lang = get_lang(update.effective_user.id)
+        keyboard = [
+            build_back_button("back_to_manage_users_settings", lang=lang),
+            build_back_to_home_page_button(lang=lang, is_admin=True)[0],
+        ]
+        await update.callback_query.edit_message_text(
+            text=TEXTS[lang]["import_users_instruction"],
+            reply_markup=InlineKeyboardMarkup(keyboard),
         )
+        return IMPORT_FILE
+
+
+def _import_progress_text(lang: models.Language, progress: dict, title_key: str):
+    return TEXTS[lang][title_key] + "\n\n" + TEXTS[lang]["import_progress"].format(
+        **progress
+    )
+
+
+async def get_import_file(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if PrivateChatAndAdmin().filter(update) and PermissionFilter(
+        models.Permission.MANAGE_USERS
+    ).filter(update):
+        lang = get_lang(update.effective_user.id)
+        document = update.message.document
+        import_format = get_import_format(document.file_name)
+        if not import_format:
+            await update.message.reply_text(text=TEXTS[lang]["import_invalid_file"])
+            return
+
+        progress = {"imported": 0, "failed": 0, "skipped": 0}
+        progress_msg = await update.message.reply_text(
+            text=_import_progress_text(lang, progress, "importing_users")
+        )
+
+        import_file = SpooledTemporaryFile(max_size=Config.EXPORT_SPOOL_MAX_SIZE)
+        try:
+            tg_file = await document.get_file()
+            await tg_file.download_to_memory(out=import_file)
+            import_file.seek(0)
+
+            # التحليل والإدخال في خيط منفصل مع تحديث رسالة التقدم دورياً
+            task = asyncio.create_task(
+                asyncio.to_thread(import_users, import_file, import_format, progress)
+            )
+            await wait_with_progress(
+                task,
+                lambda: progress_msg.edit_text(
+                    text=_import_progress_text(lang, progress, "importing_users")
+                ),
+            )
+            title_key = "users_imported_success"
+        except Exception:
+            title_key = "import_error"
+        finally:
+            import_file.close()
+
+        await progress_msg.edit_text(
+            text=_import_progress_text(lang, progress, title_key)
+        )
+        await update.message.reply_text(
+            text=TEXTS[lang]["home_page"],
+            reply_markup=build_admin_keyboard(lang, update.effective_user.id),
+        )
+        return ConversationHandler.END
 
 
-export_users_handler = CallbackQueryHandler(
-    export_users_to_excel,
-    "^export_users_to_excel$",
+import_users_handler = ConversationHandler(
+    entry_points=[
+        CallbackQueryHandler(
+            import_users_start,
+            "^import_users$",
+        ),
+    ],
+    states={
+        IMPORT_FILE: [
+            MessageHandler(
+                filters=filters.Document.ALL,
+                callback=get_import_file,
+            ),
+        ],
+    },
+    fallbacks=[
+        manage_users_settings_handler,
+        admin_command,
+        back_to_admin_home_page_handler,
+    ],
+    name="import_users_conversation",
+    persistent=True,
 )
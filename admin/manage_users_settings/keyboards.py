@@ -1,5 +1,7 @@
 from telegram import InlineKeyboardButton
 from common.lang_dicts import BUTTONS
+from common.keyboards import build_keyboard
+from admin.manage_users_settings.functions import ExportDataset, ExportFormat
 import models
 
 
@@ -7,10 +9,39 @@ def build_manage_users_settings_keyboard(lang: models.Language = models.Language
     keyboard = [
         [
             InlineKeyboardButton(
-                text=BUTTONS[lang]["export_users_to_excel"],
-                callback_data="export_users_to_excel",
+                text=BUTTONS[lang]["export_users"],
+                callback_data="export_users",
+            )
+        ],
+        [
+            InlineKeyboardButton(
+                text=BUTTONS[lang]["import_users"],
+                callback_data="import_users",
             )
         ],
     ]
     return keyboard
 
+
+def build_export_formats_keyboard(
+    dataset: ExportDataset,
+    lang: models.Language = models.Language.ARABIC,
+    changes_only: bool = False,
+):
+    suffix = "_changes" if changes_only else ""
+    keyboard = build_keyboard(
+        columns=2,
+        texts=[BUTTONS[lang][f"export_format_{f.name.lower()}"] for f in ExportFormat],
+        buttons_data=[f"export_{dataset.value}_{f.value}{suffix}" for f in ExportFormat],
+    )
+    keyboard.append(
+        [
+            InlineKeyboardButton(
+                text=BUTTONS[lang][
+                    "export_mode_changes" if changes_only else "export_mode_full"
+                ],
+                callback_data=f"toggle_export_mode_{dataset.value}",
+            )
+        ]
+    )
+    return keyboard
@@ -0,0 +1,6 @@
+from admin.protected_channels_settings.handlers import (
+    protected_channels_settings_handler,
+    add_protected_channel_handler,
+    remove_protected_channel_handler,
+    show_protected_channels_handler,
+)
@@ -0,0 +1,234 @@
+import html
+
+from telegram import (
+    Update,
+    KeyboardButton,
+    ReplyKeyboardMarkup,
+    KeyboardButtonRequestChat,
+    ReplyKeyboardRemove,
+    InlineKeyboardMarkup,
+)
+from telegram.constants import ChatMemberStatus
+from telegram.ext import (
+    ContextTypes,
+    ConversationHandler,
+    CallbackQueryHandler,
+    MessageHandler,
+    filters,
+)
+from admin.protected_channels_settings.keyboards import (
+    build_protected_channels_keyboard,
+    build_remove_protected_channel_keyboard,
+)
+from common.back_to_home_page import back_to_admin_home_page_handler
+from common.keyboards import (
+    build_admin_keyboard,
+    build_back_to_home_page_button,
+    build_back_button,
+)
+from common.lang_dicts import TEXTS, BUTTONS, get_lang
+from common.protected_channels import (
+    protected_channels,
+    add_protected_channel,
+    remove_protected_channel,
+)
+from admin.access_requests.functions import expire_channel_access_requests
+from custom_filters import PrivateChatAndAdmin, PermissionFilter
+from start import admin_command
+import models
+
+
+async def protected_channels_settings(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+):
+    if PrivateChatAndAdmin().filter(update) and PermissionFilter(
+        models.Permission.MANAGE_ACCESS_REQUESTS
+    ).filter(update):
+        lang = get_lang(update.effective_user.id)
+        keyboard = build_protected_channels_keyboard(lang)
+        keyboard.append(build_back_button("access_requests_settings", lang=lang))
+        keyboard.append(build_back_to_home_page_button(lang=lang, is_admin=True)[0])
+        await update.callback_query.edit_message_text(
+            text=TEXTS[lang]["protected_channels_title"],
+            reply_markup=InlineKeyboardMarkup(keyboard),
+        )
+        return ConversationHandler.END
+
+
+protected_channels_settings_handler = CallbackQueryHandler(
+    protected_channels_settings,
+    "^protected_channels_settings$|^back_to_protected_channels_settings$",
+)
+
+CHAT_ID = range(1)
+
+
+async def add_protected_channel_start(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+):
+    if PrivateChatAndAdmin().filter(update) and PermissionFilter(
+        models.Permission.MANAGE_ACCESS_REQUESTS
+    ).filter(update):
+        lang = get_lang(update.effective_user.id)
+        await update.callback_query.delete_message()
+        await context.bot.send_message(
+            chat_id=update.effective_user.id,
+            text=TEXTS[lang]["add_protected_channel_instruction"],
+            reply_markup=ReplyKeyboardMarkup(
+                keyboard=[
+                    [
+                        KeyboardButton(
+                            text=BUTTONS[lang]["channel"],
+                            request_chat=KeyboardButtonRequestChat(
+                                request_id=8,
+                                chat_is_channel=True,
+                                bot_is_member=True,
+                            ),
+                        ),
+                    ]
+                ],
+                resize_keyboard=True,
+            ),
+        )
+        return CHAT_ID
+
+
+async def get_protected_channel_id(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if PrivateChatAndAdmin().filter(update) and PermissionFilter(
+        models.Permission.MANAGE_ACCESS_REQUESTS
+    ).filter(update):
+        lang = get_lang(update.effective_user.id)
+
+        if update.effective_message.chat_shared:
+            chat_id = update.effective_message.chat_shared.chat_id
+        else:
+            chat_id = int(update.message.text)
+
+        try:
+            chat = await context.bot.get_chat(chat_id=chat_id)
+            bot_member = await context.bot.get_chat_member(
+                chat_id=chat_id, user_id=context.bot.id
+            )
+        except Exception:
+            text = TEXTS[lang]["chat_not_found"]
+        else:
+            # البوت ينشئ روابط الدعوة للطلبات المقبولة فيجب أن يكون مشرفاً بهذه الصلاحية
+            if (
+                bot_member.status != ChatMemberStatus.ADMINISTRATOR
+                or not bot_member.can_invite_users
+            ):
+                text = TEXTS[lang]["protected_channel_bot_not_admin"]
+            else:
+                add_protected_channel(chat_id, chat.title)
+                text = TEXTS[lang]["protected_channel_added_success"]
+
+        await update.message.reply_text(
+            text=text,
+            reply_markup=ReplyKeyboardRemove(),
+        )
+        await update.message.reply_text(
+            text=TEXTS[lang]["home_page"],
+            reply_markup=build_admin_keyboard(lang, update.effective_user.id),
+        )
+        return ConversationHandler.END
+
+
+add_protected_channel_handler = ConversationHandler(
+    entry_points=[
+        CallbackQueryHandler(
+            callback=add_protected_channel_start,
+            pattern="^add_protected_channel$",
+        ),
+    ],
+    states={
+        CHAT_ID: [
+            MessageHandler(
+                filters=filters.Regex(r"^-?\d+$"),
+                callback=get_protected_channel_id,
+            ),
+            MessageHandler(
+                filters=filters.StatusUpdate.CHAT_SHARED,
+                callback=get_protected_channel_id,
+            ),
+        ],
+    },
+    fallbacks=[
+        protected_channels_settings_handler,
+        admin_command,
+        back_to_admin_home_page_handler,
+    ],
+)
+
+
+async def remove_protected_channel_choose(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+):
+    if PrivateChatAndAdmin().filter(update) and PermissionFilter(
+        models.Permission.MANAGE_ACCESS_REQUESTS
+    ).filter(update):
+        lang = get_lang(update.effective_user.id)
+        removed = update.callback_query.data.startswith("remove_protected_channel_")
+        if removed:
+            chat_id = int(
+                update.callback_query.data.removeprefix("remove_protected_channel_")
+            )
+            remove_protected_channel(chat_id)
+            # الطلبات المعلقة لهذه القناة لا يمكن قبولها بعد الآن
+            context.application.create_task(
+                expire_channel_access_requests(context.bot, chat_id)
+            )
+            await update.callback_query.answer(
+                text=TEXTS[lang]["protected_channel_removed_success"],
+                show_alert=True,
+            )
+
+        keyboard = build_remove_protected_channel_keyboard()
+        if not keyboard:
+            if removed:
+                return await protected_channels_settings(update, context)
+            await update.callback_query.answer(
+                text=TEXTS[lang]["no_removable_protected_channels"],
+                show_alert=True,
+            )
+            return
+
+        keyboard.append(
+            build_back_button("back_to_protected_channels_settings", lang=lang)
+        )
+        keyboard.append(build_back_to_home_page_button(lang=lang, is_admin=True)[0])
+        await update.callback_query.edit_message_text(
+            text=TEXTS[lang]["remove_protected_channel_instruction"],
+            reply_markup=InlineKeyboardMarkup(keyboard),
+        )
+
+
+remove_protected_channel_handler = CallbackQueryHandler(
+    remove_protected_channel_choose,
+    r"^remove_protected_channel(_-?\d+)?$",
+)
+
+
+async def show_protected_channels(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if PrivateChatAndAdmin().filter(update) and PermissionFilter(
+        models.Permission.MANAGE_ACCESS_REQUESTS
+    ).filter(update):
+        lang = get_lang(update.effective_user.id)
+        text = TEXTS[lang]["protected_channels_list_title"] + "\n\n"
+        for chat_id, title in protected_channels.items():
+            text += f"{html.escape(title)}\n<code>{chat_id}</code>\n\n"
+        text += TEXTS[lang]["continue_with_admin_command"]
+
+        keyboard = [
+            build_back_button("back_to_protected_channels_settings", lang=lang),
+            build_back_to_home_page_button(lang=lang, is_admin=True)[0],
+        ]
+        await update.callback_query.edit_message_text(
+            text=text,
+            reply_markup=InlineKeyboardMarkup(keyboard),
+        )
+
+
+show_protected_channels_handler = CallbackQueryHandler(
+    callback=show_protected_channels,
+    pattern="^show_protected_channels$",
+)
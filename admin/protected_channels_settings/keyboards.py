@@ -0,0 +1,41 @@
+from telegram import InlineKeyboardButton
+from common.lang_dicts import BUTTONS
+from common.protected_channels import protected_channels
+from Config import Config
+import models
+
+
+def build_protected_channels_keyboard(lang: models.Language = models.Language.ARABIC):
+    keyboard = [
+        [
+            InlineKeyboardButton(
+                text=BUTTONS[lang]["add_protected_channel"],
+                callback_data="add_protected_channel",
+            ),
+            InlineKeyboardButton(
+                text=BUTTONS[lang]["remove_protected_channel"],
+                callback_data="remove_protected_channel",
+            ),
+        ],
+        [
+            InlineKeyboardButton(
+                text=BUTTONS[lang]["show_protected_channels"],
+                callback_data="show_protected_channels",
+            )
+        ],
+    ]
+    return keyboard
+
+
+def build_remove_protected_channel_keyboard():
+    """Every protected channel but Config.PRIVATE_CHANNEL_ID, which is registered again on startup."""
+    return [
+        [
+            InlineKeyboardButton(
+                text=title,
+                callback_data=f"remove_protected_channel_{chat_id}",
+            ),
+        ]
+        for chat_id, title in protected_channels.items()
+        if chat_id != Config.PRIVATE_CHANNEL_ID
+    ]
@@ -0,0 +1 @@
+from admin.search.handlers import admin_search_handler
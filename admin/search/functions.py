@@ -0,0 +1,96 @@
+import sqlalchemy as sa
+
+from Config import Config
+import models
+
+
+def _fts_query(query: str):
+    """Quote the admin's input as one FTS5 phrase so its punctuation isn't parsed as syntax."""
+    return '"' + query.replace('"', '""') + '"'
+
+
+def _search(
+    fts: str,
+    table: str,
+    rowid: str,
+    columns: tuple,
+    query: str,
+    limit: int = Config.SEARCH_RESULTS_LIMIT,
+):
+    """Ranked rowids of table rows matching query, best match first.
+
+    The trigram tokenizer can't match fewer than 3 characters, so shorter
+    queries fall back to a LIKE scan.
+    """
+    with models.session_scope() as s:
+        if len(query) >= 3:
+            return s.execute(
+                sa.text(
+                    f"SELECT rowid FROM {fts} WHERE {fts} MATCH :query "
+                    f"ORDER BY rank LIMIT :limit"
+                ),
+                {"query": _fts_query(query), "limit": limit},
+            ).scalars().all()
+        like = " OR ".join(f"{c} LIKE :query" for c in columns)
+        return s.execute(
+            sa.text(f"SELECT {rowid} FROM {table} WHERE {like} LIMIT :limit"),
+            {"query": f"%{query}%", "limit": limit},
+        ).scalars().all()
+
+
+def _in_rank_order(rows: list, ids: list, key: str):
+    by_id = {getattr(row, key): row for row in rows}
+    return [by_id[i] for i in ids if i in by_id]
+
+
+def search_users(query: str):
+    ids = _search("users_fts", "users", "user_id", ("username", "name"), query)
+    if not ids:
+        return []
+    with models.session_scope() as s:
+        rows = (
+            s.query(
+                models.User.user_id,
+                models.User.username,
+                models.User.name,
+                models.User.is_banned,
+            )
+            .filter(models.User.user_id.in_(ids))
+            .all()
+        )
+    return _in_rank_order(rows, ids, "user_id")
+
+
+def search_access_requests(query: str):
+    """Matching access requests, best match first, archived ones after the others."""
+    results = []
+    for table, fts in (
+        (models.AccessRequest, "access_requests_fts"),
+        (models.AccessRequestArchive, "access_requests_archive_fts"),
+    ):
+        ids = _search(
+            fts,
+            table.__tablename__,
+            "id",
+            ("order_id", "submitted_username"),
+            query,
+            limit=Config.SEARCH_RESULTS_LIMIT - len(results),
+        )
+        if ids:
+            with models.session_scope() as s:
+                rows = (
+                    s.query(
+                        table.id,
+                        table.user_id,
+                        table.order_id,
+                        table.submitted_username,
+                        table.status,
+                        table.created_at,
+                    )
+                    .filter(table.id.in_(ids))
+                    .all()
+                )
+            results.extend(_in_rank_order(rows, ids, "id"))
+        if len(results) >= Config.SEARCH_RESULTS_LIMIT:
+            break
+    return results
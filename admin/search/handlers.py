@@ -0,0 +1,131 @@
+# Admin: full-text search over users and access requests
+import html
+
+from telegram import Update, InlineKeyboardMarkup
+from telegram.ext import (
+    ContextTypes,
+    CallbackQueryHandler,
+    CommandHandler,
+    ConversationHandler,
+    MessageHandler,
+    filters,
+)
+
+from common.lang_dicts import TEXTS, ACCESS_REQUEST_STATUS_TEXT_KEYS, get_lang
+from common.common import format_datetime
+from common.keyboards import build_back_to_home_page_button
+from common.back_to_home_page import back_to_admin_home_page_handler
+from admin.search.functions import search_users, search_access_requests
+from custom_filters import PrivateChatAndAdmin, PermissionFilter
+from start import admin_command
+import models
+
+QUERY = 0
+
+def _search_permissions(update: Update):
+    """Which datasets the admin may search: (users, access requests)."""
+    return (
+        PermissionFilter(models.Permission.MANAGE_USERS).filter(update),
+        PermissionFilter(models.Permission.MANAGE_ACCESS_REQUESTS).filter(update),
+    )
+
+
+async def admin_search(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if PrivateChatAndAdmin().filter(update) and any(_search_permissions(update)):
+        lang = get_lang(update.effective_user.id)
+        keyboard = build_back_to_home_page_button(lang=lang, is_admin=True)
+        if update.callback_query:
+            await update.callback_query.edit_message_text(
+                text=TEXTS[lang]["search_instruction"],
+                reply_markup=InlineKeyboardMarkup(keyboard),
+            )
+        else:
+            await update.message.reply_text(
+                text=TEXTS[lang]["search_instruction"],
+                reply_markup=InlineKeyboardMarkup(keyboard),
+            )
+        return QUERY
+
+
+def _user_line(user):
+    username = f"@{html.escape(user.username)}" if user.username else "—"
+    banned = " 🚫" if user.is_banned else ""
+    return (
+        f"• <code>{user.user_id}</code> {username} — "
+        f"{html.escape(user.name or '—')}{banned}"
+    )
+
+
+def _access_request_line(req, lang: models.Language):
+    details = req.order_id or req.submitted_username or "—"
+    status = TEXTS[lang][ACCESS_REQUEST_STATUS_TEXT_KEYS[req.status]]
+    return (
+        f"• #{req.id} <code>{html.escape(details)}</code> — "
+        f"<code>{req.user_id}</code> — {status} — {format_datetime(req.created_at)}"
+    )
+
+
+async def get_search_query(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if PrivateChatAndAdmin().filter(update):
+        can_users, can_access_requests = _search_permissions(update)
+        if not (can_users or can_access_requests):
+            return ConversationHandler.END
+        lang = get_lang(update.effective_user.id)
+        query = update.message.text.strip().lstrip("@")
+
+        sections = []
+        if can_users:
+            users = search_users(query)
+            if users:
+                sections.append(
+                    TEXTS[lang]["search_results_users"]
+                    + "\n"
+                    + "\n".join(_user_line(u) for u in users)
+                )
+        if can_access_requests:
+            access_requests = search_access_requests(query)
+            if access_requests:
+                sections.append(
+                    TEXTS[lang]["search_results_access_requests"]
+                    + "\n"
+                    + "\n".join(_access_request_line(r, lang) for r in access_requests)
+                )
+
+        if sections:
+            text = (
+                TEXTS[lang]["search_results_title"].format(query=html.escape(query))
+                + "\n\n"
+                + "\n\n".join(sections)
+            )
+        else:
+            text = TEXTS[lang]["search_no_results"]
+
+        await update.message.reply_text(
+            text=text + "\n\n" + TEXTS[lang]["search_again"],
+            reply_markup=InlineKeyboardMarkup(
+                build_back_to_home_page_button(lang=lang, is_admin=True)
+            ),
+        )
+        return QUERY
+
+
+admin_search_handler = ConversationHandler(
+    entry_points=[
+        CallbackQueryHandler(admin_search, "^admin_search$"),
+        CommandHandler("search", admin_search),
+    ],
+    states={
+        QUERY: [
+            MessageHandler(
+                filters=filters.TEXT & ~filters.COMMAND,
+                callback=get_search_query,
+            ),
+        ],
+    },
+    fallbacks=[
+        admin_command,
+        back_to_admin_home_page_handler,
+    ],
+    name="admin_search_conversation",
+    persistent=True,
+)
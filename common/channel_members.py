@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from telegram import Bot
+from telegram.constants import ChatMemberStatus
+
+from common.protected_channels import protected_channels
+from common.rate_limiter import gather_rate_limited
+from Config import Config
+import models
+
+MEMBER_STATUSES = (
+    ChatMemberStatus.OWNER,
+    ChatMemberStatus.ADMINISTRATOR,
+    ChatMemberStatus.MEMBER,
+    ChatMemberStatus.RESTRICTED,
+)
+
+
+def is_member_status(status: str):
+    return status in MEMBER_STATUSES
+
+
+def record_channel_members(channel_id: int, members: dict[int, bool]):
+    """Upsert the membership of every user_id in members, in one statement."""
+    if not members:
+        return
+    stmt = sqlite_insert(models.ChannelMember)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[models.ChannelMember.channel_id, models.ChannelMember.user_id],
+        set_={"is_member": stmt.excluded.is_member, "updated_at": datetime.now()},
+    )
+    with models.session_scope() as s:
+        s.execute(
+            stmt,
+            [
+                {"channel_id": channel_id, "user_id": user_id, "is_member": is_member}
+                for user_id, is_member in members.items()
+            ],
+        )
+
+
+def get_channel_membership(channel_id: int, user_id: int):
+    """Mirrored membership of user_id in channel_id, None when it is unknown or older than CHANNEL_MEMBER_TTL."""
+    fresh_after = datetime.now() - timedelta(seconds=Config.CHANNEL_MEMBER_TTL)
+    with models.session_scope() as s:
+        return s.execute(
+            sa.select(models.ChannelMember.is_member).where(
+                models.ChannelMember.channel_id == channel_id,
+                models.ChannelMember.user_id == user_id,
+                models.ChannelMember.updated_at > fresh_after,
+            )
+        ).scalar()
+
+
+async def fetch_channel_membership(bot: Bot, channel_id: int, user_id: int):
+    """Ask the API whether user_id is in channel_id and mirror the answer."""
+    chat_member = await bot.get_chat_member(chat_id=channel_id, user_id=user_id)
+    is_member = is_member_status(chat_member.status)
+    record_channel_members(channel_id, {user_id: is_member})
+    return is_member
+
+
+async def reconcile_channel_members(bot: Bot):
+    """Check one batch of the oldest mirrored members with the API, returns how many were refreshed.
+
+    Members are refreshed once they are half way to CHANNEL_MEMBER_TTL, so
+    updates the bot missed while it was down don't outlive the TTL.
+    Non-members aren't checked, their rows are dropped once older than the
+    TTL since lookups treat them as unknown by then anyway.
+    """
+    now = datetime.now()
+    stale_before = now - timedelta(seconds=Config.CHANNEL_MEMBER_TTL / 2)
+    with models.session_scope() as s:
+        s.execute(
+            sa.delete(models.ChannelMember).where(
+                models.ChannelMember.is_member == False,  # noqa: E712
+                models.ChannelMember.updated_at
+                <= now - timedelta(seconds=Config.CHANNEL_MEMBER_TTL),
+            )
+        )
+        stale = s.execute(
+            sa.select(models.ChannelMember.channel_id, models.ChannelMember.user_id)
+            .where(
+                models.ChannelMember.is_member == True,  # noqa: E712
+                models.ChannelMember.updated_at <= stale_before,
+                models.ChannelMember.channel_id.in_(list(protected_channels)),
+            )
+            .order_by(models.ChannelMember.updated_at)
+            .limit(Config.CHANNEL_MEMBER_RECONCILE_BATCH_SIZE)
+        ).all()
+    if not stale:
+        return 0
+    results = await gather_rate_limited(
+        items=[tuple(row) for row in stale],
+        func=lambda item: bot.get_chat_member(chat_id=item[0], user_id=item[1]),
+    )
+    by_channel: dict[int, dict[int, bool]] = {}
+    for (channel_id, user_id), result in results.items():
+        if isinstance(result, Exception):
+            continue
+        by_channel.setdefault(channel_id, {})[user_id] = is_member_status(
+            result.status
+        )
+    for channel_id, members in by_channel.items():
+        record_channel_members(channel_id, members)
+    return sum(len(members) for members in by_channel.values())
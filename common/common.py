@@ -1,6 +1,8 @@
 from telegram import ReplyKeyboardMarkup, ReplyKeyboardRemove
 from telegram.ext import ContextTypes
 from common.keyboards import build_request_buttons
+from Config import Config
+import asyncio
 import os
 import models
 import uuid
@@ -47,3 +49,16 @@ def format_float(f: float):
         return ""
     s = f"{f:,.2f}".rstrip("0").rstrip(".")
     return s
+
+
+async def wait_with_progress(task: asyncio.Task, report_progress):
+    """Await task, calling report_progress every PROGRESS_UPDATE_INTERVAL seconds until it's done."""
+    while not task.done():
+        await asyncio.wait({task}, timeout=Config.PROGRESS_UPDATE_INTERVAL)
+        if task.done():
+            break
+        try:
+            await report_progress()
+        except Exception:
+            pass
+    return task.result()
@@ -7,6 +7,7 @@ from telegram import (
 )
 from custom_filters import HasPermission
 from common.lang_dicts import BUTTONS
+from common.protected_channels import protected_channels
 from Config import Config
 import models
 
@@ -78,6 +79,12 @@ def build_admin_keyboard(
                     callback_data="access_requests_settings",
                 )
             ],
+            [
+                InlineKeyboardButton(
+                    text=BUTTONS[lang]["admin_search"],
+                    callback_data="admin_search",
+                )
+            ],
         ]
 
     elif user_id:
@@ -141,6 +148,18 @@ def build_admin_keyboard(
                 ]
             )
 
+        if HasPermission.check(
+            user_id, models.Permission.MANAGE_USERS
+        ) or HasPermission.check(user_id, models.Permission.MANAGE_ACCESS_REQUESTS):
+            keyboard.append(
+                [
+                    InlineKeyboardButton(
+                        text=BUTTONS[lang]["admin_search"],
+                        callback_data="admin_search",
+                    )
+                ]
+            )
+
     return InlineKeyboardMarkup(keyboard)
 
 
@@ -218,3 +237,16 @@ def build_keyboard(columns: int, texts: list, buttons_data: list):
         if row:  # Only append non-empty rows
             keyboard.append(row)
     return keyboard
+
+
+def build_choose_channel_keyboard(callback_prefix: str):
+    """One button per protected channel, labelled with its title."""
+    return [
+        [
+            InlineKeyboardButton(
+                text=title,
+                callback_data=f"{callback_prefix}{chat_id}",
+            ),
+        ]
+        for chat_id, title in protected_channels.items()
+    ]
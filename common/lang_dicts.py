@@ -60,7 +60,7 @@ TEXTS = {
         "send_message": "أرسل الرسالة",
         "send_message_to": "هل تريد إرسال الرسالة إلى:",
         "send_user_ids": "قم بإرسال آيديات المستخدمين الذين تريد إرسال الرسالة لهم سطراً سطراً.",
-        "send_chat_id": "أرسل آيدي القناة/المجموعة",
+        "send_chat_id": "أرسل آيدي القناة/المجموعة، ويمكنك إرسال أكثر من آيدي سطراً سطراً",
         "sending_messages": "يقوم البوت بإرسال الرسائل الآن، يمكنك متابعة استخدامه بشكل طبيعي",
         "bot_must_be_member": "يجب أن يكون البوت مشتركاً في هذه القناة/المجموعة حتى يتمكن من النشر فيها",
         "message_published_success": "تم نشر الرسالة في {chat_title} بنجاح ✅",
@@ -113,7 +113,7 @@ TEXTS = {
         "you_dont_have_permission_to_manage_force_join": "لا يمكنك تعديل صلاحيات الآدمنز",
         "you_dont_have_permission_to_view_ids": "لا يمكنك تعديل صلاحيات الآدمنز",
         "manage_users_settings_title": "إدارة المستخدمين 👥",
-        "export_users_to_excel": "تصدير المستخدمين إلى Excel 📊",
+        "export_users": "تصدير المستخدمين 📊",
         "exporting_users": "جاري تصدير المستخدمين...",
         "users_exported_success": "تم تصدير المستخدمين بنجاح ✅",
         "export_error": "حدث خطأ أثناء التصدير ❌",
@@ -187,6 +187,107 @@ TEXTS = {
         "status_pending": "قيد المراجعة",
         "status_approved": "تمت الموافقة",
         "status_rejected": "تم الرفض",
+        "choose_broadcast_targets": "اختر القنوات/المجموعات التي تريد النشر فيها:",
+        "no_broadcast_targets": "لا توجد قنوات/مجموعات محفوظة حالياً، قم بإضافة واحدة أولاً ❗️",
+        "no_broadcast_targets_selected": "لم يتم اختيار أي قناة/مجموعة ❗️",
+        "broadcast_targets_removed_success": "تمت إزالة القنوات/المجموعات المحددة بنجاح ✅",
+        "message_published_fail": "فشل النشر في {chat_title} ❌\n<code>{error}</code>",
+        "broadcast_targets_report": "<b>نتيجة النشر في القنوات/المجموعات:</b>",
+        "transport_bot_api": "Bot API",
+        "transport_mtproto": "MTProto",
+        "broadcast_stats": (
+            "<b>انتهى الإرسال ✅</b>\n\n"
+            "طريقة الإرسال: <b>{transport}</b>\n"
+            "تم الإرسال: <b>{sent}</b> من <b>{total}</b>\n"
+            "فشل: <b>{failed}</b>\n"
+            "أعيد إرسالها عبر Bot API: <b>{fallbacks}</b>\n"
+            "المدة: <b>{elapsed}</b> ثانية\n"
+            "السرعة: <b>{rate}</b> رسالة/ثانية"
+        ),
+        "choose_export_format": "اختر صيغة ملف التصدير:",
+        "exporting_access_requests": "جاري تصدير طلبات الوصول...",
+        "access_requests_exported_success": "تم تصدير طلبات الوصول بنجاح ✅",
+        "excel_request_id": "رقم طلب الوصول",
+        "excel_submitted_username": "اسم المستخدم المرسل",
+        "excel_order_id": "رقم الطلب",
+        "excel_status": "الحالة",
+        "excel_updated_at": "تاريخ آخر تعديل",
+        "last_export_at": "آخر تصدير: <b>{date}</b>",
+        "no_changes_since_last_export": "لا توجد تغييرات منذ آخر تصدير ❗️",
+        "import_users_instruction": (
+            "أرسل ملف المستخدمين بصيغة xlsx أو csv أو csv.gz\n\n"
+            "يجب أن تكون الأعمدة بنفس ترتيب ملف التصدير، ولا يتجاوز حجم الملف 20 ميغابايت.\n\n"
+            "أو إلغاء العملية بالضغط على /admin."
+        ),
+        "import_invalid_file": "صيغة الملف غير مدعومة ❌\nالصيغ المدعومة: xlsx, csv, csv.gz",
+        "importing_users": "جاري استيراد المستخدمين... ⏳",
+        "users_imported_success": "تم استيراد المستخدمين بنجاح ✅",
+        "import_error": "حدث خطأ أثناء الاستيراد ❌",
+        "import_progress": (
+            "تم الاستيراد: <b>{imported}</b>\n"
+            "فشل: <b>{failed}</b>\n"
+            "صفوف غير صالحة: <b>{skipped}</b>"
+        ),
+        "export_already_running": "هذا التصدير قيد التنفيذ بالفعل، سيصلك الملف فور انتهائه ⏳",
+        "export_queued": "تمت إضافة التصدير إلى قائمة الانتظار ⏳",
+        "export_progress": "جاري التصدير... ⏳\nتم تجهيز {rows} صف",
+        "export_progress_total": "جاري التصدير... ⏳\nتم تجهيز {rows} من {total} صف",
+        "all_pending_access_requests_claimed": "جميع طلبات الوصول المعلقة قيد المراجعة من قبل آدمنز آخرين حالياً.",
+        "access_request_claimed_by_other": "طلب الوصول هذا قيد المراجعة من قبل آدمن آخر.",
+        "bulk_review_title": "المراجعة الجماعية لطلبات الوصول 📋\nعدد الطلبات المطابقة: {total}\nالمحدد: {selected}\n\nاختر الطلبات ثم وافق أو ارفض دفعة واحدة.",
+        "bulk_review_nothing_decided": "لم يتم البت في أي طلب، ربما تمت معالجتها أو أنها قيد المراجعة من قبل آدمن آخر.",
+        "bulk_review_started": "تم البت في {count} طلب، جاري إشعار المستخدمين ⏳",
+        "bulk_review_summary": "انتهت المراجعة الجماعية ✅\nالقرار: {decision}\nعدد الطلبات: {decided}\nتم إشعار: {notified}\nفشل الإشعار: {failed}",
+        "search_instruction": "أرسل جزءاً من اسم المستخدم أو الاسم أو رقم الطلب للبحث 🔍",
+        "search_results_title": "نتائج البحث عن <b>{query}</b>:",
+        "search_results_users": "👤 <b>المستخدمون:</b>",
+        "search_results_access_requests": "📝 <b>طلبات الوصول:</b>",
+        "search_no_results": "لا توجد نتائج مطابقة.",
+        "search_again": "أرسل نصاً آخر للبحث مجدداً.",
+        "upload_order_ledger_instruction": "أرسل ملف سجل الطلبات (CSV أو CSV.GZ أو XLSX) بحيث يحتوي العمود الأول على أرقام الطلبات 📄\n\nطلبات الوصول التي تحمل رقم طلب موجوداً في السجل وغير مستخدم تتم الموافقة عليها تلقائياً.\n\nعدد الطلبات غير المستخدمة حالياً: {unused}",
+        "importing_order_ledger": "جاري استيراد سجل الطلبات... ⏳",
+        "order_ledger_imported_success": "تم استيراد سجل الطلبات بنجاح ✅",
+        "order_ledger_progress": "تمت إضافة: {added}\nموجودة مسبقاً: {duplicates}\nصفوف متجاهلة: {skipped}\nالطلبات غير المستخدمة: {unused}",
+        "access_request_duplicate_order_id": "رقم الطلب هذا مستخدم في طلب آخر، تم إرسال طلبك للمراجعة وقد يتأخر الرد عليه.",
+        "access_request_duplicate_of": "\n\n⚠️ رقم طلب مكرر، الطلب الأصلي: #{req_id}",
+        "access_review_not_allowed": "ليس لديك صلاحية مراجعة طلبات الوصول ❗️",
+        "access_requests_digest": "<b>📥 {count} طلب وصول جديد</b>\n\n{lines}",
+        "access_requests_digest_line": "#{req_id} — <code>{user}</code> — <code>{details}</code>",
+        "access_requests_digest_more": "و{count} طلبات أخرى…",
+        "status_expired": "منتهي الصلاحية",
+        "access_expired_msg": "انتهت مدة طلب الوصول الخاص بك دون مراجعة. يمكنك تقديم طلب جديد.",
+        "access_requests_escalation": "<b>⏰ {count} طلب وصول بانتظار المراجعة منذ أكثر من {hours} ساعة</b>\n\n{lines}",
+        "access_request_channel": "\n\n📢 القناة: {channel}",
+        "access_choose_channel": "اختر القناة التي تريد طلب الانضمام إليها:",
+        "protected_channels_title": "إدارة القنوات المحمية 📢",
+        "add_protected_channel_instruction": (
+            "اختر القناة التي يطلب المستخدمون الانضمام إليها بالضغط على الزر أدناه\n\n"
+            "يمكنك إرسال الid برسالة أيضاً، ويجب أن يكون البوت مشرفاً في القناة\n\n"
+            "أو إلغاء العملية بالضغط على /admin."
+        ),
+        "protected_channel_added_success": "تمت إضافة القناة المحمية بنجاح ✅",
+        "protected_channel_removed_success": "تمت إزالة القناة المحمية بنجاح ✅",
+        "remove_protected_channel_instruction": "اختر من القائمة أدناه القناة التي تريد إزالتها.",
+        "no_removable_protected_channels": "لا توجد قنوات محمية يمكن إزالتها ❗️",
+        "protected_channels_list_title": "قائمة القنوات المحمية:",
+        "channel_access_reconcile_summary": (
+            "🔍 مطابقة أعضاء القناة: <b>{channel}</b>\n\n"
+            "👥 الأعضاء: {members}\n"
+            "❔ بدون طلب مقبول: {unapproved}\n{unapproved_ids}\n\n"
+            "⛔️ محظورون في البوت: {banned}\n{banned_ids}\n\n"
+            "🚪 تمت إزالتهم: {removed}"
+        ),
+        "order_ledger_choose_channel": "اختر القناة التي تعود لها أرقام الطلبات في السجل:",
+        "access_request_message_brief": (
+            "<b>{title}</b>\n\n"
+            "المستخدم: <code>{user}</code>\n\n"
+            "رقم طلب الوصول: <code>{req_id}</code>"
+        ),
+        "access_channel_removed_msg": "لم تعد القناة التي طلبت الانضمام إليها متاحة، لذا تم إغلاق طلبك.",
+        "access_request_sent_privately": "تم إرسال الطلب إليك في الخاص، وهو محجوز لك للمراجعة ✅",
+        "access_request_private_send_failed": "تعذر إرسال الطلب إليك، ابدأ محادثة خاصة مع البوت أولاً ❗️",
+        "channel_access_reconcile_partial": "\n\n⚠️ أمكن عرض {listed} فقط من أصل {total} عضو، لذا هذه الأرقام جزئية.",
+        "protected_channel_bot_not_admin": "لم تتم إضافة القناة ❌\nيجب أن يكون البوت مشرفاً في القناة مع صلاحية دعوة المستخدمين",
     },
     models.Language.ENGLISH: {
         "user_welcome_msg": "Welcome...",
@@ -247,7 +348,7 @@ TEXTS = {
         "send_message": "Send the message",
         "send_message_to": "Who do you want to send the message to:",
         "send_user_ids": "Send the user IDs you want to send the message to, one per line.",
-        "send_chat_id": "Send the channel/group ID",
+        "send_chat_id": "Send the channel/group ID, you can send more than one ID line by line",
         "sending_messages": "The bot is sending messages now, you can continue using it normally",
         "bot_must_be_member": "The bot must be a member of this channel/group to be able to post in it",
         "message_published_success": "Message published in {chat_title} successfully ✅",
@@ -300,7 +401,7 @@ TEXTS = {
         "you_dont_have_permission_to_manage_force_join": "You don't have permission to manage force join chats",
         "you_dont_have_permission_to_view_ids": "You don't have permission to view user/chat IDs",
         "manage_users_settings_title": "Manage Users 👥",
-        "export_users_to_excel": "Export Users to Excel 📊",
+        "export_users": "Export Users 📊",
         "exporting_users": "Exporting users...",
         "users_exported_success": "Users exported successfully ✅",
         "export_error": "An error occurred while exporting ❌",
@@ -374,6 +475,107 @@ TEXTS = {
         "status_pending": "Pending",
         "status_approved": "Approved",
         "status_rejected": "Rejected",
+        "choose_broadcast_targets": "Choose the channels/groups you want to publish in:",
+        "no_broadcast_targets": "There are no saved channels/groups yet, add one first ❗️",
+        "no_broadcast_targets_selected": "No channel/group was selected ❗️",
+        "broadcast_targets_removed_success": "Selected channels/groups removed successfully ✅",
+        "message_published_fail": "Failed to publish in {chat_title} ❌\n<code>{error}</code>",
+        "broadcast_targets_report": "<b>Channels/groups publishing result:</b>",
+        "transport_bot_api": "Bot API",
+        "transport_mtproto": "MTProto",
+        "broadcast_stats": (
+            "<b>Broadcast finished ✅</b>\n\n"
+            "Transport: <b>{transport}</b>\n"
+            "Sent: <b>{sent}</b> of <b>{total}</b>\n"
+            "Failed: <b>{failed}</b>\n"
+            "Retried through Bot API: <b>{fallbacks}</b>\n"
+            "Duration: <b>{elapsed}</b> seconds\n"
+            "Throughput: <b>{rate}</b> messages/second"
+        ),
+        "choose_export_format": "Choose the export file format:",
+        "exporting_access_requests": "Exporting access requests...",
+        "access_requests_exported_success": "Access requests exported successfully ✅",
+        "excel_request_id": "Access Request ID",
+        "excel_submitted_username": "Submitted Username",
+        "excel_order_id": "Order ID",
+        "excel_status": "Status",
+        "excel_updated_at": "Updated At",
+        "last_export_at": "Last export: <b>{date}</b>",
+        "no_changes_since_last_export": "There are no changes since the last export ❗️",
+        "import_users_instruction": (
+            "Send the users file as xlsx, csv or csv.gz\n\n"
+            "Columns must be in the same order as the export file, and the file must not exceed 20 MB.\n\n"
+            "Or cancel the operation by pressing /admin."
+        ),
+        "import_invalid_file": "Unsupported file format ❌\nSupported formats: xlsx, csv, csv.gz",
+        "importing_users": "Importing users... ⏳",
+        "users_imported_success": "Users imported successfully ✅",
+        "import_error": "An error occurred while importing ❌",
+        "import_progress": (
+            "Imported: <b>{imported}</b>\n"
+            "Failed: <b>{failed}</b>\n"
+            "Invalid rows: <b>{skipped}</b>"
+        ),
+        "export_already_running": "This export is already running, you'll receive the file once it's done ⏳",
+        "export_queued": "The export was added to the queue ⏳",
+        "export_progress": "Exporting... ⏳\n{rows} rows ready",
+        "export_progress_total": "Exporting... ⏳\n{rows} of {total} rows ready",
+        "all_pending_access_requests_claimed": "All pending access requests are currently being reviewed by other admins.",
+        "access_request_claimed_by_other": "This access request is being reviewed by another admin.",
+        "bulk_review_title": "Bulk review of access requests 📋\nMatching requests: {total}\nSelected: {selected}\n\nSelect requests, then approve or reject them at once.",
+        "bulk_review_nothing_decided": "No request was decided, they may have been processed already or be under review by another admin.",
+        "bulk_review_started": "{count} requests decided, notifying users ⏳",
+        "bulk_review_summary": "Bulk review finished ✅\nDecision: {decision}\nRequests: {decided}\nNotified: {notified}\nFailed to notify: {failed}",
+        "search_instruction": "Send part of a username, name or order id to search 🔍",
+        "search_results_title": "Search results for <b>{query}</b>:",
+        "search_results_users": "👤 <b>Users:</b>",
+        "search_results_access_requests": "📝 <b>Access requests:</b>",
+        "search_no_results": "No matching results.",
+        "search_again": "Send another text to search again.",
+        "upload_order_ledger_instruction": "Send the order ledger file (CSV, CSV.GZ or XLSX) with the order ids in the first column 📄\n\nAccess requests with an unused order id from the ledger are approved automatically.\n\nUnused orders currently: {unused}",
+        "importing_order_ledger": "Importing the order ledger... ⏳",
+        "order_ledger_imported_success": "Order ledger imported successfully ✅",
+        "order_ledger_progress": "Added: {added}\nAlready present: {duplicates}\nSkipped rows: {skipped}\nUnused orders: {unused}",
+        "access_request_duplicate_order_id": "This order id is already used by another request. Your request was queued for review and may take longer to be answered.",
+        "access_request_duplicate_of": "\n\n⚠️ Duplicate order id, original request: #{req_id}",
+        "access_review_not_allowed": "You don't have permission to review access requests ❗️",
+        "access_requests_digest": "<b>📥 {count} new access requests</b>\n\n{lines}",
+        "access_requests_digest_line": "#{req_id} — <code>{user}</code> — <code>{details}</code>",
+        "access_requests_digest_more": "and {count} more…",
+        "status_expired": "Expired",
+        "access_expired_msg": "Your access request expired without being reviewed. You can submit a new one.",
+        "access_requests_escalation": "<b>⏰ {count} access requests waiting for review for over {hours} hours</b>\n\n{lines}",
+        "access_request_channel": "\n\n📢 Channel: {channel}",
+        "access_choose_channel": "Choose the channel you want to request access to:",
+        "protected_channels_title": "Manage Protected Channels 📢",
+        "add_protected_channel_instruction": (
+            "Choose the channel users request access to by pressing the button below\n\n"
+            "You can also send its id, the bot must be an admin in the channel\n\n"
+            "Or cancel the operation by pressing /admin."
+        ),
+        "protected_channel_added_success": "Protected channel added successfully ✅",
+        "protected_channel_removed_success": "Protected channel removed successfully ✅",
+        "remove_protected_channel_instruction": "Choose from the list below the channel you want to remove.",
+        "no_removable_protected_channels": "No protected channels can be removed ❗️",
+        "protected_channels_list_title": "Protected Channels List:",
+        "channel_access_reconcile_summary": (
+            "🔍 Channel members reconciliation: <b>{channel}</b>\n\n"
+            "👥 Members: {members}\n"
+            "❔ Without an approved request: {unapproved}\n{unapproved_ids}\n\n"
+            "⛔️ Banned in the bot: {banned}\n{banned_ids}\n\n"
+            "🚪 Removed: {removed}"
+        ),
+        "order_ledger_choose_channel": "Choose the channel the order ids in the ledger pay for:",
+        "access_request_message_brief": (
+            "<b>{title}</b>\n\n"
+            "User: <code>{user}</code>\n\n"
+            "Access request ID: <code>{req_id}</code>"
+        ),
+        "access_channel_removed_msg": "The channel you requested access to is no longer available, so your request was closed.",
+        "access_request_sent_privately": "The request was sent to you privately and is reserved for your review ✅",
+        "access_request_private_send_failed": "Couldn't send you the request, start a private chat with the bot first ❗️",
+        "channel_access_reconcile_partial": "\n\n⚠️ Only {listed} of {total} members could be listed, so these numbers are partial.",
+        "protected_channel_bot_not_admin": "The channel wasn't added ❌\nThe bot must be an admin of the channel with the invite users permission",
     },
 }
 
@@ -424,7 +626,7 @@ BUTTONS = {
         "permission_manage_permissions": "إدارة الصلاحيات",
         "permission_manage_admins": "إدارة الآدمنز",
         "manage_users_settings": "إدارة المستخدمين 👥",
-        "export_users_to_excel": "تصدير المستخدمين إلى Excel 📊",
+        "export_users": "تصدير المستخدمين 📊",
         "submit_login_details": "إرسال بيانات الدخول 📝",
         "submit_username_password": "اسم مستخدم + كلمة مرور 👤🔑",
         "submit_order_id_only": "رقم الطلب فقط 📋",
@@ -435,6 +637,51 @@ BUTTONS = {
         "access_request_rejected": "❌ تم الرفض",
         "request_pending_access_request": "طلب قيد المراجعة 📥",
         "access_request_history": "سجل طلبات الوصول 📋",
+        "select_all_broadcast_targets": "تحديد الكل ☑️",
+        "remove_broadcast_targets": "حذف المحدد ✖️",
+        "add_broadcast_target": "إضافة قناة/مجموعة ➕",
+        "publish_to_broadcast_targets": "نشر في المحدد 📤",
+        "transport_bot_api": "طريقة الإرسال: Bot API 🌐",
+        "transport_mtproto": "طريقة الإرسال: MTProto ⚡️",
+        "export_format_xlsx": "Excel (xlsx) 📊",
+        "export_format_csv": "CSV 📄",
+        "export_format_csv_gz": "CSV مضغوط (gz) 🗜",
+        "export_format_jsonl": "JSON Lines 🧾",
+        "export_access_requests": "تصدير طلبات الوصول 📤",
+        "export_mode_full": "النوع: جميع البيانات 🗂",
+        "export_mode_changes": "النوع: التغييرات منذ آخر تصدير 🔄",
+        "import_users": "استيراد المستخدمين 📥",
+        "bulk_review_access_requests": "المراجعة الجماعية 📋",
+        "prev_page": "⬅️ السابق",
+        "next_page": "التالي ➡️",
+        "bulk_review_select_page": "تحديد/إلغاء تحديد الصفحة",
+        "bulk_review_filter_all": "الفلتر: كل الطلبات 🔄",
+        "bulk_review_filter_today": "الفلتر: طلبات اليوم 🔄",
+        "bulk_review_filter_order_id": "الفلتر: طلبات رقم الطلب 🔄",
+        "bulk_review_filter_order_id_today": "الفلتر: طلبات رقم الطلب لليوم 🔄",
+        "bulk_approve_selected": "موافقة على المحدد ({count}) ✅",
+        "bulk_reject_selected": "رفض المحدد ({count}) ❌",
+        "bulk_approve_all": "موافقة على الكل ({count}) ✅",
+        "bulk_reject_all": "رفض الكل ({count}) ❌",
+        "history_filter_all": "الكل",
+        "history_status_filter": "الحالة: {status} 🔄",
+        "history_date_filter_all": "التاريخ: الكل 🔄",
+        "history_date_filter_today": "التاريخ: اليوم 🔄",
+        "history_date_filter_week": "التاريخ: آخر 7 أيام 🔄",
+        "history_date_filter_month": "التاريخ: آخر 30 يوم 🔄",
+        "admin_search": "البحث 🔍",
+        "upload_order_ledger": "رفع سجل الطلبات 📄",
+        "request_pending_duplicate_access_request": "طلب مكرر قيد المراجعة 📥",
+        "bulk_review_filter_duplicates": "الفلتر: أرقام الطلب المكررة 🔄",
+        "access_digest_review_next": "مراجعة التالي 📥",
+        "access_request_expired": "⌛️ انتهت الصلاحية",
+        "protected_channels_settings": "القنوات المحمية 📢",
+        "add_protected_channel": "إضافة قناة ➕",
+        "remove_protected_channel": "حذف قناة ✖️",
+        "show_protected_channels": "عرض القنوات 👓",
+        "access_channel_filter": "📢 القناة: {channel}",
+        "access_channel_filter_all": "الكل",
+        "access_request_review_privately": "مراجعة في الخاص 🔒",
     },
     models.Language.ENGLISH: {
         "check_joined": "Verify ✅",
@@ -482,7 +729,7 @@ BUTTONS = {
         "permission_manage_permissions": "Manage Permissions",
         "permission_manage_admins": "Manage Admins",
         "manage_users_settings": "Manage Users 👥",
-        "export_users_to_excel": "Export Users to Excel 📊",
+        "export_users": "Export Users 📊",
         "submit_login_details": "Submit Login Details 📝",
         "submit_username_password": "Username + Password 👤🔑",
         "submit_order_id_only": "Order ID only 📋",
@@ -493,9 +740,62 @@ BUTTONS = {
         "access_request_rejected": "Rejected ❌",
         "request_pending_access_request": "Request Pending 📥",
         "access_request_history": "Access Request History 📋",
+        "select_all_broadcast_targets": "Select All ☑️",
+        "remove_broadcast_targets": "Remove Selected ✖️",
+        "add_broadcast_target": "Add Channel/Group ➕",
+        "publish_to_broadcast_targets": "Publish to Selected 📤",
+        "transport_bot_api": "Transport: Bot API 🌐",
+        "transport_mtproto": "Transport: MTProto ⚡️",
+        "export_format_xlsx": "Excel (xlsx) 📊",
+        "export_format_csv": "CSV 📄",
+        "export_format_csv_gz": "Compressed CSV (gz) 🗜",
+        "export_format_jsonl": "JSON Lines 🧾",
+        "export_access_requests": "Export Access Requests 📤",
+        "export_mode_full": "Mode: All Data 🗂",
+        "export_mode_changes": "Mode: Changes Since Last Export 🔄",
+        "import_users": "Import Users 📥",
+        "bulk_review_access_requests": "Bulk review 📋",
+        "prev_page": "⬅️ Previous",
+        "next_page": "Next ➡️",
+        "bulk_review_select_page": "Select/unselect page",
+        "bulk_review_filter_all": "Filter: all requests 🔄",
+        "bulk_review_filter_today": "Filter: today's requests 🔄",
+        "bulk_review_filter_order_id": "Filter: order id requests 🔄",
+        "bulk_review_filter_order_id_today": "Filter: today's order id requests 🔄",
+        "bulk_approve_selected": "Approve selected ({count}) ✅",
+        "bulk_reject_selected": "Reject selected ({count}) ❌",
+        "bulk_approve_all": "Approve all ({count}) ✅",
+        "bulk_reject_all": "Reject all ({count}) ❌",
+        "history_filter_all": "All",
+        "history_status_filter": "Status: {status} 🔄",
+        "history_date_filter_all": "Date: all 🔄",
+        "history_date_filter_today": "Date: today 🔄",
+        "history_date_filter_week": "Date: last 7 days 🔄",
+        "history_date_filter_month": "Date: last 30 days 🔄",
+        "admin_search": "Search 🔍",
+        "upload_order_ledger": "Upload order ledger 📄",
+        "request_pending_duplicate_access_request": "Request Pending Duplicate 📥",
+        "bulk_review_filter_duplicates": "Filter: duplicate order ids 🔄",
+        "access_digest_review_next": "Review next 📥",
+        "access_request_expired": "Expired ⌛️",
+        "protected_channels_settings": "Protected Channels 📢",
+        "add_protected_channel": "Add Channel ➕",
+        "remove_protected_channel": "Remove Channel ✖️",
+        "show_protected_channels": "Show Channels 👓",
+        "access_channel_filter": "📢 Channel: {channel}",
+        "access_channel_filter_all": "All",
+        "access_request_review_privately": "Review privately 🔒",
     },
 }
 
+# TEXTS keys of the access request statuses
+ACCESS_REQUEST_STATUS_TEXT_KEYS = {
+    models.AccessRequestStatus.PENDING: "status_pending",
+    models.AccessRequestStatus.APPROVED: "status_approved",
+    models.AccessRequestStatus.REJECTED: "status_rejected",
+    models.AccessRequestStatus.EXPIRED: "status_expired",
+}
+
 
 def get_lang(user_id: int):
     with models.session_scope() as s:
@@ -0,0 +1,93 @@
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+import models
+
+# unconsumed ledger order id -> channel id it pays for, so misses are answered
+# without touching the database
+unused_order_ids: dict[str, int] = {}
+
+
+def normalize_order_id(order_id: str):
+    return str(order_id if order_id is not None else "").strip()
+
+
+def load_order_ledger():
+    with models.session_scope() as s:
+        order_ids = (
+            s.query(models.OrderLedger.order_id, models.OrderLedger.channel_id)
+            .filter(models.OrderLedger.consumed_at.is_(None))
+            .all()
+        )
+    unused_order_ids.clear()
+    unused_order_ids.update(order_ids)
+    return len(unused_order_ids)
+
+
+def add_orders(order_ids: list[str], channel_id: int):
+    """Insert new order ids paying for channel_id, ignoring ones already in the ledger, returns how many were added."""
+    stmt = (
+        sqlite_insert(models.OrderLedger)
+        .on_conflict_do_nothing(index_elements=[models.OrderLedger.order_id])
+        .returning(models.OrderLedger.order_id)
+    )
+    now = datetime.now()
+    added = []
+    with models.session_scope() as s:
+        added = s.scalars(
+            stmt,
+            [
+                {"order_id": order_id, "channel_id": channel_id, "created_at": now}
+                for order_id in order_ids
+            ],
+        ).all()
+    unused_order_ids.update(dict.fromkeys(added, channel_id))
+    return len(added)
+
+
+def consume_order(order_id: str, user_id: int, channel_id: int):
+    """Mark an unused ledger order paying for channel_id as consumed by user_id, returns whether it was.
+
+    The conditional UPDATE makes sure only one request can consume an order.
+    """
+    order_id = normalize_order_id(order_id)
+    if unused_order_ids.get(order_id) != channel_id:
+        return False
+    stmt = (
+        sa.update(models.OrderLedger)
+        .where(
+            models.OrderLedger.order_id == order_id,
+            models.OrderLedger.channel_id == channel_id,
+            models.OrderLedger.consumed_at.is_(None),
+        )
+        .values(consumed_by=user_id, consumed_at=datetime.now())
+        .returning(models.OrderLedger.id)
+    )
+    consumed = committed = False
+    with models.session_scope() as s:
+        consumed = s.execute(stmt).scalar() is not None
+        # session_scope swallows a failed commit, so only count the result once done
+        s.commit()
+        committed = True
+    if not committed:
+        return False
+    # consumed now, or by another request before
+    unused_order_ids.pop(order_id, None)
+    return consumed
+
+
+def release_order(order_id: str):
+    """Make a consumed order usable again, when its auto-approval couldn't go through."""
+    order_id = normalize_order_id(order_id)
+    channel_id = None
+    with models.session_scope() as s:
+        channel_id = s.execute(
+            sa.update(models.OrderLedger)
+            .where(models.OrderLedger.order_id == order_id)
+            .values(consumed_by=None, consumed_at=None)
+            .returning(models.OrderLedger.channel_id)
+        ).scalar()
+    if channel_id:
+        unused_order_ids[order_id] = channel_id
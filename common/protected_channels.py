@@ -0,0 +1,78 @@
+import sqlalchemy as sa
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from Config import Config
+import models
+
+# chat_id -> title of every protected channel, so chat member updates are
+# routed without touching the database
+protected_channels: dict[int, str] = {}
+
+
+def load_protected_channels():
+    """Load the protected channels, registering Config.PRIVATE_CHANNEL_ID as the first one.
+
+    Rows from before channels were tracked are given Config.PRIVATE_CHANNEL_ID.
+    """
+    with models.session_scope() as s:
+        s.execute(
+            sqlite_insert(models.ProtectedChannel)
+            .values(chat_id=Config.PRIVATE_CHANNEL_ID)
+            .on_conflict_do_nothing(index_elements=[models.ProtectedChannel.chat_id])
+        )
+        for table in (
+            models.AccessRequest,
+            models.AccessRequestArchive,
+            models.InviteLink,
+            models.OrderLedger,
+        ):
+            s.execute(
+                sa.update(table)
+                .where(table.channel_id.is_(None))
+                .values(channel_id=Config.PRIVATE_CHANNEL_ID)
+            )
+        channels = s.query(
+            models.ProtectedChannel.chat_id, models.ProtectedChannel.chat_title
+        ).all()
+    protected_channels.clear()
+    protected_channels.update(
+        (chat_id, title or str(chat_id)) for chat_id, title in channels
+    )
+    return len(protected_channels)
+
+
+def add_protected_channel(chat_id: int, chat_title: str):
+    stmt = (
+        sqlite_insert(models.ProtectedChannel)
+        .values(chat_id=chat_id, chat_title=chat_title)
+        .on_conflict_do_update(
+            index_elements=[models.ProtectedChannel.chat_id],
+            set_={"chat_title": chat_title},
+        )
+    )
+    with models.session_scope() as s:
+        s.execute(stmt)
+    protected_channels[chat_id] = chat_title or str(chat_id)
+
+
+def remove_protected_channel(chat_id: int):
+    """Stop serving chat_id, its unused pooled invite links and mirrored members are dropped."""
+    with models.session_scope() as s:
+        s.execute(
+            sa.delete(models.ProtectedChannel).where(
+                models.ProtectedChannel.chat_id == chat_id
+            )
+        )
+        s.execute(
+            sa.delete(models.InviteLink).where(models.InviteLink.channel_id == chat_id)
+        )
+        s.execute(
+            sa.delete(models.ChannelMember).where(
+                models.ChannelMember.channel_id == chat_id
+            )
+        )
+    protected_channels.pop(chat_id, None)
+
+
+def channel_title(chat_id: int):
+    return protected_channels.get(chat_id) or str(chat_id)
@@ -0,0 +1,90 @@
+import asyncio
+import time
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Iterable
+
+from telegram.error import RetryAfter
+
+from Config import Config
+
+
+class RateLimiter:
+    """Token bucket shared by every bulk Bot API call of the bot.
+
+    Telegram applies flood limits per bot, so a RetryAfter received by one
+    sender pauses the whole bucket instead of only the failing call.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._resume_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._resume_at:
+                    await asyncio.sleep(self._resume_at - now)
+                    continue
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated_at) * self.rate
+                )
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+
+bot_api_limiter = RateLimiter(
+    rate=Config.BOT_API_RATE_LIMIT, burst=Config.BOT_API_RATE_LIMIT
+)
+
+
+def _retry_after_seconds(e: RetryAfter) -> float:
+    if isinstance(e.retry_after, timedelta):
+        return e.retry_after.total_seconds()
+    return float(e.retry_after)
+
+
+async def gather_rate_limited(
+    items: Iterable,
+    func: Callable[[Any], Awaitable[Any]],
+    limiter: RateLimiter = None,
+    concurrency: int = Config.BULK_SEND_CONCURRENCY,
+    max_retries: int = 3,
+):
+    """Await `func(item)` for every item with at most `concurrency` calls in flight.
+
+    Returns a dict mapping each item to its result, or to the exception it raised.
+    """
+    limiter = limiter or bot_api_limiter
+    results = {}
+    iterator = iter(items)
+
+    async def call(item):
+        error = None
+        for _ in range(max_retries + 1):
+            await limiter.acquire()
+            try:
+                return await func(item)
+            except RetryAfter as e:
+                limiter.pause(_retry_after_seconds(e))
+                error = e
+            except Exception as e:
+                return e
+        return error
+
+    async def worker():
+        for item in iterator:
+            results[item] = await call(item)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return results
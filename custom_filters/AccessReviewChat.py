@@ -0,0 +1,12 @@
+from telegram import Update
+from telegram.ext.filters import UpdateFilter
+from Config import Config
+
+
+class AccessReviewChat(UpdateFilter):
+    def filter(self, update: Update):
+        return bool(
+            Config.ACCESS_REVIEW_CHAT_ID
+            and update.effective_chat
+            and update.effective_chat.id == Config.ACCESS_REVIEW_CHAT_ID
+        )
@@ -19,9 +19,21 @@ from admin.ban import *
 from admin.force_join_chats_settings import *
 from admin.manage_users_settings import *
 from admin.access_requests import *
+from admin.protected_channels_settings import *
+from admin.search import *
 
 from models import init_db
 
+from jobs import (
+    refill_invite_link_pool_job,
+    sweep_invite_links_job,
+    flush_access_requests_digest_job,
+    access_request_sla_job,
+    archive_access_requests_job,
+    reconcile_channel_members_job,
+    reconcile_channel_access_job,
+)
+from Config import Config
 from MyApp import MyApp
 
 
@@ -43,7 +55,9 @@ def setup_and_run():
 
     # MANAGE USERS SETTINGS
     app.add_handler(manage_users_settings_handler)
-    app.add_handler(export_users_handler)
+    app.add_handler(choose_export_format_handler)
+    app.add_handler(export_handler)
+    app.add_handler(import_users_handler)
 
     # FORCE JOIN CHATS
     app.add_handler(add_force_join_chat_handler)
@@ -61,8 +75,20 @@ def setup_and_run():
     app.add_handler(request_pending_access_request_handler)
     app.add_handler(access_request_history_handler)
     app.add_handler(access_approve_reject_handler)
+    app.add_handler(access_review_privately_handler)
+    app.add_handler(bulk_review_access_requests_handler)
+    app.add_handler(bulk_review_decide_handler)
+    app.add_handler(upload_order_ledger_handler)
     app.add_handler(access_invite_link_join_revoke_handler)
 
+    # PROTECTED CHANNELS
+    app.add_handler(add_protected_channel_handler)
+    app.add_handler(remove_protected_channel_handler)
+    app.add_handler(show_protected_channels_handler)
+    app.add_handler(protected_channels_settings_handler)
+
+    app.add_handler(admin_search_handler)
+
     app.add_handler(access_request_handler)
 
     app.add_handler(admin_command)
@@ -74,4 +100,47 @@ def setup_and_run():
 
     app.add_error_handler(error_handler)
 
+    app.job_queue.run_repeating(
+        refill_invite_link_pool_job,
+        interval=Config.INVITE_LINK_POOL_REFILL_INTERVAL,
+        first=0,
+        job_kwargs={"id": "refill_invite_link_pool", "replace_existing": True},
+    )
+    app.job_queue.run_repeating(
+        sweep_invite_links_job,
+        interval=Config.INVITE_LINK_REVOKE_INTERVAL,
+        first=Config.INVITE_LINK_REVOKE_INTERVAL,
+        job_kwargs={"id": "sweep_invite_links", "replace_existing": True},
+    )
+    app.job_queue.run_repeating(
+        flush_access_requests_digest_job,
+        interval=Config.ACCESS_REQUEST_DIGEST_FLUSH_INTERVAL,
+        first=0,
+        job_kwargs={"id": "flush_access_requests_digest", "replace_existing": True},
+    )
+    app.job_queue.run_repeating(
+        access_request_sla_job,
+        interval=Config.ACCESS_REQUEST_SLA_INTERVAL,
+        first=Config.ACCESS_REQUEST_SLA_INTERVAL,
+        job_kwargs={"id": "access_request_sla", "replace_existing": True},
+    )
+    app.job_queue.run_repeating(
+        archive_access_requests_job,
+        interval=Config.ACCESS_REQUEST_ARCHIVE_INTERVAL,
+        first=Config.ACCESS_REQUEST_ARCHIVE_INTERVAL,
+        job_kwargs={"id": "archive_access_requests", "replace_existing": True},
+    )
+    app.job_queue.run_repeating(
+        reconcile_channel_members_job,
+        interval=Config.CHANNEL_MEMBER_RECONCILE_INTERVAL,
+        first=Config.CHANNEL_MEMBER_RECONCILE_INTERVAL,
+        job_kwargs={"id": "reconcile_channel_members", "replace_existing": True},
+    )
+    app.job_queue.run_repeating(
+        reconcile_channel_access_job,
+        interval=Config.CHANNEL_ACCESS_RECONCILE_INTERVAL,
+        first=Config.CHANNEL_ACCESS_RECONCILE_INTERVAL,
+        job_kwargs={"id": "reconcile_channel_access", "replace_existing": True},
+    )
+
     app.run_polling(allowed_updates=Update.ALL_TYPES)
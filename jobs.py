@@ -0,0 +1,57 @@
+import asyncio
+import logging
+
+from telegram.ext import ContextTypes
+
+from admin.access_requests.functions import (
+    archive_access_requests,
+    escalate_stale_access_requests,
+    expire_stale_access_requests,
+    flush_access_requests_digest,
+    reconcile_channel_access,
+    refill_invite_link_pool,
+    sweep_invite_links,
+)
+from common.channel_members import reconcile_channel_members
+
+logger = logging.getLogger(__name__)
+
+
+async def refill_invite_link_pool_job(context: ContextTypes.DEFAULT_TYPE):
+    await refill_invite_link_pool(context.bot)
+
+
+async def sweep_invite_links_job(context: ContextTypes.DEFAULT_TYPE):
+    await sweep_invite_links(context.bot)
+
+
+async def flush_access_requests_digest_job(context: ContextTypes.DEFAULT_TYPE):
+    await flush_access_requests_digest(context.bot)
+
+
+async def access_request_sla_job(context: ContextTypes.DEFAULT_TYPE):
+    # expired requests aren't escalated anymore
+    await expire_stale_access_requests(context.bot)
+    await escalate_stale_access_requests(context.bot)
+
+
+async def archive_access_requests_job(context: ContextTypes.DEFAULT_TYPE):
+    archived = await asyncio.to_thread(archive_access_requests)
+    if archived:
+        logger.info("Archived %s access requests", archived)
+
+
+async def reconcile_channel_members_job(context: ContextTypes.DEFAULT_TYPE):
+    await reconcile_channel_members(context.bot)
+
+
+async def reconcile_channel_access_job(context: ContextTypes.DEFAULT_TYPE):
+    report = await reconcile_channel_access(context.bot)
+    for channel_id, (unapproved, banned, removed) in report.items():
+        logger.info(
+            "Channel %s reconciled: %s without approved request, %s banned, %s removed",
+            channel_id,
+            len(unapproved),
+            len(banned),
+            len(removed),
+        )
@@ -9,6 +9,20 @@ class AccessRequestStatus(Enum):
     PENDING = "pending"
     APPROVED = "approved"
     REJECTED = "rejected"
+    EXPIRED = "expired"
+
+
+ACTIVE_ORDER_ID_INDEX = "uq_access_requests_active_order_id_v2"
+# earlier versions of ACTIVE_ORDER_ID_INDEX, dropped by init_db
+LEGACY_ACTIVE_ORDER_ID_INDEXES = ("uq_access_requests_active_order_id",)
+# literal so queries repeating it can be matched against the partial index,
+# which SQLite can't do with bound parameters
+ACTIVE_ORDER_ID_WHERE = (
+    "order_id IS NOT NULL AND status IN ('PENDING', 'APPROVED') "
+    "AND duplicate_of IS NULL"
+)
+
+DIGEST_HELD_WHERE = "digest_held_at IS NOT NULL"
 
 
 class AccessRequest(Base):
@@ -21,9 +35,18 @@ class AccessRequest(Base):
         nullable=False,
         index=True,
     )
+    # chat id of the ProtectedChannel the request is for
+    channel_id = sa.Column(sa.BigInteger, nullable=True)
     submitted_username = sa.Column(sa.String, nullable=True)
     submitted_password = sa.Column(sa.String, nullable=True)
     order_id = sa.Column(sa.String, nullable=True)
+    # set when order_id was already taken by another active request, see ACTIVE_ORDER_ID_INDEX
+    duplicate_of = sa.Column(
+        sa.Integer,
+        sa.ForeignKey("access_requests.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
     status = sa.Column(
         sa.Enum(AccessRequestStatus),
         nullable=False,
@@ -31,9 +54,56 @@ class AccessRequest(Base):
         index=True,
     )
     invite_link = sa.Column(sa.String, nullable=True)
+    invite_link_expires_at = sa.Column(sa.DateTime, nullable=True)
     is_revoked = sa.Column(sa.Boolean, default=False)
+    revoke_requested = sa.Column(sa.Boolean, nullable=True, default=False)
+    claimed_by = sa.Column(sa.BigInteger, nullable=True, index=True)
+    claimed_until = sa.Column(sa.DateTime, nullable=True, index=True)
+    # set once the request was escalated to every reviewer for waiting too long
+    escalated_at = sa.Column(sa.DateTime, nullable=True)
+    # set while the request is held back for the next digest of new requests
+    digest_held_at = sa.Column(sa.DateTime, nullable=True)
 
-    created_at = sa.Column(sa.DateTime, default=datetime.now)
-    updated_at = sa.Column(sa.DateTime, default=datetime.now, onupdate=datetime.now)
+    created_at = sa.Column(sa.DateTime, default=datetime.now, index=True)
+    updated_at = sa.Column(
+        sa.DateTime, default=datetime.now, onupdate=datetime.now, index=True
+    )
 
     user = relationship("User", back_populates="access_requests")
+
+    __table_args__ = (
+        # (created_at, id) keyset pagination, id being the rowid every index ends with
+        sa.Index("ix_access_requests_status_created_at", "status", "created_at"),
+        # per channel queues
+        sa.Index(
+            "ix_access_requests_channel_status_created_at",
+            "channel_id",
+            "status",
+            "created_at",
+        ),
+        # an order id can back a single pending or approved request, later ones are duplicates
+        sa.Index(
+            ACTIVE_ORDER_ID_INDEX,
+            "order_id",
+            unique=True,
+            sqlite_where=sa.text(ACTIVE_ORDER_ID_WHERE),
+        ),
+        # partial indexes over the links the revocation sweeper still has to handle
+        sa.Index(
+            "ix_access_requests_revoke_requested",
+            "revoke_requested",
+            sqlite_where=sa.text("revoke_requested = 1 AND is_revoked = 0"),
+        ),
+        sa.Index(
+            "ix_access_requests_invite_link_expires_at",
+            "invite_link_expires_at",
+            sqlite_where=sa.text("invite_link IS NOT NULL AND is_revoked = 0"),
+        ),
+        sa.Index(
+            "ix_access_requests_digest_held_at",
+            "digest_held_at",
+            sqlite_where=sa.text(DIGEST_HELD_WHERE),
+        ),
+        # ids of archived requests must never be handed out again, see init_db
+        {"sqlite_autoincrement": True},
+    )
@@ -0,0 +1,42 @@
+import sqlalchemy as sa
+from models.DB import Base
+from models.AccessRequest import AccessRequestStatus
+from datetime import datetime
+
+
+class AccessRequestArchive(Base):
+    """Decided access request moved out of access_requests once it's old enough, keeping its id."""
+
+    __tablename__ = "access_requests_archive"
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=False)
+    user_id = sa.Column(
+        sa.BigInteger,
+        sa.ForeignKey("users.user_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    channel_id = sa.Column(sa.BigInteger, nullable=True, index=True)
+    submitted_username = sa.Column(sa.String, nullable=True)
+    submitted_password = sa.Column(sa.String, nullable=True)
+    order_id = sa.Column(sa.String, nullable=True)
+    duplicate_of = sa.Column(sa.Integer, nullable=True)
+    status = sa.Column(sa.Enum(AccessRequestStatus), nullable=False)
+    invite_link = sa.Column(sa.String, nullable=True)
+    invite_link_expires_at = sa.Column(sa.DateTime, nullable=True)
+    is_revoked = sa.Column(sa.Boolean, default=False)
+
+    created_at = sa.Column(sa.DateTime, nullable=True)
+    # indexed for the export version and changes-only exports
+    updated_at = sa.Column(sa.DateTime, nullable=True, index=True)
+    archived_at = sa.Column(sa.DateTime, default=datetime.now)
+
+    __table_args__ = (
+        sa.Index(
+            "ix_access_requests_archive_status_created_at", "status", "created_at"
+        ),
+        sa.Index("ix_access_requests_archive_created_at", "created_at"),
+    )
+
+    def __repr__(self):
+        return f"AccessRequestArchive(id={self.id}, user_id={self.user_id}, status={self.status})"
@@ -0,0 +1,33 @@
+import sqlalchemy as sa
+from models.DB import Base
+from datetime import datetime
+
+
+class AccessRequestMessage(Base):
+    """A copy of an access request sent to a reviewer, edited once the request is decided."""
+
+    __tablename__ = "access_request_messages"
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+    access_request_id = sa.Column(
+        sa.Integer,
+        sa.ForeignKey("access_requests.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    chat_id = sa.Column(sa.BigInteger, nullable=False)
+    message_id = sa.Column(sa.Integer, nullable=False)
+
+    created_at = sa.Column(sa.DateTime, default=datetime.now)
+
+    __table_args__ = (
+        sa.UniqueConstraint(
+            "chat_id", "message_id", name="unique_access_request_message"
+        ),
+    )
+
+    def __repr__(self):
+        return (
+            f"AccessRequestMessage(access_request_id={self.access_request_id}, "
+            f"chat_id={self.chat_id}, message_id={self.message_id})"
+        )
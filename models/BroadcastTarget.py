@@ -0,0 +1,24 @@
+import sqlalchemy as sa
+from models.DB import Base
+from datetime import datetime
+
+
+class BroadcastTarget(Base):
+    __tablename__ = "broadcast_targets"
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+    chat_id = sa.Column(sa.BigInteger, unique=True, nullable=False)
+    chat_title = sa.Column(sa.String, nullable=True)
+    chat_type = sa.Column(sa.String, nullable=True)
+
+    created_at = sa.Column(sa.DateTime, default=datetime.now)
+    updated_at = sa.Column(sa.DateTime, default=datetime.now, onupdate=datetime.now)
+
+    def __str__(self):
+        return (
+            f"Chat ID: <code>{self.chat_id}</code>\n"
+            f"Chat Title: <b>{self.chat_title}</b>"
+        )
+
+    def __repr__(self):
+        return f"BroadcastTarget(id={self.id}, chat_id={self.chat_id}, chat_title={self.chat_title})"
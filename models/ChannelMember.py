@@ -0,0 +1,30 @@
+import sqlalchemy as sa
+from models.DB import Base
+from datetime import datetime
+
+
+class ChannelMember(Base):
+    """Last known membership of a user in a protected channel, kept from chat member updates."""
+
+    __tablename__ = "channel_members"
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+    # chat id of the ProtectedChannel
+    channel_id = sa.Column(sa.BigInteger, nullable=False)
+    # not a foreign key, channel members don't have to be bot users
+    user_id = sa.Column(sa.BigInteger, nullable=False)
+    is_member = sa.Column(sa.Boolean, nullable=False)
+
+    updated_at = sa.Column(sa.DateTime, default=datetime.now, onupdate=datetime.now)
+
+    __table_args__ = (
+        sa.UniqueConstraint("channel_id", "user_id", name="unique_channel_member"),
+        # the reconciliation walks members, and prunes non-members, oldest first
+        sa.Index("ix_channel_members_is_member_updated_at", "is_member", "updated_at"),
+    )
+
+    def __repr__(self):
+        return (
+            f"ChannelMember(channel_id={self.channel_id}, user_id={self.user_id}, "
+            f"is_member={self.is_member})"
+        )
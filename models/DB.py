@@ -1,6 +1,6 @@
 from models import *
 from Config import Config
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker, scoped_session
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.exc import OperationalError
@@ -21,6 +21,123 @@ engine = create_engine(
 )
 
 
+# FTS5 indexes over Base tables, kept in sync by triggers: (fts table, content table, rowid column, columns)
+FTS_TABLES = [
+    ("users_fts", "users", "user_id", ("username", "name")),
+    ("access_requests_fts", "access_requests", "id", ("order_id", "submitted_username")),
+    (
+        "access_requests_archive_fts",
+        "access_requests_archive",
+        "id",
+        ("order_id", "submitted_username"),
+    ),
+]
+
+
+def _create_fts_table(conn, fts: str, table: str, rowid: str, columns: tuple):
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    delete = (
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) "
+        f"VALUES ('delete', old.{rowid}, {old_values});"
+    )
+    insert = f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.{rowid}, {new_values});"
+    # trigram tokenizer so partial usernames and order ids match too
+    conn.execute(
+        text(
+            f"CREATE VIRTUAL TABLE {fts} USING fts5({cols}, content='{table}', "
+            f"content_rowid='{rowid}', tokenize='trigram')"
+        )
+    )
+    conn.execute(
+        text(f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN {insert} END")
+    )
+    conn.execute(
+        text(f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN {delete} END")
+    )
+    conn.execute(
+        text(
+            f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {cols} ON {table} "
+            f"BEGIN {delete} {insert} END"
+        )
+    )
+    conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+
+_MARK_DUPLICATE_ORDER_IDS_NORMALIZE = """
+UPDATE access_requests SET order_id = trim(order_id)
+WHERE order_id IS NOT NULL AND order_id != trim(order_id)
+"""
+_MARK_DUPLICATE_ORDER_IDS = """
+UPDATE access_requests SET duplicate_of = (
+    SELECT MIN(a.id) FROM access_requests a
+    WHERE a.order_id = access_requests.order_id AND a.status IN ('PENDING', 'APPROVED')
+)
+WHERE order_id IS NOT NULL AND status IN ('PENDING', 'APPROVED') AND duplicate_of IS NULL
+AND id != (
+    SELECT MIN(a.id) FROM access_requests a
+    WHERE a.order_id = access_requests.order_id AND a.status IN ('PENDING', 'APPROVED')
+)
+"""
+
+
+def _rebuild_access_requests_with_autoincrement():
+    """Recreate access_requests with AUTOINCREMENT if it was created without it.
+
+    Without it SQLite hands out the ids of archived requests again, which then
+    collide in access_requests_archive. The sequence starts past every id in
+    either table. Indexes and the FTS table are dropped with the old table and
+    recreated by init_db.
+    """
+    from sqlalchemy.schema import CreateTable
+
+    with engine.connect() as conn:
+        sql = conn.execute(
+            text(
+                "SELECT sql FROM sqlite_master "
+                "WHERE type = 'table' AND name = 'access_requests'"
+            )
+        ).scalar()
+    if sql is None or "AUTOINCREMENT" in sql.upper():
+        return
+
+    table = Base.metadata.tables["access_requests"]
+    create = str(CreateTable(table).compile(engine)).replace(
+        "CREATE TABLE access_requests ", "CREATE TABLE access_requests_rebuild ", 1
+    )
+    columns = ", ".join(c.name for c in table.columns)
+    script = f"""
+    PRAGMA foreign_keys=OFF;
+    BEGIN;
+    DROP TRIGGER IF EXISTS access_requests_fts_ai;
+    DROP TRIGGER IF EXISTS access_requests_fts_ad;
+    DROP TRIGGER IF EXISTS access_requests_fts_au;
+    DROP TABLE IF EXISTS access_requests_fts;
+    {create};
+    INSERT INTO access_requests_rebuild ({columns})
+        SELECT {columns} FROM access_requests;
+    DROP TABLE access_requests;
+    ALTER TABLE access_requests_rebuild RENAME TO access_requests;
+    DELETE FROM sqlite_sequence WHERE name = 'access_requests';
+    INSERT INTO sqlite_sequence (name, seq) SELECT 'access_requests', MAX(
+        COALESCE((SELECT MAX(id) FROM access_requests), 0),
+        COALESCE((SELECT MAX(id) FROM access_requests_archive), 0)
+    );
+    COMMIT;
+    """
+    # executescript, since the DDL has to run in one explicit transaction
+    # with foreign keys off, which the pysqlite driver doesn't do on its own
+    raw = engine.raw_connection()
+    try:
+        raw.driver_connection.executescript(script)
+    finally:
+        if raw.driver_connection.in_transaction:
+            raw.driver_connection.rollback()
+        raw.driver_connection.execute("PRAGMA foreign_keys=ON")
+        raw.close()
+
+
 def init_db():
     # Configure SQLite for better concurrency
     with engine.connect() as conn:
@@ -31,6 +148,50 @@ def init_db():
 
     Base.metadata.create_all(engine)
 
+    # create_all skips existing tables, so nullable columns added later are created here
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                conn.execute(
+                    text(
+                        f"ALTER TABLE {table.name} ADD COLUMN {column.name} "
+                        f"{column.type.compile(engine.dialect)}"
+                    )
+                )
+
+    # requests from before order ids were unique are normalized and marked as
+    # duplicates of the oldest one, or the unique index below can't be created
+    from models.AccessRequest import (
+        ACTIVE_ORDER_ID_INDEX,
+        LEGACY_ACTIVE_ORDER_ID_INDEXES,
+    )
+
+    if ACTIVE_ORDER_ID_INDEX not in {
+        index["name"] for index in inspector.get_indexes("access_requests")
+    }:
+        with engine.begin() as conn:
+            for legacy_index in LEGACY_ACTIVE_ORDER_ID_INDEXES:
+                conn.execute(text(f"DROP INDEX IF EXISTS {legacy_index}"))
+            conn.execute(text(_MARK_DUPLICATE_ORDER_IDS_NORMALIZE))
+            conn.execute(text(_MARK_DUPLICATE_ORDER_IDS))
+
+    _rebuild_access_requests_with_autoincrement()
+
+    # create_all skips existing tables, so indexes added later are created here
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for fts, table, rowid, columns in FTS_TABLES:
+            if not inspector.has_table(fts):
+                _create_fts_table(conn, fts, table, rowid, columns)
+
 
 Session = scoped_session(
     sessionmaker(bind=engine, autocommit=False, autoflush=False, expire_on_commit=False)
@@ -0,0 +1,26 @@
+import sqlalchemy as sa
+from models.DB import Base
+from datetime import datetime
+
+
+class ExportCache(Base):
+    __tablename__ = "export_cache"
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+    dataset = sa.Column(sa.String, nullable=False)
+    export_format = sa.Column(sa.String, nullable=False)
+    lang = sa.Column(sa.String, nullable=False)
+    data_version = sa.Column(sa.String, nullable=False)
+    file_id = sa.Column(sa.String, nullable=False)
+
+    created_at = sa.Column(sa.DateTime, default=datetime.now)
+    updated_at = sa.Column(sa.DateTime, default=datetime.now, onupdate=datetime.now)
+
+    __table_args__ = (
+        sa.UniqueConstraint(
+            "dataset", "export_format", "lang", name="unique_export_cache_key"
+        ),
+    )
+
+    def __repr__(self):
+        return f"ExportCache(dataset={self.dataset}, export_format={self.export_format}, lang={self.lang}, data_version={self.data_version})"
@@ -0,0 +1,26 @@
+import sqlalchemy as sa
+from models.DB import Base
+from datetime import datetime
+
+
+class ExportWatermark(Base):
+    __tablename__ = "export_watermarks"
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+    admin_id = sa.Column(
+        sa.BigInteger,
+        sa.ForeignKey("users.user_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    dataset = sa.Column(sa.String, nullable=False)
+    exported_until = sa.Column(sa.DateTime, nullable=True)
+
+    created_at = sa.Column(sa.DateTime, default=datetime.now)
+    updated_at = sa.Column(sa.DateTime, default=datetime.now, onupdate=datetime.now)
+
+    __table_args__ = (
+        sa.UniqueConstraint("admin_id", "dataset", name="unique_admin_dataset"),
+    )
+
+    def __repr__(self):
+        return f"ExportWatermark(admin_id={self.admin_id}, dataset={self.dataset}, exported_until={self.exported_until})"
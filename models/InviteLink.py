@@ -0,0 +1,20 @@
+import sqlalchemy as sa
+from models.DB import Base
+from datetime import datetime
+
+
+class InviteLink(Base):
+    """Unused single-use invite link to a protected channel, waiting to be handed to an approved user."""
+
+    __tablename__ = "invite_links"
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+    invite_link = sa.Column(sa.String, unique=True, nullable=False)
+    # chat id of the ProtectedChannel the link joins
+    channel_id = sa.Column(sa.BigInteger, nullable=True, index=True)
+    expires_at = sa.Column(sa.DateTime, nullable=True, index=True)
+
+    created_at = sa.Column(sa.DateTime, default=datetime.now)
+
+    def __repr__(self):
+        return f"InviteLink(id={self.id}, invite_link={self.invite_link})"
@@ -0,0 +1,25 @@
+import sqlalchemy as sa
+from models.DB import Base
+from datetime import datetime
+
+
+class OrderLedger(Base):
+    """Order ids imported from the shop, consumed by the first access request that presents them."""
+
+    __tablename__ = "order_ledger"
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+    order_id = sa.Column(sa.String, unique=True, nullable=False)
+    # chat id of the ProtectedChannel the order pays for
+    channel_id = sa.Column(sa.BigInteger, nullable=True)
+    consumed_by = sa.Column(
+        sa.BigInteger,
+        sa.ForeignKey("users.user_id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    consumed_at = sa.Column(sa.DateTime, nullable=True)
+
+    created_at = sa.Column(sa.DateTime, default=datetime.now)
+
+    def __repr__(self):
+        return f"OrderLedger(order_id={self.order_id}, consumed_by={self.consumed_by}, consumed_at={self.consumed_at})"
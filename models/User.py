@@ -22,7 +22,9 @@ class User(Base):
     is_admin = sa.Column(sa.Boolean, default=0)
 
     created_at = sa.Column(sa.DateTime, default=datetime.now)
-    updated_at = sa.Column(sa.DateTime, default=datetime.now, onupdate=datetime.now)
+    updated_at = sa.Column(
+        sa.DateTime, default=datetime.now, onupdate=datetime.now, index=True
+    )
 
     def __str__(self):
         return (
@@ -4,3 +4,12 @@ from models.Language import Language
 from models.ForceJoinChat import ForceJoinChat
 from models.AdminPermission import AdminPermission, Permission
 from models.AccessRequest import AccessRequest, AccessRequestStatus
+from models.AccessRequestArchive import AccessRequestArchive
+from models.BroadcastTarget import BroadcastTarget
+from models.ExportWatermark import ExportWatermark
+from models.ExportCache import ExportCache
+from models.InviteLink import InviteLink
+from models.OrderLedger import OrderLedger
+from models.AccessRequestMessage import AccessRequestMessage
+from models.ProtectedChannel import ProtectedChannel
+from models.ChannelMember import ChannelMember
@@ -5,6 +5,9 @@ from common.keyboards import build_user_keyboard, build_admin_keyboard
 from common.common import check_hidden_permission_requests_keyboard
 from common.lang_dicts import TEXTS, get_lang
 from custom_filters import Admin, PrivateChat, PrivateChatAndAdmin
+from common.order_ledger import load_order_ledger
+from common.protected_channels import load_protected_channels
+from PyroClientSingleton import PyroClientSingleton
 from Config import Config
 import models
 
@@ -23,6 +26,15 @@ async def inits(app: Application):
                     is_admin=True,
                 )
             )
+    # the ledger is loaded after its rows were given a channel
+    load_protected_channels()
+    load_order_ledger()
+
+
+async def shutdown(app: Application):
+    pyro_client = PyroClientSingleton()
+    if pyro_client.is_connected:
+        await pyro_client.stop()
 
 
 async def set_commands(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -30,6 +42,7 @@ async def set_commands(update: Update, context: ContextTypes.DEFAULT_TYPE):
     commands = [st_cmd]
     if Admin().filter(update):
         commands.append(("admin", "admin command"))
+        commands.append(("search", "search users and access requests"))
     await context.bot.set_my_commands(
         commands=commands, scope=BotCommandScopeChat(chat_id=update.effective_chat.id)
     )
@@ -0,0 +1,46 @@
+import os
+import sys
+import tempfile
+
+import pytest
+from sqlalchemy import text
+
+# Config reads these on import, so they're set before anything imports it
+_DB_DIR = tempfile.mkdtemp()
+os.environ.setdefault("API_ID", "1")
+os.environ.setdefault("API_HASH", "test")
+os.environ.setdefault("BOT_TOKEN", "1:test")
+os.environ.setdefault("OWNER_ID", "1")
+os.environ.setdefault("ERRORS_CHANNEL", "-1")
+os.environ.setdefault("PRIVATE_CHANNEL_ID", "-100")
+os.environ["DB_PATH"] = os.path.join(_DB_DIR, "db.sqlite3")
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import models  # noqa: E402
+from models.DB import Base, engine  # noqa: E402
+
+models.init_db()
+
+
+@pytest.fixture(autouse=True)
+def db(tmp_path, monkeypatch):
+    """An empty database for every test, with errors.txt written to tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+        conn.execute(text("DELETE FROM sqlite_sequence"))
+    yield
+
+
+@pytest.fixture
+def user():
+    """Creates a user, access requests need one."""
+
+    def create(user_id: int):
+        with models.session_scope() as s:
+            s.add(models.User(user_id=user_id, name=f"User{user_id}"))
+        return user_id
+
+    return create
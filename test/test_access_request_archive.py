@@ -0,0 +1,148 @@
+from datetime import datetime, timedelta
+
+import sqlalchemy as sa
+
+import models
+from models.DB import engine
+from Config import Config
+from admin.access_requests.functions import archive_access_requests
+
+OLD = datetime.now() - timedelta(days=365)
+
+
+def add_request(user_id: int, status: models.AccessRequestStatus, **kwargs):
+    with models.session_scope() as s:
+        req = models.AccessRequest(
+            user_id=user_id, status=status, created_at=OLD, updated_at=OLD, **kwargs
+        )
+        s.add(req)
+        s.flush()
+        return req.id
+
+
+def archived_ids():
+    with models.session_scope() as s:
+        return set(s.scalars(sa.select(models.AccessRequestArchive.id)))
+
+
+def hot_ids():
+    with models.session_scope() as s:
+        return set(s.scalars(sa.select(models.AccessRequest.id)))
+
+
+def test_archives_only_old_decided_requests(user):
+    user_id = user(10)
+    rejected = add_request(user_id, models.AccessRequestStatus.REJECTED)
+    expired = add_request(user_id, models.AccessRequestStatus.EXPIRED)
+    pending = add_request(user_id, models.AccessRequestStatus.PENDING)
+    # keeps its order id reserved through ACTIVE_ORDER_ID_INDEX
+    approved = add_request(user_id, models.AccessRequestStatus.APPROVED, order_id="A1")
+    # its invite link still has to be revoked
+    linked = add_request(
+        user_id, models.AccessRequestStatus.APPROVED, invite_link="https://t.me/+x"
+    )
+    with models.session_scope() as s:
+        s.add(
+            models.AccessRequest(user_id=user_id, status=models.AccessRequestStatus.REJECTED)
+        )
+
+    assert archive_access_requests() == 2
+    assert archived_ids() == {rejected, expired}
+    assert {pending, approved, linked} <= hot_ids()
+
+
+def test_ids_are_not_reused_after_archiving(user):
+    user_id = user(10)
+    first = add_request(user_id, models.AccessRequestStatus.REJECTED)
+    assert archive_access_requests() == 1
+
+    second = add_request(user_id, models.AccessRequestStatus.REJECTED)
+    assert second > first
+    assert archive_access_requests() == 1
+    assert archived_ids() == {first, second}
+
+
+def test_failed_batch_stops_and_is_not_counted(user, monkeypatch):
+    monkeypatch.setattr(Config, "ACCESS_REQUEST_ARCHIVE_BATCH_SIZE", 1)
+    user_id = user(10)
+    req_id = add_request(user_id, models.AccessRequestStatus.REJECTED)
+    # an archived copy with the same id, as left behind by reused ids
+    with models.session_scope() as s:
+        s.add(
+            models.AccessRequestArchive(
+                id=req_id, user_id=user_id, status=models.AccessRequestStatus.REJECTED
+            )
+        )
+
+    assert archive_access_requests() == 0
+    assert req_id in hot_ids()
+
+
+def test_init_db_adds_autoincrement_to_existing_table(user):
+    user_id = user(10)
+    req_id = add_request(user_id, models.AccessRequestStatus.PENDING)
+    with models.session_scope() as s:
+        s.add(
+            models.AccessRequestArchive(
+                id=req_id + 5, user_id=user_id, status=models.AccessRequestStatus.REJECTED
+            )
+        )
+
+    # recreate access_requests the way earlier versions did, without AUTOINCREMENT
+    with engine.connect() as conn:
+        sql = conn.execute(
+            sa.text(
+                "SELECT sql FROM sqlite_master "
+                "WHERE type = 'table' AND name = 'access_requests'"
+            )
+        ).scalar()
+    raw = engine.raw_connection()
+    try:
+        raw.driver_connection.executescript(
+            f"""
+            PRAGMA foreign_keys=OFF;
+            BEGIN;
+            DROP TRIGGER access_requests_fts_ai;
+            DROP TRIGGER access_requests_fts_ad;
+            DROP TRIGGER access_requests_fts_au;
+            DROP TABLE access_requests_fts;
+            {sql.replace(" AUTOINCREMENT", "").replace(
+                "CREATE TABLE access_requests ", "CREATE TABLE access_requests_old ", 1
+            )};
+            INSERT INTO access_requests_old SELECT * FROM access_requests;
+            DROP TABLE access_requests;
+            ALTER TABLE access_requests_old RENAME TO access_requests;
+            DELETE FROM sqlite_sequence WHERE name = 'access_requests';
+            COMMIT;
+            PRAGMA foreign_keys=ON;
+            """
+        )
+    finally:
+        raw.close()
+    with engine.connect() as conn:
+        assert "AUTOINCREMENT" not in conn.execute(
+            sa.text(
+                "SELECT sql FROM sqlite_master "
+                "WHERE type = 'table' AND name = 'access_requests'"
+            )
+        ).scalar()
+
+    models.init_db()
+
+    assert req_id in hot_ids()
+    new_id = add_request(user_id, models.AccessRequestStatus.PENDING)
+    assert new_id == req_id + 6
+    # indexes and the search table are back
+    with engine.connect() as conn:
+        names = set(
+            conn.execute(
+                sa.text("SELECT name FROM sqlite_master WHERE tbl_name = 'access_requests'")
+            ).scalars()
+        )
+    assert "ix_access_requests_status_created_at" in names
+    assert "access_requests_fts_ai" in names
+    with engine.connect() as conn:
+        assert {
+            row.table
+            for row in conn.execute(sa.text("PRAGMA foreign_key_list(access_request_messages)"))
+        } == {"access_requests"}
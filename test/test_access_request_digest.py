@@ -0,0 +1,69 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import sqlalchemy as sa
+
+import models
+from Config import Config
+from admin.access_requests import functions
+
+
+class RecordingBot:
+    """Just enough of telegram.Bot to record the messages sent."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send_message(self, chat_id, text, **kwargs):
+        self.sent.append((chat_id, text))
+        return type("Message", (), {"message_id": len(self.sent)})()
+
+
+def add_pending(user_id: int):
+    with models.session_scope() as s:
+        req = models.AccessRequest(user_id=user_id, order_id=f"O{datetime.now()}")
+        s.add(req)
+        s.flush()
+        return req.id
+
+
+def held_ids():
+    with models.session_scope() as s:
+        return set(
+            s.scalars(
+                sa.select(models.AccessRequest.id).where(
+                    models.AccessRequest.digest_held_at.isnot(None)
+                )
+            )
+        )
+
+
+def test_held_requests_survive_until_the_digest_is_due(user, monkeypatch):
+    monkeypatch.setattr(Config, "ACCESS_REQUEST_DIGEST_THRESHOLD", 1)
+    monkeypatch.setattr(functions, "_recent_arrivals", functions.deque())
+    user(Config.OWNER_ID)
+    user_id = user(10)
+    bot = RecordingBot()
+
+    first, second, third = (add_pending(user_id) for _ in range(3))
+    asyncio.run(functions.notify_new_access_request(bot, first))
+    asyncio.run(functions.notify_new_access_request(bot, second))
+    asyncio.run(functions.notify_new_access_request(bot, third))
+    # the first one went out on its own, the rest are held in the database
+    assert len(bot.sent) == 1
+    assert held_ids() == {second, third}
+
+    # not due yet
+    assert asyncio.run(functions.flush_access_requests_digest(bot)) == 0
+    assert held_ids() == {second, third}
+
+    with models.session_scope() as s:
+        s.execute(
+            sa.update(models.AccessRequest)
+            .where(models.AccessRequest.id == second)
+            .values(digest_held_at=datetime.now() - timedelta(hours=1))
+        )
+    assert asyncio.run(functions.flush_access_requests_digest(bot)) == 1
+    assert held_ids() == set()
+    assert len(bot.sent) == 2
+    assert asyncio.run(functions.flush_access_requests_digest(bot)) == 0
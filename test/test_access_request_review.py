@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta
+
+import sqlalchemy as sa
+
+import models
+from admin.access_requests.functions import (
+    claim_access_request,
+    claim_pending_access_request,
+    count_claimed_by_others,
+    decide_access_request,
+    get_decision_error_key,
+    release_access_request_claim,
+)
+
+CHANNEL_ID = -1001
+
+
+def add_pending(user_id: int, created_at: datetime = None, **kwargs):
+    with models.session_scope() as s:
+        req = models.AccessRequest(
+            user_id=user_id,
+            channel_id=CHANNEL_ID,
+            created_at=created_at or datetime.now(),
+            **kwargs,
+        )
+        s.add(req)
+        s.flush()
+        return req.id
+
+
+def get_request(req_id: int):
+    with models.session_scope() as s:
+        return s.get(models.AccessRequest, req_id)
+
+
+def test_claims_the_oldest_request_nobody_else_reviews(user):
+    user_id = user(10)
+    newer = add_pending(user_id)
+    older = add_pending(user_id, created_at=datetime.now() - timedelta(hours=1))
+
+    assert claim_pending_access_request(admin_id=1).id == older
+    assert claim_pending_access_request(admin_id=2).id == newer
+    assert claim_pending_access_request(admin_id=3) is None
+    assert count_claimed_by_others(admin_id=3) == 2
+
+
+def test_claim_hands_back_the_admins_own_request_first(user):
+    user_id = user(10)
+    first = add_pending(user_id, created_at=datetime.now() - timedelta(hours=1))
+    second = add_pending(user_id)
+    assert claim_access_request(second, admin_id=1).id == second
+
+    assert claim_pending_access_request(admin_id=1).id == second
+    assert claim_pending_access_request(admin_id=2).id == first
+
+
+def test_expired_claims_can_be_taken_over(user):
+    user_id = user(10)
+    req_id = add_pending(
+        user_id,
+        claimed_by=1,
+        claimed_until=datetime.now() - timedelta(minutes=1),
+    )
+    assert claim_pending_access_request(admin_id=2).id == req_id
+    assert get_request(req_id).claimed_by == 2
+
+
+def test_claim_queues(user):
+    user_id = user(10)
+    original = add_pending(user_id, order_id="100")
+    duplicate = add_pending(user_id, order_id="100", duplicate_of=original)
+    other_channel = add_pending(user_id)
+    with models.session_scope() as s:
+        s.execute(
+            sa.update(models.AccessRequest)
+            .where(models.AccessRequest.id == other_channel)
+            .values(channel_id=-1002)
+        )
+
+    assert claim_pending_access_request(admin_id=1, duplicates=True).id == duplicate
+    assert claim_pending_access_request(admin_id=2, channel_id=-1002).id == other_channel
+    assert claim_pending_access_request(admin_id=3, channel_id=CHANNEL_ID).id == original
+
+
+def test_released_claims_can_be_claimed_by_others(user):
+    req_id = add_pending(user(10))
+    assert claim_access_request(req_id, admin_id=1)
+    assert claim_access_request(req_id, admin_id=2) is None
+
+    release_access_request_claim(req_id, admin_id=2)
+    assert get_request(req_id).claimed_by == 1
+    release_access_request_claim(req_id, admin_id=1)
+    assert claim_access_request(req_id, admin_id=2).id == req_id
+
+
+def test_claims_dont_change_updated_at(user):
+    req_id = add_pending(user(10))
+    updated_at = get_request(req_id).updated_at
+    claim_access_request(req_id, admin_id=1)
+    release_access_request_claim(req_id, admin_id=1)
+    assert get_request(req_id).updated_at == updated_at
+
+
+def test_decides_a_request_once(user):
+    user_id = user(10)
+    req_id = add_pending(user_id)
+
+    decided = decide_access_request(req_id, 1, models.AccessRequestStatus.APPROVED)
+    assert tuple(decided) == (user_id, CHANNEL_ID)
+    req = get_request(req_id)
+    assert req.status == models.AccessRequestStatus.APPROVED
+    assert req.claimed_by is None
+
+    assert decide_access_request(req_id, 2, models.AccessRequestStatus.REJECTED) is None
+    assert get_decision_error_key(req_id, 2) == "access_request_already_processed"
+    assert get_request(req_id).status == models.AccessRequestStatus.APPROVED
+
+
+def test_only_the_claiming_admin_can_decide(user):
+    req_id = add_pending(user(10))
+    claim_access_request(req_id, admin_id=1)
+
+    assert decide_access_request(req_id, 2, models.AccessRequestStatus.REJECTED) is None
+    assert get_decision_error_key(req_id, 2) == "access_request_claimed_by_other"
+    assert decide_access_request(req_id, 1, models.AccessRequestStatus.REJECTED)
+
+
+def test_deciding_a_missing_request(user):
+    assert decide_access_request(404, 1, models.AccessRequestStatus.APPROVED) is None
+    assert get_decision_error_key(404, 1) == "access_not_found"
@@ -0,0 +1,98 @@
+import pytest
+import sqlalchemy as sa
+
+import models
+from models.DB import engine
+from common import order_ledger
+from common.order_ledger import (
+    add_orders,
+    consume_order,
+    load_order_ledger,
+    release_order,
+    unused_order_ids,
+)
+
+CHANNEL_ID = -1001
+
+
+@pytest.fixture(autouse=True)
+def empty_ledger():
+    unused_order_ids.clear()
+
+
+def test_orders_are_consumed_once(user):
+    assert add_orders(["100", "101"], CHANNEL_ID) == 2
+    assert add_orders(["100"], CHANNEL_ID) == 0
+
+    assert consume_order(" 100 ", user(10), CHANNEL_ID)
+    assert "100" not in unused_order_ids
+    assert not consume_order("100", user(11), CHANNEL_ID)
+    with models.session_scope() as s:
+        order = s.scalars(
+            sa.select(models.OrderLedger).where(models.OrderLedger.order_id == "100")
+        ).one()
+        assert order.consumed_by == 10
+
+
+def test_orders_only_pay_for_their_channel(user):
+    add_orders(["100"], CHANNEL_ID)
+    assert not consume_order("100", user(10), -1002)
+    assert consume_order("100", 10, CHANNEL_ID)
+
+
+def test_unknown_orders_are_answered_from_memory(user, monkeypatch):
+    user_id = user(10)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("the database shouldn't be queried")
+
+    monkeypatch.setattr(order_ledger.models, "session_scope", fail)
+    assert not consume_order("999", user_id, CHANNEL_ID)
+
+
+def test_stale_memory_is_corrected_by_the_database(user):
+    add_orders(["100"], CHANNEL_ID)
+    consume_order("100", user(10), CHANNEL_ID)
+    # e.g. consumed by another process since the ledger was loaded
+    unused_order_ids["100"] = CHANNEL_ID
+
+    assert not consume_order("100", user(11), CHANNEL_ID)
+    assert "100" not in unused_order_ids
+
+
+def test_released_orders_can_be_consumed_again(user):
+    add_orders(["100"], CHANNEL_ID)
+    consume_order("100", user(10), CHANNEL_ID)
+
+    release_order("100")
+    assert unused_order_ids["100"] == CHANNEL_ID
+    assert consume_order("100", user(11), CHANNEL_ID)
+
+
+def test_load_order_ledger_skips_consumed_orders(user):
+    add_orders(["100", "101"], CHANNEL_ID)
+    consume_order("100", user(10), CHANNEL_ID)
+    unused_order_ids.clear()
+
+    assert load_order_ledger() == 1
+    assert unused_order_ids == {"101": CHANNEL_ID}
+
+
+def test_failed_consume_keeps_the_order(user):
+    add_orders(["100"], CHANNEL_ID)
+    user_id = user(10)
+    with engine.begin() as conn:
+        conn.execute(
+            sa.text(
+                "CREATE TRIGGER fail_consume BEFORE UPDATE ON order_ledger "
+                "BEGIN SELECT RAISE(ABORT, 'failed'); END"
+            )
+        )
+    try:
+        assert not consume_order("100", user_id, CHANNEL_ID)
+    finally:
+        with engine.begin() as conn:
+            conn.execute(sa.text("DROP TRIGGER fail_consume"))
+
+    assert unused_order_ids["100"] == CHANNEL_ID
+    assert consume_order("100", user_id, CHANNEL_ID)
@@ -1,8 +1,11 @@
 # Access request flow: submit credentials -> admin approve/reject
 import logging
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from telegram import Update, InlineKeyboardMarkup
-from telegram.constants import ChatMemberStatus
 from telegram.ext import (
     ContextTypes,
     ConversationHandler,
@@ -17,10 +20,17 @@ from common.keyboards import (
     build_user_keyboard,
     build_back_button,
     build_back_to_home_page_button,
+    build_choose_channel_keyboard,
 )
-from user.access_request.keyboards import (
-    build_access_request_keyboard,
-    build_submit_method_keyboard,
+from user.access_request.keyboards import build_submit_method_keyboard
+from common.order_ledger import normalize_order_id, consume_order, release_order
+from common.protected_channels import protected_channels
+from common.channel_members import get_channel_membership, fetch_channel_membership
+from admin.access_requests.functions import (
+    get_active_order_request_id,
+    notify_new_access_request,
+    select_active_order_request_id,
+    notify_access_decision,
 )
 from custom_filters import PrivateChat
 from Config import Config
@@ -30,41 +40,44 @@ import models
 
 logger = logging.getLogger(__name__)
 
-CHOOSE_METHOD, ASK_USERNAME, ASK_PASSWORD, ASK_ORDER_ID = range(4)
+CHOOSE_METHOD, ASK_USERNAME, ASK_PASSWORD, ASK_ORDER_ID, CHOOSE_CHANNEL = range(5)
 
 
 async def _is_user_already_member(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE,
+    channel_id: int,
     lang: models.Language = models.Language.ARABIC,
 ):
-    try:
-        chat_member = await context.bot.get_chat_member(
-            chat_id=Config.PRIVATE_CHANNEL_ID,
-            user_id=update.effective_user.id,
-        )
-        if chat_member.status not in (
-            ChatMemberStatus.LEFT,
-            ChatMemberStatus.BANNED,
-        ):
-            await update.callback_query.answer(
-                text=TEXTS[lang]["access_already_in_channel"],
-                show_alert=True,
+    is_member = get_channel_membership(channel_id, update.effective_user.id)
+    if is_member is None:
+        # الحالة غير معروفة محلياً، السؤال عنها عبر API
+        try:
+            is_member = await fetch_channel_membership(
+                context.bot, channel_id, update.effective_user.id
             )
-            return True
-    except Exception as e:
-        logger.exception("Error checking if user is already member: %s", e)
+        except Exception as e:
+            logger.exception("Error checking if user is already member: %s", e)
+    if is_member:
+        await update.callback_query.answer(
+            text=TEXTS[lang]["access_already_in_channel"],
+            show_alert=True,
+        )
+        return True
     return False
 
 
 async def _is_user_has_pending_request(
-    update: Update, lang: models.Language = models.Language.ARABIC
+    update: Update,
+    channel_id: int,
+    lang: models.Language = models.Language.ARABIC,
 ):
     with models.session_scope() as s:
         pending = (
             s.query(models.AccessRequest)
             .filter(
                 models.AccessRequest.user_id == update.effective_user.id,
+                models.AccessRequest.channel_id == channel_id,
                 models.AccessRequest.status == models.AccessRequestStatus.PENDING,
             )
             .first()
@@ -78,20 +91,26 @@ async def _is_user_has_pending_request(
     return False
 
 
-def _get_unrevoked_invite_link(user_id: int) -> str | None:
-    """Return invite_link if user has an approved request with unrevoked link, else None."""
+def _get_unrevoked_invite_link(user_id: int, channel_id: int) -> str | None:
+    """Return invite_link if user has an approved request to channel_id with unrevoked link, else None."""
     with models.session_scope() as s:
-        req = (
-            s.query(models.AccessRequest)
+        return (
+            s.query(models.AccessRequest.invite_link)
             .filter(
                 models.AccessRequest.user_id == user_id,
+                models.AccessRequest.channel_id == channel_id,
                 models.AccessRequest.status == models.AccessRequestStatus.APPROVED,
                 models.AccessRequest.invite_link.isnot(None),
                 models.AccessRequest.is_revoked == False,  # noqa: E712
+                models.AccessRequest.revoke_requested.isnot(True),
+                sa.or_(
+                    models.AccessRequest.invite_link_expires_at.is_(None),
+                    models.AccessRequest.invite_link_expires_at > datetime.now(),
+                ),
             )
-            .first()
+            .limit(1)
+            .scalar()
         )
-        return req.invite_link if req else None
 
 
 @add_new_user
@@ -100,22 +119,54 @@ async def submit_login_start(update: Update, context: ContextTypes.DEFAULT_TYPE)
     if not PrivateChat().filter(update):
         return ConversationHandler.END
 
+    if len(protected_channels) > 1:
+        lang = get_lang(update.effective_user.id)
+        keyboard = build_choose_channel_keyboard("access_channel_")
+        keyboard.extend(build_back_to_home_page_button(lang=lang, is_admin=False))
+        await update.callback_query.edit_message_text(
+            text=TEXTS[lang]["access_choose_channel"],
+            reply_markup=InlineKeyboardMarkup(keyboard),
+        )
+        return CHOOSE_CHANNEL
+
+    context.user_data["access_channel_id"] = next(
+        iter(protected_channels), Config.PRIVATE_CHANNEL_ID
+    )
+    return await choose_access_method(update, context)
+
+
+async def choose_channel(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if not PrivateChat().filter(update):
+        return ConversationHandler.END
+    channel_id = int(update.callback_query.data.removeprefix("access_channel_"))
+    if channel_id not in protected_channels:
+        # القناة أزيلت بعد عرض القائمة
+        return await submit_login_start(update, context)
+    context.user_data["access_channel_id"] = channel_id
+    return await choose_access_method(update, context)
+
+
+async def choose_access_method(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if not PrivateChat().filter(update):
+        return ConversationHandler.END
+
     lang = get_lang(update.effective_user.id)
+    channel_id = context.user_data.get("access_channel_id", Config.PRIVATE_CHANNEL_ID)
 
     user_alredy_member = await _is_user_already_member(
-        update=update, context=context, lang=lang
+        update=update, context=context, channel_id=channel_id, lang=lang
     )
     if user_alredy_member:
         return ConversationHandler.END
 
     user_has_pending_request = await _is_user_has_pending_request(
-        update=update, lang=lang
+        update=update, channel_id=channel_id, lang=lang
     )
     if user_has_pending_request:
         return ConversationHandler.END
 
     # If user has an approved request with unrevoked invite link, send it and end
-    invite_link = _get_unrevoked_invite_link(update.effective_user.id)
+    invite_link = _get_unrevoked_invite_link(update.effective_user.id, channel_id)
     if invite_link:
         await update.callback_query.edit_message_text(
             text=TEXTS[lang]["access_approved_with_link_msg"].format(
@@ -125,6 +176,8 @@ async def submit_login_start(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return ConversationHandler.END
 
     keyboard = build_submit_method_keyboard(lang)
+    if len(protected_channels) > 1:
+        keyboard.append(build_back_button("back_to_access_choose_channel", lang=lang))
     keyboard.extend(build_back_to_home_page_button(lang=lang, is_admin=False))
     await update.callback_query.edit_message_text(
         text=TEXTS[lang]["access_choose_method"],
@@ -163,7 +216,8 @@ async def choose_order_id(update: Update, context: ContextTypes.DEFAULT_TYPE):
     return ASK_ORDER_ID
 
 
-back_to_access_choose_method = submit_login_start
+back_to_access_choose_channel = submit_login_start
+back_to_access_choose_method = choose_access_method
 
 
 async def ask_password(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -189,71 +243,50 @@ back_to_access_ask_password = choose_username_password
 async def _save_access_request(
     update: Update,
     user_id: int,
+    channel_id: int,
     username: str = None,
     password: str = None,
     order_id: str = None,
     lang: models.Language = models.Language.ARABIC,
+    status: models.AccessRequestStatus = models.AccessRequestStatus.PENDING,
 ):
-    req_id = None
+    """Insert the request and return its id and the id of the request it duplicates, if any.
+
+    The unique index on active order ids turns the duplicate check into the
+    insert itself: a conflicting order id inserts nothing, and the request is
+    then saved again pointing at the request that already holds the order id.
+    """
+    req_id, duplicate_of = None, None
+    values = dict(
+        user_id=user_id,
+        channel_id=channel_id,
+        submitted_username=username,
+        submitted_password=password,
+        order_id=order_id,
+        status=status,
+    )
     try:
         with models.session_scope() as s:
-            req = models.AccessRequest(
-                user_id=user_id,
-                submitted_username=username,
-                submitted_password=password,
-                order_id=order_id,
-                status=models.AccessRequestStatus.PENDING,
+            insert = sqlite_insert(models.AccessRequest).returning(
+                models.AccessRequest.id
             )
-            s.add(req)
-            s.flush()
-            req_id = req.id
+            req_id = s.execute(
+                insert.values(**values).on_conflict_do_nothing()
+            ).scalar()
+            if req_id is None:
+                duplicate_of = s.execute(
+                    select_active_order_request_id(order_id)
+                ).scalar()
+                req_id = s.execute(
+                    insert.values(**values, duplicate_of=duplicate_of)
+                ).scalar()
     except Exception as e:
         logger.exception("Access request save failed: %s", e)
+    if not req_id:
         await update.message.reply_text(
             text=TEXTS[lang]["access_request_save_failed"],
         )
-    return req_id
-
-
-async def _forward_access_request_to_owner(
-    context: ContextTypes.DEFAULT_TYPE,
-    user_id: int,
-    req_id: int,
-    username: str = None,
-    password: str = None,
-    order_id: int = None,
-):
-    try:
-        owner_lang = models.Language.ARABIC
-        with models.session_scope() as s:
-            owner = s.get(models.User, Config.OWNER_ID)
-            user = s.get(models.User, user_id)
-            owner_lang = owner.lang
-        keyboard = build_access_request_keyboard(req_id, owner_lang)
-        if order_id:
-            request_details = TEXTS[owner_lang][
-                "access_request_message_order_id"
-            ].format(
-                title=TEXTS[owner_lang]["access_request_message_title"],
-                user=f"@{user.username}" if user.username else user.name,
-                order_id=order_id,
-                req_id=req_id,
-            )
-        else:
-            request_details = TEXTS[owner_lang]["access_request_message"].format(
-                title=TEXTS[owner_lang]["access_request_message_title"],
-                user=f"@{user.username}" if user.username else user.name,
-                username=username,
-                password=password,
-                req_id=req_id,
-            )
-        await context.bot.send_message(
-            chat_id=Config.OWNER_ID,
-            text=request_details,
-            reply_markup=InlineKeyboardMarkup(keyboard),
-        )
-    except Exception as e:
-        logger.exception("Failed to forward access request to admin: %s", e)
+    return req_id, duplicate_of
 
 
 async def save_and_forward_username_password(
@@ -268,9 +301,12 @@ async def save_and_forward_username_password(
     password = (update.message.text or "").strip()
     username = context.user_data.get("access_username") or ""
 
-    req_id = await _save_access_request(
+    req_id, _ = await _save_access_request(
         update=update,
         user_id=user_id,
+        channel_id=context.user_data.get(
+            "access_channel_id", Config.PRIVATE_CHANNEL_ID
+        ),
         username=username,
         password=password,
         lang=lang,
@@ -278,12 +314,8 @@ async def save_and_forward_username_password(
     if not req_id:
         return ConversationHandler.END
 
-    await _forward_access_request_to_owner(
-        context=context,
-        user_id=user_id,
-        req_id=req_id,
-        username=username,
-        password=password,
+    context.application.create_task(
+        notify_new_access_request(context.bot, req_id)
     )
 
     await update.message.reply_text(
@@ -294,29 +326,117 @@ async def save_and_forward_username_password(
     return ConversationHandler.END
 
 
-async def save_and_forward_order_id(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    if not PrivateChat().filter(update):
-        return ConversationHandler.END
+def _return_linkless_request_to_review(req_id: int):
+    """Make an approved request that was never given a link pending again, returns whether it was."""
+    stmt = (
+        sa.update(models.AccessRequest)
+        .where(
+            models.AccessRequest.id == req_id,
+            models.AccessRequest.invite_link.is_(None),
+        )
+        .values(status=models.AccessRequestStatus.PENDING)
+        .returning(models.AccessRequest.id)
+    )
+    returned = False
+    with models.session_scope() as s:
+        req_id = s.execute(stmt).scalar()
+        s.commit()
+        returned = req_id is not None
+    return returned
 
-    user_id = update.effective_user.id
-    lang = get_lang(user_id)
 
-    order_id = (update.message.text or "").strip()
+async def _auto_approve_order_id(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    order_id: str,
+    channel_id: int,
+    lang: models.Language,
+):
+    """Approve a request whose order id was just consumed from the ledger, without a reviewer.
 
-    req_id = await _save_access_request(
+    The approved request is saved first and its link recorded before it is
+    sent. Returns the request id and whether it stayed approved: a request
+    whose user couldn't be given a link is pending again, with the order
+    released, so it goes to the review queue instead.
+    """
+    user_id = update.effective_user.id
+    req_id, _ = await _save_access_request(
         update=update,
         user_id=user_id,
+        channel_id=channel_id,
         order_id=order_id,
         lang=lang,
+        status=models.AccessRequestStatus.APPROVED,
     )
     if not req_id:
+        release_order(order_id)
+        return None, False
+    try:
+        await notify_access_decision(
+            context.bot, user_id, lang, True, channel_id=channel_id, req_id=req_id
+        )
+    except Exception as e:
+        logger.warning("Auto-approval of order_id failed for user %s: %s", user_id, e)
+        # إذا حُفظ الرابط فسيحصل عليه المستخدم عند فتح الطلب مجدداً
+        if _return_linkless_request_to_review(req_id):
+            release_order(order_id)
+            return req_id, False
+    logger.info(
+        "Access request auto-approved from order ledger: request_id=%s user_id=%s",
+        req_id,
+        user_id,
+    )
+    return req_id, True
+
+
+async def save_and_forward_order_id(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if not PrivateChat().filter(update):
         return ConversationHandler.END
 
-    await _forward_access_request_to_owner(
-        context=context,
-        user_id=user_id,
-        req_id=req_id,
-        order_id=order_id,
+    user_id = update.effective_user.id
+    lang = get_lang(user_id)
+
+    order_id = normalize_order_id(update.message.text)
+
+    channel_id = context.user_data.get("access_channel_id", Config.PRIVATE_CHANNEL_ID)
+
+    # لا يُستهلك رقم الطلب من السجل إذا كان مستخدماً في طلب آخر
+    if not get_active_order_request_id(order_id) and consume_order(
+        order_id, user_id, channel_id
+    ):
+        req_id, auto_approved = await _auto_approve_order_id(
+            update, context, order_id, channel_id, lang
+        )
+        if auto_approved or not req_id:
+            return ConversationHandler.END
+        duplicate_of = None
+    else:
+        req_id, duplicate_of = await _save_access_request(
+            update=update,
+            user_id=user_id,
+            channel_id=channel_id,
+            order_id=order_id,
+            lang=lang,
+        )
+        if not req_id:
+            return ConversationHandler.END
+
+    if duplicate_of:
+        # الطلبات المكررة تنتظر في طابورها الخاص دون إزعاج المالك
+        logger.info(
+            "Duplicate order_id access request request_id=%s duplicate_of=%s user_id=%s",
+            req_id,
+            duplicate_of,
+            user_id,
+        )
+        await update.message.reply_text(
+            text=TEXTS[lang]["access_request_duplicate_order_id"],
+            reply_markup=build_user_keyboard(lang),
+        )
+        return ConversationHandler.END
+
+    context.application.create_task(
+        notify_new_access_request(context.bot, req_id)
     )
     logger.info(
         "New access request (order_id) request_id=%s user_id=%s", req_id, user_id
@@ -336,6 +456,12 @@ access_request_handler = ConversationHandler(
         ),
     ],
     states={
+        CHOOSE_CHANNEL: [
+            CallbackQueryHandler(
+                choose_channel,
+                r"^access_channel_-?\d+$",
+            ),
+        ],
         CHOOSE_METHOD: [
             CallbackQueryHandler(
                 choose_username_password,
@@ -368,6 +494,9 @@ access_request_handler = ConversationHandler(
     fallbacks=[
         start_command,
         back_to_user_home_page_handler,
+        CallbackQueryHandler(
+            back_to_access_choose_channel, r"^back_to_access_choose_channel$"
+        ),
         CallbackQueryHandler(
             back_to_access_choose_method, r"^back_to_access_choose_method$"
         ),